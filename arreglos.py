@@ -0,0 +1,351 @@
+from array import array
+from typing import Callable, Optional, TypeVar, Tuple
+import pickle
+import unittest
+
+from eliminacion import Arbol, Nodo, NodoInterface, _ClaveProposicion
+
+T = TypeVar('T')
+
+# Índice que representa la ausencia de nodo
+NINGUNO = -1
+
+
+# Vista ligera sobre una posición de ArbolArreglos; no copia datos
+class NodoArreglo:
+    __slots__ = ('arbol', 'indice')
+
+    def __init__(self, arbol: 'ArbolArreglos', indice: int):
+        self.arbol = arbol
+        self.indice = indice
+
+    @property
+    def valor(self) -> T:
+        return self.arbol._valores[self.indice]
+
+    @property
+    def izquierda(self) -> Optional['NodoArreglo']:
+        return self.arbol._vista(self.arbol._izquierda[self.indice])
+
+    @property
+    def derecha(self) -> Optional['NodoArreglo']:
+        return self.arbol._vista(self.arbol._derecha[self.indice])
+
+    @property
+    def padre(self) -> Optional['NodoArreglo']:
+        return self.arbol._vista(self.arbol._padre[self.indice])
+
+    def __eq__(self, otro: object) -> bool:
+        return isinstance(otro, NodoArreglo) and otro.arbol is self.arbol and otro.indice == self.indice
+
+    def __hash__(self) -> int:
+        return hash((id(self.arbol), self.indice))
+
+
+NodoInterface.register(NodoArreglo)
+
+
+# Árbol binario de búsqueda guardado en arreglos paralelos (valores, hijos y padre) en lugar de objetos Nodo
+class ArbolArreglos(Arbol):
+
+    def __init__(self, tipo: Optional[str] = 'q', clave: Optional[Callable[[T], object]] = None,
+                 proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        """
+        Constructor de la clase ArbolArreglos.
+
+        Args:
+            tipo (Optional[str]): Código de tipo de array para los valores ('q' enteros, 'd' flotantes).
+                Con None los valores se guardan en una lista y pueden ser de cualquier tipo.
+            clave (Optional[Callable[[T], object]]): Función que calcula la clave de orden de cada valor.
+                Las claves se guardan en una lista paralela a los valores.
+            proposicion (Optional[Callable[[T, T], bool]]): Orden del árbol cuando no se usa clave: indica si
+                el primer valor va a la izquierda del segundo. Sin clave ni proposición se usa <.
+        """
+        self._valores = array(tipo) if tipo else []
+        self._clave = clave
+        self._proposicion = proposicion
+        self._claves: Optional[list] = [] if clave is not None else None
+        self._izquierda = array('q')
+        self._derecha = array('q')
+        self._padre = array('q')
+        self._libres: list[int] = []
+        self._raiz = NINGUNO
+
+    @property
+    def raiz(self) -> Optional[NodoArreglo]:
+        return self._vista(self._raiz)
+
+    def _vista(self, indice: int) -> Optional[NodoArreglo]:
+        return None if indice == NINGUNO else NodoArreglo(self, indice)
+
+    def _clave_consulta(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> object:
+        """
+        Calcula la clave con la que se compara el valor contra las claves guardadas, como en ArbolBinario:
+        el orden del árbol tiene prioridad y la proposición recibida solo se usa si el árbol no tiene orden propio.
+        """
+        if self._clave is not None:
+            return self._clave(valor)
+        proposicion = self._proposicion or proposicion
+        if proposicion is not None:
+            return _ClaveProposicion(valor, proposicion)
+        return valor
+
+    def _descender(self, clave: object) -> Tuple[int, int]:
+        """
+        Baja hasta el hueco de la clave con una sola comparación < por nivel, como ArbolBinario._descender.
+
+        Returns:
+            Tuple[int, int]: La última posición visitada y la del candidato (el último nodo desde el que se
+                bajó a la derecha), o NINGUNO.
+        """
+        claves = self._valores if self._claves is None else self._claves
+        izquierda, derecha = self._izquierda, self._derecha
+        padre = candidato = NINGUNO
+        indice = self._raiz
+        while indice != NINGUNO:
+            padre = indice
+            if clave < claves[indice]:
+                indice = izquierda[indice]
+            else:
+                candidato = indice
+                indice = derecha[indice]
+        return padre, candidato
+
+    def _es_clave_de(self, clave: object, indice: int) -> bool:
+        if indice == NINGUNO:
+            return False
+        return clave == (self._valores if self._claves is None else self._claves)[indice]
+
+    def _nuevo_nodo(self, valor: T, clave: object, padre: int) -> int:
+        if self._libres:
+            indice = self._libres.pop()
+            self._valores[indice] = valor
+            if self._claves is not None:
+                self._claves[indice] = clave
+            self._izquierda[indice] = NINGUNO
+            self._derecha[indice] = NINGUNO
+            self._padre[indice] = padre
+            return indice
+
+        self._valores.append(valor)
+        if self._claves is not None:
+            self._claves.append(clave)
+        self._izquierda.append(NINGUNO)
+        self._derecha.append(NINGUNO)
+        self._padre.append(padre)
+        return len(self._padre) - 1
+
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        clave = self._clave_consulta(valor, proposicion)
+        padre, candidato = self._descender(clave)
+        if self._es_clave_de(clave, candidato):
+            return
+        # La clave guardada es la de la función de clave; con proposición se guarda el propio valor
+        indice = self._nuevo_nodo(valor, clave, padre)
+        if padre == NINGUNO:
+            self._raiz = indice
+        elif padre == candidato:
+            self._derecha[padre] = indice
+        else:
+            self._izquierda[padre] = indice
+
+    def insertarAll(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        for valor in valores:
+            self.insertar(valor, proposicion)
+
+    def _buscar_indice(self, valor: T) -> int:
+        clave = self._clave_consulta(valor)
+        candidato = self._descender(clave)[1]
+        return candidato if self._es_clave_de(clave, candidato) else NINGUNO
+
+    def buscar(self, valor: T) -> Optional[NodoArreglo]:
+        return self._vista(self._buscar_indice(valor))
+
+    def buscarAll(self, valor: T) -> Tuple[Optional[NodoArreglo]]:
+        """
+        Como en ArbolBinario, las claves no se repiten: basta el camino de búsqueda y hay como mucho un nodo.
+        """
+        indice = self._buscar_indice(valor)
+        return () if indice == NINGUNO else (NodoArreglo(self, indice),)
+
+    def buscarWhere(self, proposicion: Callable[[Optional[NodoArreglo]], bool]) -> Tuple[Optional[NodoArreglo]]:
+        return tuple(NodoArreglo(self, indice) for indice in self._indices_where(proposicion))
+
+    def _indices_where(self, proposicion: Callable[[Optional[NodoArreglo]], bool]) -> list[int]:
+        resultados = []
+        pendientes = [self._raiz]
+        while pendientes:
+            indice = pendientes.pop()
+            if indice == NINGUNO:
+                continue
+            if proposicion(NodoArreglo(self, indice)):
+                resultados.append(indice)
+            pendientes.append(self._derecha[indice])
+            pendientes.append(self._izquierda[indice])
+        return resultados
+
+    def eliminar(self, valor: T) -> None:
+        indice = self._buscar_indice(valor)
+        if indice != NINGUNO:
+            self._desenlazar(indice)
+
+    def eliminarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
+        indice = self._buscar_indice(valor)
+        if indice == NINGUNO:
+            return ()
+        resultado = (Nodo(self._valores[indice]),)
+        self._desenlazar(indice)
+        return resultado
+
+    def eliminarWhere(self, proposicion: Callable[[Optional[NodoArreglo]], bool]) -> Tuple[Optional[NodoInterface]]:
+        """
+        Elimina los nodos que cumplen la proposición.
+
+        Returns:
+            Tuple[Optional[NodoInterface]]: Los valores eliminados como Nodo independientes, porque las
+                posiciones liberadas se reutilizan en las siguientes inserciones.
+        """
+        indices = self._indices_where(proposicion)
+        resultados = tuple(Nodo(self._valores[indice]) for indice in indices)
+        for indice in indices:
+            self._desenlazar(indice)
+        return resultados
+
+    def _desenlazar(self, indice: int) -> None:
+        izquierda, derecha, padre = self._izquierda, self._derecha, self._padre
+        if izquierda[indice] == NINGUNO:
+            self._trasplantar(indice, derecha[indice])
+        elif derecha[indice] == NINGUNO:
+            self._trasplantar(indice, izquierda[indice])
+        else:
+            # El sucesor ocupa el lugar del nodo eliminado sin mover valores
+            sucesor = derecha[indice]
+            while izquierda[sucesor] != NINGUNO:
+                sucesor = izquierda[sucesor]
+            if padre[sucesor] != indice:
+                self._trasplantar(sucesor, derecha[sucesor])
+                derecha[sucesor] = derecha[indice]
+                padre[derecha[sucesor]] = sucesor
+            self._trasplantar(indice, sucesor)
+            izquierda[sucesor] = izquierda[indice]
+            padre[izquierda[sucesor]] = sucesor
+        # La posición libre no debe mantener vivos el valor ni la clave hasta que se reutilice
+        if type(self._valores) is list:
+            self._valores[indice] = None
+        if self._claves is not None:
+            self._claves[indice] = None
+        self._libres.append(indice)
+
+    def _trasplantar(self, indice: int, reemplazo: int) -> None:
+        padre = self._padre[indice]
+        if padre == NINGUNO:
+            self._raiz = reemplazo
+        elif self._izquierda[padre] == indice:
+            self._izquierda[padre] = reemplazo
+        else:
+            self._derecha[padre] = reemplazo
+        if reemplazo != NINGUNO:
+            self._padre[reemplazo] = padre
+
+
+# Clase de prueba para ArbolArreglos
+class TestArbolArreglos(unittest.TestCase):
+    def setUp(self):
+        self.arbol = ArbolArreglos()
+        self.arbol.insertarAll((10, 5, 15, 3, 7, 12, 20))
+
+    def valores(self, arbol: ArbolArreglos) -> list:
+        return sorted(nodo.valor for nodo in arbol.buscarWhere(lambda nodo: True))
+
+    def test_raiz(self):
+        self.assertEqual(self.arbol.raiz.valor, 10)
+        self.assertIsNone(self.arbol.raiz.padre)
+        self.assertIsNone(ArbolArreglos().raiz)
+
+    def test_estructura(self):
+        raiz = self.arbol.raiz
+        self.assertEqual(raiz.izquierda.valor, 5)
+        self.assertEqual(raiz.derecha.izquierda.valor, 12)
+        self.assertEqual(raiz.izquierda.derecha.padre, raiz.izquierda)
+
+    def test_es_nodo_interface(self):
+        self.assertIsInstance(self.arbol.raiz, NodoInterface)
+
+    def test_buscar(self):
+        self.assertEqual(self.arbol.buscar(7).valor, 7)
+        self.assertIsNone(self.arbol.buscar(8))
+
+    def test_buscarAll_y_buscarWhere(self):
+        self.assertEqual(len(self.arbol.buscarAll(12)), 1)
+        self.assertEqual([nodo.valor for nodo in self.arbol.buscarWhere(lambda nodo: nodo.valor < 10)], [5, 3, 7])
+
+    def test_eliminar_con_dos_hijos_conserva_sucesor(self):
+        sucesor = self.arbol.buscar(12)
+        self.arbol.eliminar(10)
+        self.assertEqual(self.arbol.raiz, sucesor)
+        self.assertEqual(self.valores(self.arbol), [3, 5, 7, 12, 15, 20])
+
+    def test_reutiliza_posiciones_libres(self):
+        tamano = len(self.arbol._valores)
+        self.arbol.eliminar(3)
+        self.arbol.insertar(4)
+        self.assertEqual(len(self.arbol._valores), tamano)
+        self.assertEqual(self.arbol.buscar(4).padre.valor, 5)
+
+    def test_eliminarWhere(self):
+        eliminados = self.arbol.eliminarWhere(lambda nodo: nodo.valor % 5 == 0)
+        self.assertEqual(sorted(nodo.valor for nodo in eliminados), [5, 10, 15, 20])
+        self.assertEqual(self.valores(self.arbol), [3, 7, 12])
+
+    def test_eliminarAll(self):
+        self.assertEqual([nodo.valor for nodo in self.arbol.eliminarAll(15)], [15])
+        self.assertIsNone(self.arbol.buscar(15))
+        self.assertEqual(self.arbol.eliminarAll(15), ())
+        self.assertEqual(self.arbol.buscarAll(15), ())
+
+    def test_eliminar_todo(self):
+        for valor in (10, 5, 15, 3, 7, 12, 20):
+            self.arbol.eliminar(valor)
+        self.assertIsNone(self.arbol.raiz)
+
+    def test_valores_genericos(self):
+        arbol = ArbolArreglos(tipo=None)
+        arbol.insertarAll(("b", "a", "c"))
+        self.assertEqual(arbol.buscar("c").valor, "c")
+
+    def test_posiciones_libres_no_retienen_valores(self):
+        arbol = ArbolArreglos(tipo=None, clave=len)
+        arbol.insertarAll(("bb", "a", "ccc"))
+        indice = arbol.buscar("a").indice
+        arbol.eliminar("a")
+        self.assertIsNone(arbol._valores[indice])
+        self.assertIsNone(arbol._claves[indice])
+        arbol.insertar("d")
+        self.assertEqual(arbol.buscar("d").indice, indice)
+
+    def test_orden_propio(self):
+        descendente = ArbolArreglos(proposicion=lambda x, y: x > y)
+        descendente.insertarAll((10, 5, 15, 3))
+        self.assertEqual(descendente.raiz.izquierda.valor, 15)
+        for valor in (10, 5, 15, 3):
+            self.assertEqual(descendente.buscar(valor).valor, valor)
+        self.assertIsNone(descendente.buscar(4))
+        descendente.eliminar(15)
+        self.assertIsNone(descendente.buscar(15))
+
+        por_longitud = ArbolArreglos(tipo=None, clave=len)
+        por_longitud.insertarAll(("ccc", "a", "bb", "dd"))
+        self.assertEqual(por_longitud.raiz.izquierda.valor, "a")
+        self.assertEqual(por_longitud.buscar("xx").valor, "bb")
+        por_longitud.eliminar("zzz")
+        por_longitud.insertar("eee")
+        self.assertEqual(sorted(nodo.valor for nodo in por_longitud.buscarWhere(lambda nodo: True)), ["a", "bb", "eee"])
+
+    def test_pickle(self):
+        copia = pickle.loads(pickle.dumps(self.arbol))
+        self.assertEqual(self.valores(copia), self.valores(self.arbol))
+        self.assertEqual(copia.buscar(7).padre.valor, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,339 @@
+from typing import Callable, Optional, TypeVar
+import os
+import random
+import tempfile
+import unittest
+
+from eliminacion import ArbolBinario, Nodo, NodoCompacto
+
+T = TypeVar('T')
+
+# Nodo que guarda la altura de su subárbol para poder calcular el factor de balance
+class NodoAVL(Nodo):
+
+    def __init__(self, valor: T):
+        """
+        Constructor de la clase NodoAVL.
+
+        Args:
+            valor (T): El valor que se almacenará en el nodo.
+        """
+        super().__init__(valor)
+        self.altura: int = 1
+
+    @property
+    def balance(self) -> int:
+        """
+        Factor de balance del nodo: altura del subárbol izquierdo menos la del derecho.
+
+        Returns:
+            int: Un valor entre -1 y 1 mientras el árbol esté balanceado.
+        """
+        return _altura(self.izquierda) - _altura(self.derecha)
+
+
+# NodoAVL con los campos en __slots__, para los árboles creados con clase_nodo=NodoCompacto
+class NodoAVLCompacto(NodoCompacto):
+    __slots__ = ('altura',)
+
+    def __init__(self, valor: T):
+        super().__init__(valor)
+        self.altura = 1
+
+    balance = NodoAVL.balance
+
+
+def _altura(nodo: Optional[NodoAVL]) -> int:
+    return 0 if nodo is None else nodo.altura
+
+
+# Árbol binario de búsqueda autobalanceado (AVL) con la misma interfaz que ArbolBinario
+class ArbolAVL(ArbolBinario):
+
+    def _crear_nodo(self, valor: T) -> NodoAVL:
+        """
+        Usa NodoAVLCompacto si el árbol se creó con clase_nodo=NodoCompacto, NodoAVL con Nodo, y la clase
+        recibida en otro caso, que tiene que guardar la altura.
+        """
+        clase_nodo = self.clase_nodo
+        if clase_nodo is Nodo:
+            return NodoAVL(valor)
+        if clase_nodo is NodoCompacto:
+            return NodoAVLCompacto(valor)
+        return clase_nodo(valor)
+
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        clave = self._clave_consulta(valor, proposicion)
+        self.raiz = self._insertar_balanceado(valor, clave, self.raiz)
+
+    def _insertar_balanceado(self, valor: T, clave: object, nodo_actual: Optional[NodoAVL],
+                             candidato: Optional[NodoAVL] = None) -> Optional[NodoAVL]:
+        """
+        Baja con una sola comparación < por nivel. El candidato es el último nodo desde el que se bajó a la
+        derecha: al llegar al hueco, la clave ya está en el árbol si y solo si es la del candidato. En ese caso
+        el hueco sigue vacío y el candidato, que está en el camino, recalcula su tamaño al volver.
+        """
+        if nodo_actual is None:
+            if candidato is not None and clave == candidato.clave:
+                if self.multiconjunto:
+                    candidato.cuenta += 1
+                return None
+            return self._nuevo_nodo(valor, clave)
+
+        if clave < nodo_actual.clave:
+            hijo = nodo_actual.izquierda
+            self._enlazar_izquierda(nodo_actual, self._insertar_balanceado(valor, clave, hijo, candidato))
+            if hijo is None and nodo_actual.izquierda is not None:
+                self._enlazar_hoja(nodo_actual.izquierda)
+        else:
+            hijo = nodo_actual.derecha
+            self._enlazar_derecha(nodo_actual, self._insertar_balanceado(valor, clave, hijo, nodo_actual))
+            if hijo is None and nodo_actual.derecha is not None:
+                self._enlazar_hoja(nodo_actual.derecha)
+
+        return self._balancear(nodo_actual)
+
+    def _construir_balanceado(self, nodos: list, inicio: int, fin: int) -> Optional[NodoAVL]:
+        nodo = super()._construir_balanceado(nodos, inicio, fin)
+        if nodo is not None:
+            self._actualizar_altura(nodo)
+        return nodo
+
+    def _quitar(self, nodo: NodoAVL) -> None:
+        self._desenlazar_hilo(nodo)
+        self.raiz = self._eliminar_balanceado(nodo, self._clave_de_nodo(nodo), self.raiz)
+
+    def _eliminar_balanceado(self, objetivo: NodoAVL, clave: object, nodo_actual: Optional[NodoAVL]) -> Optional[NodoAVL]:
+        """
+        Quita el nodo objetivo. Como ya se tiene el nodo, se reconoce por identidad y cada nivel solo
+        compara la clave una vez para elegir el lado.
+        """
+        if nodo_actual is None:
+            return None
+
+        if nodo_actual is objetivo:
+            if nodo_actual.izquierda is None:
+                return nodo_actual.derecha
+            if nodo_actual.derecha is None:
+                return nodo_actual.izquierda
+
+            # El nodo tiene dos hijos: el sucesor ocupa su lugar
+            sucesor = self._encontrar_minimo(nodo_actual.derecha)
+            derecha = self._extraer_minimo(nodo_actual.derecha)
+            self._enlazar_izquierda(sucesor, nodo_actual.izquierda)
+            self._enlazar_derecha(sucesor, derecha)
+            nodo_actual = sucesor
+        elif clave < nodo_actual.clave:
+            self._enlazar_izquierda(nodo_actual, self._eliminar_balanceado(objetivo, clave, nodo_actual.izquierda))
+        else:
+            self._enlazar_derecha(nodo_actual, self._eliminar_balanceado(objetivo, clave, nodo_actual.derecha))
+
+        return self._balancear(nodo_actual)
+
+    def _extraer_minimo(self, nodo_actual: NodoAVL) -> Optional[NodoAVL]:
+        if nodo_actual.izquierda is None:
+            return nodo_actual.derecha
+        self._enlazar_izquierda(nodo_actual, self._extraer_minimo(nodo_actual.izquierda))
+        return self._balancear(nodo_actual)
+
+    def _actualizar_altura(self, nodo: NodoAVL) -> None:
+        nodo.altura = 1 + max(_altura(nodo.izquierda), _altura(nodo.derecha))
+        self._recalcular_tamano(nodo)
+
+    def _balancear(self, nodo: NodoAVL) -> NodoAVL:
+        self._actualizar_altura(nodo)
+        balance = nodo.balance
+
+        if balance > 1:
+            if nodo.izquierda.balance < 0:
+                self._enlazar_izquierda(nodo, self._rotar_izquierda(nodo.izquierda))
+            return self._rotar_derecha(nodo)
+
+        if balance < -1:
+            if nodo.derecha.balance > 0:
+                self._enlazar_derecha(nodo, self._rotar_derecha(nodo.derecha))
+            return self._rotar_izquierda(nodo)
+
+        return nodo
+
+    def _rotar_izquierda(self, nodo: NodoAVL) -> NodoAVL:
+        pivote = nodo.derecha
+        self._enlazar_derecha(nodo, pivote.izquierda)
+        self._enlazar_izquierda(pivote, nodo)
+        self._actualizar_altura(nodo)
+        self._actualizar_altura(pivote)
+        return pivote
+
+    def _rotar_derecha(self, nodo: NodoAVL) -> NodoAVL:
+        pivote = nodo.izquierda
+        self._enlazar_izquierda(nodo, pivote.derecha)
+        self._enlazar_derecha(pivote, nodo)
+        self._actualizar_altura(nodo)
+        self._actualizar_altura(pivote)
+        return pivote
+
+
+# Clase de prueba para ArbolAVL
+class TestArbolAVL(unittest.TestCase):
+
+    def verificar_invariantes(self, nodo: Optional[NodoAVL], padre: Optional[NodoAVL] = None, estadisticas: bool = False) -> int:
+        if nodo is None:
+            return 0
+        self.assertIs(nodo.padre, padre)
+        if nodo.izquierda is not None:
+            self.assertLess(nodo.izquierda.valor, nodo.valor)
+        if nodo.derecha is not None:
+            self.assertGreater(nodo.derecha.valor, nodo.valor)
+        altura_izquierda = self.verificar_invariantes(nodo.izquierda, nodo, estadisticas)
+        altura_derecha = self.verificar_invariantes(nodo.derecha, nodo, estadisticas)
+        self.assertLessEqual(abs(altura_izquierda - altura_derecha), 1)
+        self.assertEqual(nodo.altura, 1 + max(altura_izquierda, altura_derecha))
+        if estadisticas:
+            tamano_izquierda = 0 if nodo.izquierda is None else nodo.izquierda.tamano
+            tamano_derecha = 0 if nodo.derecha is None else nodo.derecha.tamano
+            self.assertEqual(nodo.tamano, nodo.cuenta + tamano_izquierda + tamano_derecha)
+        return nodo.altura
+
+    def test_insertar_ordenado_balancea(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll(tuple(range(1000)), lambda x, y: x < y)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertLessEqual(arbol.raiz.altura, 14)
+
+    def test_insertar_rotacion_doble(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll((10, 5, 7), lambda x, y: x < y)
+        self.assertEqual(arbol.raiz.valor, 7)
+        self.assertEqual(arbol.raiz.izquierda.valor, 5)
+        self.assertEqual(arbol.raiz.derecha.valor, 10)
+
+    def test_insertar_duplicado(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll((1, 1, 1), lambda x, y: x < y)
+        self.assertEqual(len(arbol.buscarWhere(lambda nodo: True)), 1)
+
+    def test_insertarAll_masivo(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll((5, 1, 9), lambda x, y: x < y)
+        arbol.insertarAll(tuple(range(100)), lambda x, y: x < y, masivo=True)
+        self.verificar_invariantes(arbol.raiz)
+        arbol.insertar(100, lambda x, y: x < y)
+        arbol.eliminar(50)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_orden_por_clave(self):
+        arbol = ArbolAVL(clave=lambda valor: -valor)
+        arbol.insertarAll(tuple(range(50)))
+        self.assertEqual(next(arbol.iter_inorden()).valor, 49)
+        arbol.eliminar(10)
+        self.assertIsNone(arbol.buscar(10))
+        self.assertEqual(arbol.buscar(11).valor, 11)
+
+    def test_eliminarWhere_reconstruye(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll(tuple(range(200)))
+        arbol.eliminarWhere(lambda nodo: nodo.valor % 4 != 0, reconstruir=True)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(len(list(arbol.iter_inorden())), 50)
+
+    def test_enlazado(self):
+        arbol = ArbolAVL(enlazado=True)
+        arbol.insertarAll(tuple(random.Random(3).sample(range(300), 150)))
+        for valor in range(0, 300, 4):
+            arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz)
+        nodos = list(arbol.iter_inorden())
+        self.assertEqual([nodo.valor for nodo in nodos], sorted(nodo.valor for nodo in arbol.iter_preorden()))
+        for anterior, siguiente in zip(nodos, nodos[1:]):
+            self.assertIs(arbol.anterior(siguiente), anterior)
+
+    def test_guardar_y_cargar(self):
+        descriptor, ruta = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            original = ArbolAVL()
+            original.insertarAll(tuple(range(100)))
+            original.guardar(ruta)
+            arbol = ArbolAVL.cargar(ruta)
+        finally:
+            os.remove(ruta)
+        self.verificar_invariantes(arbol.raiz)
+        arbol.insertar(100)
+        arbol.eliminar(50)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_nodos_compactos(self):
+        generador = random.Random(7)
+        valores = generador.sample(range(1000), 300)
+        arbol = ArbolAVL(clase_nodo=NodoCompacto, estadisticas=True)
+        arbol.insertarAll(tuple(valores))
+        for valor in valores[::2]:
+            arbol.eliminar(valor)
+        self.assertIsInstance(arbol.raiz, NodoAVLCompacto)
+        self.assertFalse(hasattr(arbol.raiz, '__dict__'))
+        self.verificar_invariantes(arbol.raiz, estadisticas=True)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], sorted(valores[1::2]))
+
+    def test_multiconjunto(self):
+        arbol = ArbolAVL(multiconjunto=True)
+        arbol.insertarAll((1, 2, 3, 2, 2))
+        self.assertEqual(arbol.contar(2), 3)
+        arbol.eliminar(2)
+        self.assertEqual(arbol.contar(2), 2)
+        arbol.eliminarAll(2)
+        self.assertEqual(arbol.contar(2), 0)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_estadisticas_con_rotaciones(self):
+        arbol = ArbolAVL(estadisticas=True, multiconjunto=True)
+        arbol.insertarAll(tuple(range(200)))
+        arbol.insertarAll((5, 5, 150))
+        for valor in range(0, 200, 3):
+            arbol.eliminar(valor)
+        arbol.eliminar(5)
+        self.verificar_invariantes(arbol.raiz, estadisticas=True)
+        ordenados = [nodo.valor for nodo in arbol.iter_inorden() for _ in range(nodo.cuenta)]
+        self.assertEqual(arbol.seleccionar(60).valor, ordenados[60])
+        self.assertEqual(arbol.rango(100), sum(1 for valor in ordenados if valor < 100))
+
+    def test_buscar(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll(tuple(range(100)), lambda x, y: x < y)
+        self.assertEqual(arbol.buscar(42).valor, 42)
+        self.assertIsNone(arbol.buscar(100))
+
+    def test_eliminar_mantiene_balance(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll(tuple(range(200)), lambda x, y: x < y)
+        for valor in range(0, 200, 3):
+            arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertIsNone(arbol.buscar(3))
+        self.assertEqual(arbol.buscar(4).valor, 4)
+
+    def test_eliminar_conserva_nodo_sucesor(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll((10, 5, 15, 12, 20), lambda x, y: x < y)
+        sucesor = arbol.buscar(12)
+        arbol.eliminar(10)
+        self.assertIs(arbol.raiz, sucesor)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_eliminarAll(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll((10, 5, 15), lambda x, y: x < y)
+        resultados = arbol.eliminarAll(5)
+        self.assertEqual([nodo.valor for nodo in resultados], [5])
+        self.assertIsNone(arbol.buscar(5))
+
+    def test_eliminarWhere_conserva_descendientes(self):
+        arbol = ArbolAVL()
+        arbol.insertarAll(tuple(range(50)), lambda x, y: x < y)
+        arbol.eliminarWhere(lambda nodo: nodo.valor % 2 == 0)
+        self.verificar_invariantes(arbol.raiz)
+        valores = sorted(nodo.valor for nodo in arbol.buscarWhere(lambda nodo: True))
+        self.assertEqual(valores, list(range(1, 50, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
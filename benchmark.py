@@ -0,0 +1,481 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from arreglos import ArbolArreglos
+from avl import ArbolAVL
+from bmas import ArbolBMas
+from concurrente import ArbolConcurrente
+from congelado import ArbolCongelado
+from disco import ArbolBDisco
+from eliminacion import ArbolBinario, Nodo, NodoCompacto
+from persistente import ArbolPersistente
+from rojinegro import ArbolRojiNegro
+
+
+def menor(x, y) -> bool:
+    return x < y
+
+
+def medir(funcion: Callable[[], object], repeticiones: int = 1) -> float:
+    """
+    Mide el tiempo de ejecución de una función.
+
+    Args:
+        funcion (Callable): La función a medir.
+        repeticiones (int): Número de veces que se ejecuta la función.
+
+    Returns:
+        float: El mejor tiempo obtenido, en segundos.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+# Inserción y búsqueda con entrada ordenada: ArbolBinario degenera en una lista, ArbolAVL no
+def benchmark_avl() -> None:
+    print(f"{'n':>6} {'arbol':>14} {'insertar (ms)':>14} {'buscar (us/op)':>15}")
+    for n in (100, 200, 400, 800):
+        valores = tuple(range(n))
+        for clase in (ArbolBinario, ArbolAVL):
+            arbol = clase()
+            tiempo_insercion = medir(lambda: arbol.insertarAll(valores, menor))
+            tiempo_busqueda = medir(lambda: [arbol.buscar(valor) for valor in valores], repeticiones=3)
+            print(f"{n:>6} {clase.__name__:>14} {tiempo_insercion * 1e3:>14.2f} {tiempo_busqueda / n * 1e6:>15.2f}")
+
+
+# Carga mixta con predominio de escrituras: 45% inserciones, 35% eliminaciones y 20% búsquedas
+def benchmark_rojinegro() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>7} {'arbol':>15} {'total (ms)':>11} {'us/op':>8}")
+    for n in (1000, 10000, 50000):
+        operaciones = []
+        for _ in range(n):
+            tirada = generador.random()
+            tipo = 'insertar' if tirada < 0.45 else 'eliminar' if tirada < 0.8 else 'buscar'
+            operaciones.append((tipo, generador.randrange(n)))
+        claves_iniciales = tuple(generador.sample(range(n), n // 2))
+
+        for clase in (ArbolBinario, ArbolAVL, ArbolRojiNegro):
+            arbol = clase()
+            arbol.insertarAll(claves_iniciales, menor)
+
+            def ejecutar() -> None:
+                for tipo, valor in operaciones:
+                    if tipo == 'insertar':
+                        arbol.insertar(valor, menor)
+                    elif tipo == 'eliminar':
+                        arbol.eliminar(valor)
+                    else:
+                        arbol.buscar(valor)
+
+            tiempo = medir(ejecutar)
+            print(f"{n:>7} {clase.__name__:>15} {tiempo * 1e3:>11.2f} {tiempo / n * 1e6:>8.2f}")
+
+
+# Memoria por nodo y búsquedas por segundo con Nodo y con NodoCompacto
+def benchmark_nodo_compacto() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>7} {'nodo':>13} {'bytes/nodo':>11} {'busquedas/s':>12}")
+    for n in (10000, 100000):
+        valores = tuple(generador.sample(range(n * 10), n))
+        for clase_nodo in (Nodo, NodoCompacto):
+            tracemalloc.start()
+            arbol = ArbolBinario(clase_nodo=clase_nodo)
+            arbol.insertarAll(valores, menor)
+            memoria = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            tiempo = medir(lambda: [arbol.buscar(valor) for valor in valores], repeticiones=3)
+            print(f"{n:>7} {clase_nodo.__name__:>13} {memoria / n:>11.1f} {n / tiempo:>12.0f}")
+
+
+# Memoria por nodo y búsquedas por segundo del árbol en arreglos frente a los árboles de objetos
+def benchmark_arreglos() -> None:
+    generador = random.Random(42)
+    constructores = {
+        'Nodo': lambda: ArbolBinario(clase_nodo=Nodo),
+        'NodoCompacto': lambda: ArbolBinario(clase_nodo=NodoCompacto),
+        'ArbolArreglos': ArbolArreglos,
+    }
+    print(f"{'n':>7} {'almacenamiento':>15} {'bytes/nodo':>11} {'busquedas/s':>12}")
+    for n in (10000, 100000):
+        valores = tuple(generador.sample(range(n * 10), n))
+        for nombre, constructor in constructores.items():
+            tracemalloc.start()
+            arbol = constructor()
+            arbol.insertarAll(valores, menor)
+            memoria = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            tiempo = medir(lambda: [arbol.buscar(valor) for valor in valores], repeticiones=3)
+            print(f"{n:>7} {nombre:>15} {memoria / n:>11.1f} {n / tiempo:>12.0f}")
+
+
+# Carga de un lote de valores: inserción uno a uno frente a la construcción masiva balanceada
+def benchmark_carga_masiva() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'entrada':>11} {'modo':>9} {'tiempo (ms)':>12}")
+    for n in (2000, 200000):
+        aleatorios = tuple(generador.sample(range(n * 10), n))
+        for entrada, valores in (('aleatoria', aleatorios), ('ordenada', tuple(sorted(aleatorios)))):
+            for masivo in (False, True):
+                if entrada == 'ordenada' and not masivo and n > 2000:
+                    continue
+                tiempo = medir(lambda: ArbolBinario().insertarAll(valores, menor, masivo=masivo))
+                modo = 'masivo' if masivo else 'uno a uno'
+                print(f"{n:>8} {entrada:>11} {modo:>9} {tiempo * 1e3:>12.1f}")
+
+
+# Consultas de rango: buscarRango con poda frente a buscarWhere sobre todo el árbol
+def benchmark_rango() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'k':>6} {'buscarWhere (ms)':>17} {'buscarRango (ms)':>17}")
+    for n in (10000, 200000):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(generador.sample(range(n * 10), n)), masivo=True)
+        for k in (10, 1000):
+            desde = n * 5
+            hasta = desde + k * 10
+            tiempo_where = medir(lambda: arbol.buscarWhere(lambda nodo: desde <= nodo.valor <= hasta))
+            tiempo_rango = medir(lambda: arbol.buscarRango(desde, hasta), repeticiones=5)
+            print(f"{n:>8} {k:>6} {tiempo_where * 1e3:>17.2f} {tiempo_rango * 1e3:>17.3f}")
+
+
+# Rotación de claves con muchas eliminaciones: se elimina una clave existente y se inserta una nueva
+def benchmark_eliminacion() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'nodo':>13} {'ops/s':>10} {'bytes asignados/eliminacion':>28}")
+    for n in (10000, 100000):
+        iniciales = generador.sample(range(n * 10), n)
+        eliminadas = generador.sample(iniciales, n // 2)
+        nuevas = tuple(generador.sample(range(n * 10, n * 20), n // 2))
+        for clase_nodo in (Nodo, NodoCompacto):
+            arbol = ArbolBinario(clase_nodo=clase_nodo)
+            arbol.insertarAll(tuple(iniciales), masivo=True)
+
+            # Se suman los bloques que han crecido entre dos instantáneas: el pico de get_traced_memory
+            # mediría lo vivo en el peor momento, no lo asignado por las eliminaciones
+            tracemalloc.start()
+            antes = tracemalloc.take_snapshot()
+            for valor in eliminadas[:1000]:
+                arbol.eliminar(valor)
+            despues = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            asignados = sum(diferencia.size_diff for diferencia in despues.compare_to(antes, 'lineno')
+                            if diferencia.size_diff > 0)
+
+            def rotar() -> None:
+                for eliminada, nueva in zip(eliminadas[1000:], nuevas):
+                    arbol.eliminar(eliminada)
+                    arbol.insertar(nueva)
+
+            tiempo = medir(rotar)
+            operaciones = 2 * (len(eliminadas) - 1000)
+            print(f"{n:>8} {clase_nodo.__name__:>13} {operaciones / tiempo:>10.0f} {asignados / 1000:>28.1f}")
+
+
+# Purga del 30% de las claves: eliminación uno a uno frente a la reconstrucción balanceada
+def benchmark_purga() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'arbol':>15} {'modo':>12} {'tiempo (ms)':>12}")
+    for n in (10000, 100000):
+        valores = tuple(generador.sample(range(n * 10), n))
+        for clase in (ArbolBinario, ArbolAVL, ArbolRojiNegro):
+            for reconstruir in (False, True):
+                arbol = clase()
+                arbol.insertarAll(valores, masivo=True)
+                tiempo = medir(lambda: arbol.eliminarWhere(lambda nodo: nodo.valor % 10 < 3, reconstruir=reconstruir))
+                modo = 'reconstruir' if reconstruir else 'uno a uno'
+                print(f"{n:>8} {clase.__name__:>15} {modo:>12} {tiempo * 1e3:>12.1f}")
+
+
+# Recorrido completo en orden: pila sobre izquierda/derecha frente a los enlaces al sucesor
+def benchmark_recorrido() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'nodo':>13} {'modo':>10} {'us/paso':>8}")
+    for n in (10000, 200000):
+        valores = tuple(generador.sample(range(n * 10), n))
+        for clase_nodo in (Nodo, NodoCompacto):
+            for enlazado in (False, True):
+                arbol = ArbolBinario(clase_nodo=clase_nodo, enlazado=enlazado)
+                arbol.insertarAll(valores, masivo=True)
+                tiempo = medir(lambda: sum(1 for _ in arbol.iter_inorden()), repeticiones=3)
+                modo = 'enlazado' if enlazado else 'pila'
+                print(f"{n:>8} {clase_nodo.__name__:>13} {modo:>10} {tiempo / n * 1e6:>8.3f}")
+
+
+# Búsquedas locales (ventana deslizante sobre claves ordenadas): buscar desde la raíz frente a Cursor.buscar
+def benchmark_cursor() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'arbol':>15} {'buscar (us/op)':>15} {'cursor (us/op)':>15}")
+    for n in (10000, 200000):
+        valores = tuple(range(n))
+        consultas = [min(max(i + generador.randrange(-8, 9), 0), n - 1) for i in range(0, n, 4)]
+        for clase in (ArbolBinario, ArbolAVL, ArbolRojiNegro):
+            arbol = clase()
+            arbol.insertarAll(valores, masivo=True)
+            cursor = arbol.cursor()
+            tiempo_buscar = medir(lambda: [arbol.buscar(valor) for valor in consultas], repeticiones=3)
+            tiempo_cursor = medir(lambda: [cursor.buscar(valor) for valor in consultas], repeticiones=3)
+            print(f"{n:>8} {clase.__name__:>15} {tiempo_buscar / len(consultas) * 1e6:>15.2f} "
+                  f"{tiempo_cursor / len(consultas) * 1e6:>15.2f}")
+
+
+# Lotes de búsquedas: buscar uno a uno frente a buscarMuchos con descenso compartido
+def benchmark_lotes() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'m':>7} {'buscar (ms)':>12} {'buscarMuchos (ms)':>18}")
+    for n in (10000, 200000):
+        valores = tuple(generador.sample(range(n * 2), n))
+        arbol = ArbolBinario()
+        arbol.insertarAll(valores, masivo=True)
+        for m in (100, 5000, n):
+            consultas = tuple(generador.choices(range(n * 2), k=m))
+            tiempo_buscar = medir(lambda: [arbol.buscar(valor) for valor in consultas], repeticiones=3)
+            tiempo_lote = medir(lambda: arbol.buscarMuchos(consultas), repeticiones=3)
+            print(f"{n:>8} {m:>7} {tiempo_buscar * 1e3:>12.2f} {tiempo_lote * 1e3:>18.2f}")
+
+
+# Lecturas sobre una instantánea congelada frente a recorrer los nodos del árbol
+def benchmark_congelado() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'consulta':>13} {'arbol (us/op)':>14} {'congelado (us/op)':>18}")
+    for n in (10000, 1000000):
+        arbol = ArbolBinario(estadisticas=True)
+        arbol.insertarAll(tuple(generador.sample(range(n * 10), n)), masivo=True)
+        congelado = arbol.congelar()
+        consultas = tuple(generador.choices(range(n * 10), k=20000))
+        casos = (
+            ('buscar', lambda origen: [origen.buscar(valor) for valor in consultas]),
+            ('buscarMuchos', lambda origen: origen.buscarMuchos(consultas)),
+            ('rango', lambda origen: [origen.rango(valor) for valor in consultas]),
+        )
+        for nombre, consulta in casos:
+            tiempo_arbol = medir(lambda: consulta(arbol), repeticiones=3)
+            tiempo_congelado = medir(lambda: consulta(congelado), repeticiones=3)
+            print(f"{n:>8} {nombre:>14} {tiempo_arbol / len(consultas) * 1e6:>14.2f} "
+                  f"{tiempo_congelado / len(consultas) * 1e6:>18.2f}")
+
+
+# Búsquedas en índices estáticos: nodos enlazados, arreglo ordenado con bisect y disposición de Eytzinger
+def benchmark_eytzinger() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'arbol (us/op)':>14} {'ordenado (us/op)':>17} {'eytzinger (us/op)':>18}")
+    for n in (1000, 100000, 1000000):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(generador.sample(range(n * 10), n)), masivo=True)
+        congelado = arbol.congelar()
+        indice = congelado.eytzinger()
+        consultas = tuple(generador.choices(range(n * 10), k=20000))
+        tiempos = [medir(lambda: [origen.buscar(valor) for valor in consultas], repeticiones=3)
+                   for origen in (arbol, congelado, indice)]
+        print(f"{n:>8} " + " ".join(f"{tiempo / len(consultas) * 1e6:>{ancho}.2f}"
+                                    for tiempo, ancho in zip(tiempos, (14, 17, 18))))
+
+
+# Versiones persistentes: coste de cada actualización y memoria que añade cada versión conservada
+def benchmark_persistente() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'AVL (us/op)':>12} {'persistente (us/op)':>20} {'bytes/version':>14}")
+    for n in (10000, 100000):
+        iniciales = tuple(generador.sample(range(n * 10), n))
+        nuevas = tuple(generador.sample(range(n * 10, n * 20), 2000))
+
+        avl = ArbolAVL()
+        avl.insertarAll(iniciales)
+        tiempo_avl = medir(lambda: [avl.insertar(valor) for valor in nuevas])
+
+        base = ArbolPersistente().insertarAll(iniciales)
+        versiones = []
+
+        def actualizar() -> None:
+            version = base
+            for valor in nuevas:
+                version = version.insertar(valor)
+                versiones.append(version)
+
+        tiempo_persistente = medir(actualizar)
+        versiones.clear()
+        tracemalloc.start()
+        actualizar()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{n:>8} {tiempo_avl / len(nuevas) * 1e6:>12.2f} {tiempo_persistente / len(nuevas) * 1e6:>20.2f} "
+              f"{memoria / len(nuevas):>14.0f}")
+
+
+# Estrés con varios hilos sobre un árbol compartido: rendimiento total según el número de hilos
+def benchmark_concurrente() -> None:
+    n = 100000
+    operaciones_por_hilo = 20000
+    print(f"{'hilos':>6} {'escrituras':>11} {'ops/s':>10}")
+    for proporcion_escrituras in (0.1, 0.5):
+        for hilos in (1, 2, 4, 8):
+            arbol = ArbolConcurrente(ArbolRojiNegro())
+            arbol.insertarAll(tuple(random.Random(42).sample(range(n * 2), n)))
+
+            def trabajar(semilla: int) -> None:
+                generador = random.Random(semilla)
+                for _ in range(operaciones_por_hilo):
+                    valor = generador.randrange(n * 2)
+                    tirada = generador.random()
+                    if tirada < proporcion_escrituras / 2:
+                        arbol.insertar(valor)
+                    elif tirada < proporcion_escrituras:
+                        arbol.eliminar(valor)
+                    else:
+                        arbol.buscar(valor)
+
+            def ejecutar() -> None:
+                trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+                for trabajador in trabajadores:
+                    trabajador.start()
+                for trabajador in trabajadores:
+                    trabajador.join()
+
+            tiempo = medir(ejecutar)
+            print(f"{hilos:>6} {proporcion_escrituras:>11.0%} {hilos * operaciones_por_hilo / tiempo:>10.0f}")
+
+
+# Carga masiva ordenando la entrada en varios procesos: tiempo de construcción según el número de procesos
+def benchmark_carga_paralela() -> None:
+    generador = random.Random(42)
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print(f"{'n':>8} {'procesos':>9} {'tiempo (s)':>11}")
+    for n in (1000000,):
+        valores = tuple(generador.sample(range(n * 10), n))
+        for procesos in (None, 1, 2, 4, 8):
+            tiempo = medir(lambda: ArbolBinario(clase_nodo=NodoCompacto).insertarAll(valores, masivo=True, procesos=procesos))
+            print(f"{n:>8} {procesos or '-':>9} {tiempo:>11.2f}")
+
+
+def predicado_costoso(nodo) -> bool:
+    # Simula decodificar la carga del nodo y comprobar varios campos
+    carga = json.loads(json.dumps({'id': nodo.valor, 'etiquetas': list(range(50)), 'activo': nodo.valor % 2 == 0}))
+    return carga['activo'] and carga['id'] % 7 == 0 and sum(carga['etiquetas']) > 0
+
+
+# buscarWhere con una proposición costosa: en serie frente a repartida entre hilos o procesos
+def benchmark_where_paralelo() -> None:
+    generador = random.Random(42)
+    n = 50000
+    arbol = ArbolBinario()
+    arbol.insertarAll(tuple(generador.sample(range(n * 10), n)), masivo=True)
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print(f"{'ejecutor':>9} {'trabajadores':>13} {'bloque':>7} {'tiempo (ms)':>12}")
+    print(f"{'serie':>9} {'-':>13} {'-':>7} {medir(lambda: arbol.buscarWhere(predicado_costoso)) * 1e3:>12.1f}")
+    for nombre, clase in (('hilos', ThreadPoolExecutor), ('procesos', ProcessPoolExecutor)):
+        for trabajadores in (1, 2, 4):
+            for tamano_bloque in (100, 5000):
+                with clase(max_workers=trabajadores) as ejecutor:
+                    tiempo = medir(lambda: arbol.buscarWhere(predicado_costoso, ejecutor, tamano_bloque))
+                print(f"{nombre:>9} {trabajadores:>13} {tamano_bloque:>7} {tiempo * 1e3:>12.1f}")
+
+
+# Arranque en frío: reinsertar los valores frente a cargar el archivo binario o abrirlo como instantánea
+def benchmark_arranque() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'tipo':>8} {'insertarAll (s)':>16} {'cargar (s)':>11} {'abrir (ms)':>11} {'MB':>6}")
+    for n in (100000, 1000000):
+        enteros = generador.sample(range(n * 10), n)
+        for tipo, valores in (('enteros', enteros), ('cadenas', [f"clave-{valor:09d}" for valor in enteros])):
+            arbol = ArbolBinario(clase_nodo=NodoCompacto)
+            arbol.insertarAll(tuple(valores), masivo=True)
+            with tempfile.NamedTemporaryFile(suffix='.arbb') as archivo:
+                arbol.guardar(archivo.name)
+                tiempo_insertar = medir(
+                    lambda: ArbolBinario(clase_nodo=NodoCompacto).insertarAll(tuple(valores), masivo=True))
+                tiempo_cargar = medir(lambda: ArbolBinario.cargar(archivo.name, clase_nodo=NodoCompacto))
+                def abrir_y_buscar() -> None:
+                    with ArbolCongelado.abrir(archivo.name) as congelado:
+                        congelado.buscar(valores[0])
+
+                tiempo_abrir = medir(abrir_y_buscar, repeticiones=3)
+                megas = os.path.getsize(archivo.name) / 2 ** 20
+            print(f"{n:>8} {tipo:>8} {tiempo_insertar:>16.2f} {tiempo_cargar:>11.2f} {tiempo_abrir * 1e3:>11.2f} {megas:>6.1f}")
+
+
+# Árbol B+ en disco: latencia de búsqueda y proporción de aciertos de la caché de páginas según su tamaño
+def benchmark_disco() -> None:
+    generador = random.Random(42)
+    n = 200000
+    valores = generador.sample(range(n * 10), n)
+    consultas = generador.choices(valores, k=20000)
+    with tempfile.NamedTemporaryFile(suffix='.arbd') as archivo:
+        with ArbolBDisco(archivo.name, memoria_cache=64 * 2 ** 20) as arbol:
+            tiempo_carga = medir(lambda: arbol.insertarAll(tuple(valores)))
+        megas = os.path.getsize(archivo.name) / 2 ** 20
+        print(f"insertar {n} claves: {tiempo_carga:.2f} s, archivo de {megas:.1f} MB")
+        print(f"{'cache (KB)':>10} {'frio (us)':>10} {'aciertos':>9} {'caliente (us)':>14} {'aciertos':>9}")
+        for memoria in (64 * 2 ** 10, 2 ** 20, 8 * 2 ** 20, 64 * 2 ** 20):
+            with ArbolBDisco(archivo.name, memoria_cache=memoria) as arbol:
+                fila = f"{memoria // 2 ** 10:>10}"
+                for ancho in (10, 14):
+                    arbol.aciertos = arbol.fallos = 0
+                    tiempo = medir(lambda: [arbol.buscar(valor) for valor in consultas])
+                    proporcion = arbol.aciertos / (arbol.aciertos + arbol.fallos)
+                    fila += f" {tiempo / len(consultas) * 1e6:>{ancho}.2f} {proporcion:>9.1%}"
+                print(fila)
+
+
+# Árbol B+ en memoria frente a ArbolBinario: búsquedas puntuales, recorrido en orden y consultas de rango
+def benchmark_bmas() -> None:
+    generador = random.Random(42)
+    print(f"{'n':>8} {'arbol':>14} {'buscar (us)':>12} {'recorrido (ms)':>15} {'rango (us)':>11}")
+    for n in (100000, 1000000):
+        valores = tuple(generador.sample(range(n * 10), n))
+        consultas = generador.choices(valores, k=100000)
+        desdes = generador.choices(range(n * 10), k=1000)
+        binario = ArbolBinario()
+        binario.insertarAll(valores, masivo=True)
+        for nombre, arbol in (('ArbolBinario', binario), ('ArbolBMas(16)', ArbolBMas(orden=16)),
+                              ('ArbolBMas(64)', ArbolBMas()), ('ArbolBMas(256)', ArbolBMas(orden=256))):
+            if nombre != 'ArbolBinario':
+                arbol.insertarAll(valores)
+            tiempo_buscar = medir(lambda: [arbol.buscar(valor) for valor in consultas], repeticiones=3)
+            tiempo_recorrido = medir(lambda: sum(1 for _ in arbol.iter_inorden()), repeticiones=3)
+            # Rangos de unos 100 valores
+            tiempo_rango = medir(lambda: [arbol.buscarRango(desde, desde + 1000) for desde in desdes], repeticiones=3)
+            print(f"{n:>8} {nombre:>14} {tiempo_buscar / len(consultas) * 1e6:>12.2f} "
+                  f"{tiempo_recorrido * 1e3:>15.1f} {tiempo_rango / len(desdes) * 1e6:>11.1f}")
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    'avl': benchmark_avl,
+    'rojinegro': benchmark_rojinegro,
+    'nodo_compacto': benchmark_nodo_compacto,
+    'arreglos': benchmark_arreglos,
+    'carga_masiva': benchmark_carga_masiva,
+    'rango': benchmark_rango,
+    'eliminacion': benchmark_eliminacion,
+    'purga': benchmark_purga,
+    'recorrido': benchmark_recorrido,
+    'cursor': benchmark_cursor,
+    'lotes': benchmark_lotes,
+    'congelado': benchmark_congelado,
+    'eytzinger': benchmark_eytzinger,
+    'persistente': benchmark_persistente,
+    'concurrente': benchmark_concurrente,
+    'carga_paralela': benchmark_carga_paralela,
+    'where_paralelo': benchmark_where_paralelo,
+    'arranque': benchmark_arranque,
+    'disco': benchmark_disco,
+    'bmas': benchmark_bmas,
+}
+
+
+if __name__ == '__main__':
+    nombres = sys.argv[1:] or list(BENCHMARKS)
+    for nombre in nombres:
+        print(f"== {nombre}")
+        BENCHMARKS[nombre]()
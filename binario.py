@@ -0,0 +1,275 @@
+from array import array
+from typing import Optional, Sequence, Tuple
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+# Cabecera: firma, versión, tipo de clave, si hay sección de cuentas y número de valores
+CABECERA = struct.Struct('<4sBBBxQ')
+FIRMA = b'ARBB'
+VERSION = 1
+
+ENTEROS, FLOTANTES, CADENAS = 0, 1, 2
+_CODIGOS = {ENTEROS: 'q', FLOTANTES: 'd'}
+
+
+def _tipo_de(valores: list) -> int:
+    for tipo, clase in ((ENTEROS, int), (FLOTANTES, float), (CADENAS, str)):
+        if all(type(valor) is clase for valor in valores):
+            return tipo
+    raise TypeError("Solo se pueden guardar árboles cuyos valores son todos enteros, todos flotantes o todos cadenas")
+
+
+def _a_bytes(codigo: str, numeros) -> bytes:
+    datos = array(codigo, numeros)
+    if sys.byteorder != 'little':
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def escribir(ruta: str, valores: list, cuentas: Optional[list] = None) -> None:
+    """
+    Guarda los valores, ya ordenados, en el formato binario del árbol:
+
+    - Cabecera de 16 bytes (CABECERA).
+    - Enteros y flotantes: los valores como números de 8 bytes en little-endian.
+    - Cadenas: una tabla de n + 1 desplazamientos de 8 bytes seguida de las cadenas en UTF-8; la longitud de
+      cada cadena es la diferencia entre dos desplazamientos consecutivos.
+    - Si cuentas tiene algún valor distinto de 1, las cuentas como enteros de 8 bytes, antes de las cadenas.
+
+    Todas las secciones se convierten antes de tocar el archivo, que se escribe aparte y sustituye al de ruta
+    de una vez: si algo falla, el archivo anterior queda intacto.
+
+    Raises:
+        TypeError: Si los valores no son todos del mismo tipo admitido.
+        OverflowError: Si algún entero o alguna cuenta no cabe en 64 bits con signo.
+    """
+    tipo = _tipo_de(valores)
+    con_cuentas = cuentas is not None and any(cuenta != 1 for cuenta in cuentas)
+    secciones = [CABECERA.pack(FIRMA, VERSION, tipo, con_cuentas, len(valores))]
+    if tipo == CADENAS:
+        codificadas = [valor.encode('utf-8') for valor in valores]
+        desplazamientos = [0]
+        for codificada in codificadas:
+            desplazamientos.append(desplazamientos[-1] + len(codificada))
+        secciones.append(_a_bytes('q', desplazamientos))
+    else:
+        secciones.append(_a_bytes(_CODIGOS[tipo], valores))
+    if con_cuentas:
+        secciones.append(_a_bytes('q', cuentas))
+    if tipo == CADENAS:
+        secciones.append(b''.join(codificadas))
+
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)))
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.writelines(secciones)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+# Secuencia de cadenas guardadas en un archivo proyectado en memoria: cada acceso decodifica solo su cadena
+class CadenasMapeadas:
+    __slots__ = ('_datos', '_desplazamientos', '_inicio')
+
+    def __init__(self, datos: memoryview, desplazamientos: Sequence[int], inicio: int):
+        self._datos = datos
+        self._desplazamientos = desplazamientos
+        self._inicio = inicio
+
+    def __len__(self) -> int:
+        return len(self._desplazamientos) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        inicio = self._inicio + self._desplazamientos[i]
+        fin = self._inicio + self._desplazamientos[i + 1]
+        return str(self._datos[inicio:fin], 'utf-8')
+
+
+# Archivo proyectado en memoria con sus secciones; las secciones son vistas sobre la proyección, que se
+# libera con cerrar o al salir de un bloque with
+class ArchivoProyectado:
+
+    def __init__(self, ruta: str) -> None:
+        """
+        Proyecta el archivo en memoria y prepara secuencias que leen de él sin convertir antes cada registro
+        en un objeto de Python: memoryview de números o CadenasMapeadas.
+
+        Attributes:
+            valores (Sequence): Los valores en orden.
+            cuentas (Optional[Sequence]): Sus cuentas, o None si todas son 1.
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato esperado o está truncado.
+        """
+        with open(ruta, 'rb') as archivo:
+            if os.fstat(archivo.fileno()).st_size < CABECERA.size:
+                raise ValueError(f"{ruta} no es un árbol guardado con guardar: es más corto que la cabecera")
+            self._proyeccion = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._vistas = []
+        try:
+            self._leer_secciones(ruta)
+        except ValueError:
+            self.cerrar()
+            raise
+
+    def _leer_secciones(self, ruta: str) -> None:
+        datos = self._vista(memoryview(self._proyeccion))
+        firma, version, tipo, con_cuentas, n = CABECERA.unpack_from(datos)
+        if firma != FIRMA or version != VERSION or tipo not in (ENTEROS, FLOTANTES, CADENAS):
+            raise ValueError(f"{ruta} no es un árbol guardado con guardar")
+
+        # Tamaño de las secciones de tamaño fijo según n; las cadenas se comprueban con su último desplazamiento
+        tamano = CABECERA.size + 8 * (n + 1 if tipo == CADENAS else n) + (8 * n if con_cuentas else 0)
+        if len(datos) < tamano:
+            raise ValueError(f"{ruta} está truncado: tiene {len(datos)} bytes y necesita al menos {tamano}")
+
+        posicion = CABECERA.size
+        if tipo == CADENAS:
+            desplazamientos = self._numeros(datos, posicion, n + 1, 'q')
+            posicion += 8 * (n + 1)
+        else:
+            self.valores = self._numeros(datos, posicion, n, _CODIGOS[tipo])
+            posicion += 8 * n
+        self.cuentas = None
+        if con_cuentas:
+            self.cuentas = self._numeros(datos, posicion, n, 'q')
+            posicion += 8 * n
+        if tipo == CADENAS:
+            if len(datos) < posicion + desplazamientos[-1]:
+                raise ValueError(f"{ruta} está truncado: faltan bytes de las cadenas")
+            self.valores = CadenasMapeadas(datos, desplazamientos, posicion)
+
+    def _vista(self, vista: memoryview) -> memoryview:
+        self._vistas.append(vista)
+        return vista
+
+    def _numeros(self, datos: memoryview, inicio: int, n: int, codigo: str) -> Sequence:
+        seccion = self._vista(datos[inicio:inicio + 8 * n])
+        if sys.byteorder == 'little':
+            return self._vista(seccion.cast(codigo))
+        numeros = array(codigo, seccion.tobytes())
+        numeros.byteswap()
+        return numeros
+
+    def cerrar(self) -> None:
+        """
+        Libera la proyección. Las secuencias obtenidas de este archivo dejan de poder leerse.
+        """
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas.clear()
+        self._proyeccion.close()
+
+    def __enter__(self) -> 'ArchivoProyectado':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+
+def leer(ruta: str) -> ArchivoProyectado:
+    """
+    Abre un archivo creado con escribir. Hay que cerrarlo cuando ya no se usen sus secuencias.
+
+    Raises:
+        ValueError: Si el archivo no tiene el formato esperado o está truncado.
+    """
+    return ArchivoProyectado(ruta)
+
+
+# Clase de prueba para el formato binario
+class TestBinario(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        descriptor, self.ruta = tempfile.mkstemp(dir=self.directorio)
+        os.close(descriptor)
+
+    def tearDown(self):
+        os.remove(self.ruta)
+        os.rmdir(self.directorio)
+
+    def test_enteros(self):
+        escribir(self.ruta, [-5, 0, 7, 2 ** 40])
+        with leer(self.ruta) as archivo:
+            self.assertIsInstance(archivo.valores, memoryview)
+            self.assertEqual(list(archivo.valores), [-5, 0, 7, 2 ** 40])
+            self.assertIsNone(archivo.cuentas)
+        self.assertEqual(os.path.getsize(self.ruta), CABECERA.size + 4 * 8)
+
+    def test_flotantes_con_cuentas(self):
+        escribir(self.ruta, [0.5, 1.5], [3, 1])
+        with leer(self.ruta) as archivo:
+            self.assertEqual(list(archivo.valores), [0.5, 1.5])
+            self.assertEqual(list(archivo.cuentas), [3, 1])
+
+    def test_cadenas(self):
+        escribir(self.ruta, ["", "año", "b"], [1, 2, 1])
+        with leer(self.ruta) as archivo:
+            valores = archivo.valores
+            self.assertEqual(len(valores), 3)
+            self.assertEqual(list(valores), ["", "año", "b"])
+            self.assertEqual(valores[-1], "b")
+            self.assertEqual(valores[1:], ["año", "b"])
+            self.assertEqual(list(archivo.cuentas), [1, 2, 1])
+
+    def test_vacio(self):
+        escribir(self.ruta, [])
+        with leer(self.ruta) as archivo:
+            self.assertEqual(len(archivo.valores), 0)
+
+    def test_desbordamiento_no_toca_el_archivo(self):
+        escribir(self.ruta, [1, 2])
+        with self.assertRaises(OverflowError):
+            escribir(self.ruta, [1, 2 ** 70, 3])
+        with self.assertRaises(OverflowError):
+            escribir(self.ruta, [1, 2], [1, 2 ** 70])
+        with leer(self.ruta) as archivo:
+            self.assertEqual(list(archivo.valores), [1, 2])
+        self.assertEqual(os.listdir(self.directorio), [os.path.basename(self.ruta)])
+
+    def test_tipos_mezclados(self):
+        with self.assertRaises(TypeError):
+            escribir(self.ruta, [1, "a"])
+
+    def test_archivo_ajeno(self):
+        with open(self.ruta, 'wb') as archivo:
+            archivo.write(b'x' * 32)
+        with self.assertRaises(ValueError):
+            leer(self.ruta)
+
+    def test_archivo_truncado(self):
+        for valores in ([1, 2, 3], ["ab", "cd"]):
+            escribir(self.ruta, valores, [2] * len(valores))
+            tamano = os.path.getsize(self.ruta)
+            for longitud in (0, CABECERA.size - 1, CABECERA.size, tamano - 1):
+                with open(self.ruta, 'r+b') as archivo:
+                    archivo.truncate(longitud)
+                with self.assertRaises(ValueError):
+                    leer(self.ruta)
+                escribir(self.ruta, valores, [2] * len(valores))
+
+    def test_cerrar_libera_la_proyeccion(self):
+        for valores in ([1, 2, 3], ["a", "b"]):
+            escribir(self.ruta, valores, [2] * len(valores))
+            archivo = leer(self.ruta)
+            secuencia = archivo.valores
+            archivo.cerrar()
+            self.assertTrue(archivo._proyeccion.closed)
+            with self.assertRaises(ValueError):
+                secuencia[0]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,396 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterator, Optional, TypeVar, Tuple
+import random
+import unittest
+
+from eliminacion import Arbol
+from paralelo import VistaNodo
+
+T = TypeVar('T')
+
+
+# Hoja del árbol B+: un bloque ordenado de claves con sus entradas, enlazado con las hojas vecinas
+class HojaBMas:
+    __slots__ = ('claves', 'entradas', 'anterior', 'siguiente')
+
+    def __init__(self, claves: list, entradas: list):
+        self.claves = claves
+        self.entradas = entradas
+        self.anterior: Optional['HojaBMas'] = None
+        self.siguiente: Optional['HojaBMas'] = None
+
+
+# Nodo interno del árbol B+: los separadores y sus len(claves) + 1 hijos
+class InternoBMas:
+    __slots__ = ('claves', 'hijos')
+
+    def __init__(self, claves: list, hijos: list):
+        self.claves = claves
+        self.hijos = hijos
+
+
+# Árbol B+ en memoria: cada nodo guarda un bloque de claves que se busca con bisect en lugar de un valor por nodo
+class ArbolBMas(Arbol):
+
+    def __init__(self, orden: int = 64, clave: Optional[Callable[[T], object]] = None) -> None:
+        """
+        Constructor de la clase ArbolBMas.
+
+        Las entradas son VistaNodo con valor, clave y cuenta; buscar devuelve la entrada guardada, como
+        ArbolBinario devuelve el nodo. El orden lo da la clave: la proposición de insertar se ignora.
+
+        Args:
+            orden (int): Número máximo de claves por nodo; salvo la raíz, cada nodo guarda al menos la mitad.
+            clave (Optional[Callable[[T], object]]): Función que calcula la clave de orden de cada valor.
+
+        Raises:
+            ValueError: Si el orden es menor que 3.
+        """
+        if orden < 3:
+            raise ValueError(f"El orden debe ser al menos 3: {orden}")
+        self._orden = orden
+        self._minimo = orden // 2
+        self._clave = clave
+        self._raiz = HojaBMas([], [])
+        self._primera = self._raiz
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _clave_consulta(self, valor: T) -> object:
+        return valor if self._clave is None else self._clave(valor)
+
+    def _hoja(self, clave: object) -> HojaBMas:
+        nodo = self._raiz
+        while type(nodo) is InternoBMas:
+            nodo = nodo.hijos[bisect_right(nodo.claves, clave)]
+        return nodo
+
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        clave = self._clave_consulta(valor)
+        division = self._insertar(self._raiz, clave, valor)
+        if division is not None:
+            self._raiz = InternoBMas([division[0]], [self._raiz, division[1]])
+
+    def _insertar(self, nodo, clave: object, valor: T) -> Optional[tuple]:
+        """
+        Returns:
+            Optional[tuple]: Si el nodo se ha dividido, el separador y el nuevo nodo derecho.
+        """
+        claves = nodo.claves
+        if type(nodo) is HojaBMas:
+            i = bisect_left(claves, clave)
+            if i < len(claves) and claves[i] == clave:
+                return None
+            claves.insert(i, clave)
+            nodo.entradas.insert(i, VistaNodo(valor, clave, 1))
+            self._total += 1
+            if len(claves) <= self._orden:
+                return None
+            medio = len(claves) // 2
+            derecha = HojaBMas(claves[medio:], nodo.entradas[medio:])
+            del claves[medio:], nodo.entradas[medio:]
+            derecha.anterior, derecha.siguiente = nodo, nodo.siguiente
+            if nodo.siguiente is not None:
+                nodo.siguiente.anterior = derecha
+            nodo.siguiente = derecha
+            return derecha.claves[0], derecha
+
+        i = bisect_right(claves, clave)
+        division = self._insertar(nodo.hijos[i], clave, valor)
+        if division is None:
+            return None
+        claves.insert(i, division[0])
+        nodo.hijos.insert(i + 1, division[1])
+        if len(claves) <= self._orden:
+            return None
+        medio = len(claves) // 2
+        separador = claves[medio]
+        derecha = InternoBMas(claves[medio + 1:], nodo.hijos[medio + 1:])
+        del claves[medio:], nodo.hijos[medio + 1:]
+        return separador, derecha
+
+    def insertarAll(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        """
+        Inserta varios valores. Si el árbol está vacío, ordena la entrada y construye los nodos de abajo
+        arriba, llenos, en O(n log n) en lugar de insertar uno a uno.
+        """
+        if self._total or len(valores) <= self._orden:
+            for valor in valores:
+                self.insertar(valor)
+            return
+
+        pares = sorted(((self._clave_consulta(valor), valor) for valor in valores), key=lambda par: par[0])
+        claves, entradas = [], []
+        for clave, valor in pares:
+            if not claves or clave != claves[-1]:
+                claves.append(clave)
+                entradas.append(VistaNodo(valor, clave, 1))
+        self._total = len(claves)
+
+        hojas = []
+        for inicio, fin in self._tramos(len(claves), self._orden):
+            hoja = HojaBMas(claves[inicio:fin], entradas[inicio:fin])
+            if hojas:
+                hojas[-1].siguiente, hoja.anterior = hoja, hojas[-1]
+            hojas.append(hoja)
+        self._primera = hojas[0]
+
+        # Cada nivel guarda, junto a cada nodo, la menor clave de su subárbol para usarla como separador
+        nivel = [(hoja.claves[0], hoja) for hoja in hojas]
+        while len(nivel) > 1:
+            nivel = [(nivel[inicio][0], InternoBMas([menor for menor, _ in nivel[inicio + 1:fin]],
+                                                    [nodo for _, nodo in nivel[inicio:fin]]))
+                     for inicio, fin in self._tramos(len(nivel), self._orden + 1)]
+        self._raiz = nivel[0][1]
+
+    @staticmethod
+    def _tramos(n: int, maximo: int) -> Iterator[Tuple[int, int]]:
+        """
+        Reparte n elementos en el menor número de tramos de como mucho maximo elementos, de tamaños iguales
+        salvo en uno, de modo que ninguno queda por debajo de la mitad.
+        """
+        cantidad = -(-n // maximo)
+        for k in range(cantidad):
+            yield k * n // cantidad, (k + 1) * n // cantidad
+
+    def buscar(self, valor: T) -> Optional[VistaNodo]:
+        clave = self._clave_consulta(valor)
+        nodo = self._raiz
+        while type(nodo) is InternoBMas:
+            nodo = nodo.hijos[bisect_right(nodo.claves, clave)]
+        claves = nodo.claves
+        i = bisect_left(claves, clave)
+        if i < len(claves) and claves[i] == clave:
+            return nodo.entradas[i]
+        return None
+
+    def buscarAll(self, valor: T) -> Tuple[Optional[VistaNodo]]:
+        entrada = self.buscar(valor)
+        return () if entrada is None else (entrada,)
+
+    def iter_inorden(self) -> Iterator[VistaNodo]:
+        """
+        Recorre las entradas en orden siguiendo el enlace entre hojas, sin bajar por los nodos internos.
+        """
+        hoja = self._primera
+        while hoja is not None:
+            yield from hoja.entradas
+            hoja = hoja.siguiente
+
+    def buscarRango(self, desde: T, hasta: T, incluir_bordes: bool = True) -> Tuple[VistaNodo]:
+        """
+        Busca las entradas entre desde y hasta, en orden: baja una vez hasta la primera hoja del rango y
+        después sigue las hojas enlazadas, por lo que cuesta O(log n + k).
+        """
+        inferior = self._clave_consulta(desde)
+        superior = self._clave_consulta(hasta)
+        hoja = self._hoja(inferior)
+        inicio = (bisect_left if incluir_bordes else bisect_right)(hoja.claves, inferior)
+        resultados = []
+        while hoja is not None:
+            fin = (bisect_right if incluir_bordes else bisect_left)(hoja.claves, superior, inicio)
+            resultados.extend(hoja.entradas[inicio:fin])
+            if fin < len(hoja.claves):
+                break
+            hoja, inicio = hoja.siguiente, 0
+        return tuple(resultados)
+
+    def buscarWhere(self, proposicion: Callable[[Optional[VistaNodo]], bool]) -> Tuple[Optional[VistaNodo]]:
+        return tuple(filter(proposicion, self.iter_inorden()))
+
+    def eliminar(self, valor: T) -> None:
+        """
+        Elimina un valor. Los nodos que bajan de la mitad de su capacidad toman una clave de un hermano o se
+        fusionan con él, y la raíz baja un nivel cuando se queda con un solo hijo.
+        """
+        self._eliminar(self._raiz, self._clave_consulta(valor))
+        if type(self._raiz) is InternoBMas and not self._raiz.claves:
+            self._raiz = self._raiz.hijos[0]
+
+    def _eliminar(self, nodo, clave: object) -> bool:
+        """
+        Returns:
+            bool: Si el nodo ha quedado por debajo del mínimo de claves.
+        """
+        claves = nodo.claves
+        if type(nodo) is HojaBMas:
+            i = bisect_left(claves, clave)
+            if i == len(claves) or claves[i] != clave:
+                return False
+            del claves[i], nodo.entradas[i]
+            self._total -= 1
+        else:
+            i = bisect_right(claves, clave)
+            if self._eliminar(nodo.hijos[i], clave):
+                self._reparar(nodo, i)
+        return len(claves) < self._minimo
+
+    def _reparar(self, padre: InternoBMas, i: int) -> None:
+        """
+        Devuelve al hijo i de padre el mínimo de claves, tomando una de un hermano o fusionándolo con él.
+        """
+        hijo = padre.hijos[i]
+        izquierda = padre.hijos[i - 1] if i > 0 else None
+        derecha = padre.hijos[i + 1] if i + 1 < len(padre.hijos) else None
+        hoja = type(hijo) is HojaBMas
+
+        if izquierda is not None and len(izquierda.claves) > self._minimo:
+            if hoja:
+                hijo.claves.insert(0, izquierda.claves.pop())
+                hijo.entradas.insert(0, izquierda.entradas.pop())
+                padre.claves[i - 1] = hijo.claves[0]
+            else:
+                hijo.claves.insert(0, padre.claves[i - 1])
+                hijo.hijos.insert(0, izquierda.hijos.pop())
+                padre.claves[i - 1] = izquierda.claves.pop()
+            return
+        if derecha is not None and len(derecha.claves) > self._minimo:
+            if hoja:
+                hijo.claves.append(derecha.claves.pop(0))
+                hijo.entradas.append(derecha.entradas.pop(0))
+                padre.claves[i] = derecha.claves[0]
+            else:
+                hijo.claves.append(padre.claves[i])
+                hijo.hijos.append(derecha.hijos.pop(0))
+                padre.claves[i] = derecha.claves.pop(0)
+            return
+
+        # Ningún hermano puede ceder una clave: se fusiona el hijo con uno de ellos
+        if izquierda is not None:
+            i -= 1
+            hijo, derecha = izquierda, hijo
+        if hoja:
+            hijo.claves.extend(derecha.claves)
+            hijo.entradas.extend(derecha.entradas)
+            hijo.siguiente = derecha.siguiente
+            if derecha.siguiente is not None:
+                derecha.siguiente.anterior = hijo
+        else:
+            hijo.claves.append(padre.claves[i])
+            hijo.claves.extend(derecha.claves)
+            hijo.hijos.extend(derecha.hijos)
+        del padre.claves[i], padre.hijos[i + 1]
+
+    def eliminarAll(self, valor: T) -> Tuple[Optional[VistaNodo]]:
+        resultados = self.buscarAll(valor)
+        for entrada in resultados:
+            self.eliminar(entrada.valor)
+        return resultados
+
+    def eliminarWhere(self, proposicion: Callable[[Optional[VistaNodo]], bool]) -> Tuple[Optional[VistaNodo]]:
+        resultados = self.buscarWhere(proposicion)
+        for entrada in resultados:
+            self.eliminar(entrada.valor)
+        return resultados
+
+
+# Clase de prueba para ArbolBMas
+class TestArbolBMas(unittest.TestCase):
+
+    def verificar_invariantes(self, arbol: ArbolBMas) -> None:
+        """
+        Comprueba que las hojas están a la misma profundidad, que cada nodo respeta su capacidad y sus
+        separadores, y que el enlace entre hojas recorre las mismas hojas que el árbol.
+        """
+        hojas = []
+
+        def visitar(nodo, inferior, superior, profundidad: int, es_raiz: bool) -> None:
+            if not es_raiz:
+                self.assertGreaterEqual(len(nodo.claves), arbol._minimo)
+            self.assertLessEqual(len(nodo.claves), arbol._orden)
+            self.assertEqual(nodo.claves, sorted(nodo.claves))
+            for clave in nodo.claves:
+                self.assertTrue(inferior is None or clave >= inferior)
+                self.assertTrue(superior is None or clave < superior)
+            if type(nodo) is HojaBMas:
+                hojas.append((nodo, profundidad))
+                return
+            self.assertEqual(len(nodo.hijos), len(nodo.claves) + 1)
+            limites = [inferior] + nodo.claves + [superior]
+            for j, hijo in enumerate(nodo.hijos):
+                visitar(hijo, limites[j], limites[j + 1], profundidad + 1, False)
+
+        visitar(arbol._raiz, None, None, 0, True)
+        self.assertEqual(len({profundidad for _, profundidad in hojas}), 1)
+        enlazadas = []
+        hoja = arbol._primera
+        while hoja is not None:
+            self.assertIs(hoja.anterior, enlazadas[-1] if enlazadas else None)
+            enlazadas.append(hoja)
+            hoja = hoja.siguiente
+        self.assertEqual(enlazadas, [hoja for hoja, _ in hojas])
+
+    def valores(self, arbol: ArbolBMas) -> list:
+        return [entrada.valor for entrada in arbol.iter_inorden()]
+
+    def test_insertar_y_buscar(self):
+        arbol = ArbolBMas(orden=4)
+        for valor in (5, 1, 9, 1, 7, 3, 8, 2, 6, 4):
+            arbol.insertar(valor)
+        self.verificar_invariantes(arbol)
+        self.assertEqual(self.valores(arbol), list(range(1, 10)))
+        self.assertEqual(arbol.buscar(7).valor, 7)
+        self.assertIs(arbol.buscar(7), arbol.buscar(7))
+        self.assertIsNone(arbol.buscar(10))
+        self.assertEqual(len(arbol), 9)
+
+    def test_insertarAll_construye_de_abajo_arriba(self):
+        generador = random.Random(4)
+        valores = generador.choices(range(3000), k=2000)
+        for orden in (3, 4, 64):
+            arbol = ArbolBMas(orden=orden)
+            arbol.insertarAll(tuple(valores))
+            self.verificar_invariantes(arbol)
+            self.assertEqual(self.valores(arbol), sorted(set(valores)))
+            arbol.insertar(-1)
+            self.verificar_invariantes(arbol)
+
+    def test_eliminar_aleatorio(self):
+        generador = random.Random(6)
+        for orden in (3, 4, 5, 16):
+            valores = set(generador.sample(range(5000), 1500))
+            arbol = ArbolBMas(orden=orden)
+            arbol.insertarAll(tuple(valores))
+            for valor in generador.sample(sorted(valores), 1400):
+                arbol.eliminar(valor)
+                valores.discard(valor)
+            arbol.eliminar(-1)
+            self.verificar_invariantes(arbol)
+            self.assertEqual(self.valores(arbol), sorted(valores))
+            self.assertEqual(len(arbol), len(valores))
+
+    def test_vaciar(self):
+        arbol = ArbolBMas(orden=4)
+        arbol.insertarAll(tuple(range(200)))
+        self.assertEqual(len(arbol.eliminarWhere(lambda entrada: True)), 200)
+        self.verificar_invariantes(arbol)
+        self.assertEqual(self.valores(arbol), [])
+        arbol.insertarAll((2, 1))
+        self.assertEqual(self.valores(arbol), [1, 2])
+
+    def test_buscarRango(self):
+        arbol = ArbolBMas(orden=4)
+        arbol.insertarAll(tuple(range(0, 100, 2)))
+        self.assertEqual([entrada.valor for entrada in arbol.buscarRango(10, 20)], [10, 12, 14, 16, 18, 20])
+        self.assertEqual([entrada.valor for entrada in arbol.buscarRango(10, 20, incluir_bordes=False)], [12, 14, 16, 18])
+        self.assertEqual([entrada.valor for entrada in arbol.buscarRango(95, 200)], [96, 98])
+        self.assertEqual(arbol.buscarRango(41, 41), ())
+
+    def test_clave_y_where(self):
+        arbol = ArbolBMas(orden=3, clave=len)
+        arbol.insertarAll(("aaa", "b", "cc", "dd"))
+        self.assertEqual(self.valores(arbol), ["b", "cc", "aaa"])
+        self.assertEqual(arbol.buscar("xx").valor, "cc")
+        self.assertEqual([entrada.valor for entrada in arbol.buscarWhere(lambda entrada: entrada.clave > 1)], ["cc", "aaa"])
+        self.assertEqual(len(arbol.eliminarAll("zzz")), 1)
+        self.assertEqual(self.valores(arbol), ["b", "cc"])
+
+    def test_orden_invalido(self):
+        with self.assertRaises(ValueError):
+            ArbolBMas(orden=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
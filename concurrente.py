@@ -0,0 +1,230 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypeVar, Tuple
+import threading
+import unittest
+
+from eliminacion import Arbol, ArbolBinario, NodoInterface
+from rojinegro import ArbolRojiNegro
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+# Cerrojo de lectores y escritor: varias lecturas a la vez o una sola escritura, con preferencia para los escritores
+class CerrojoLectoresEscritor:
+
+    def __init__(self) -> None:
+        self._condicion = threading.Condition()
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def lectura(self) -> Iterator[None]:
+        """
+        Entra como lector. Espera mientras hay un escritor dentro o esperando, para que un flujo continuo
+        de lectores no deje sin turno a los escritores. No es reentrante.
+        """
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._lectores -= 1
+                if self._lectores == 0:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self) -> Iterator[None]:
+        """
+        Entra como escritor, en exclusiva. No es reentrante.
+        """
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escribiendo or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
+
+
+# Envoltorio que permite compartir un árbol entre hilos: las lecturas van en paralelo y las escrituras de una en una
+class ArbolConcurrente(Arbol):
+
+    def __init__(self, arbol: Optional[ArbolBinario] = None) -> None:
+        """
+        Constructor de la clase ArbolConcurrente.
+
+        Los nodos devueltos son los del árbol envuelto: una escritura posterior puede cambiar sus hijos.
+        Para una vista que no cambie, se puede leer una instantánea con leer(lambda arbol: arbol.congelar()).
+        Las proposiciones que se pasan a buscarWhere y eliminarWhere no deben volver a usar este envoltorio.
+
+        Args:
+            arbol (Optional[ArbolBinario]): El árbol compartido; por defecto, un ArbolBinario vacío.
+        """
+        self._arbol = ArbolBinario() if arbol is None else arbol
+        self._cerrojo = CerrojoLectoresEscritor()
+
+    def leer(self, operacion: Callable[[ArbolBinario], R]) -> R:
+        """
+        Ejecuta una operación de solo lectura sobre el árbol envuelto (por ejemplo seleccionar o congelar)
+        junto con las demás lecturas.
+        """
+        with self._cerrojo.lectura():
+            return operacion(self._arbol)
+
+    def escribir(self, operacion: Callable[[ArbolBinario], R]) -> R:
+        """
+        Ejecuta una operación que modifica el árbol envuelto, en exclusiva.
+        """
+        with self._cerrojo.escritura():
+            return operacion(self._arbol)
+
+    # Las operaciones reenvían al árbol envuelto sus argumentos propios (masivo, procesos, ejecutor, reconstruir...)
+    def insertar(self, valor: T, *args, **kwargs) -> None:
+        with self._cerrojo.escritura():
+            self._arbol.insertar(valor, *args, **kwargs)
+
+    def insertarAll(self, valores: Tuple[T], *args, **kwargs) -> None:
+        with self._cerrojo.escritura():
+            self._arbol.insertarAll(valores, *args, **kwargs)
+
+    def buscar(self, valor: T) -> Optional[NodoInterface]:
+        with self._cerrojo.lectura():
+            return self._arbol.buscar(valor)
+
+    def buscarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
+        with self._cerrojo.lectura():
+            return self._arbol.buscarAll(valor)
+
+    def buscarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool], *args,
+                    **kwargs) -> Tuple[Optional[NodoInterface]]:
+        with self._cerrojo.lectura():
+            return self._arbol.buscarWhere(proposicion, *args, **kwargs)
+
+    def eliminar(self, valor: T) -> None:
+        with self._cerrojo.escritura():
+            self._arbol.eliminar(valor)
+
+    def eliminarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
+        with self._cerrojo.escritura():
+            return self._arbol.eliminarAll(valor)
+
+    def eliminarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool], *args,
+                      **kwargs) -> Tuple[Optional[NodoInterface]]:
+        with self._cerrojo.escritura():
+            return self._arbol.eliminarWhere(proposicion, *args, **kwargs)
+
+
+# Clase de prueba para CerrojoLectoresEscritor
+class TestCerrojoLectoresEscritor(unittest.TestCase):
+    def test_lectores_simultaneos(self):
+        cerrojo = CerrojoLectoresEscritor()
+        barrera = threading.Barrier(3, timeout=5)
+
+        def leer() -> None:
+            with cerrojo.lectura():
+                barrera.wait()
+
+        hilos = [threading.Thread(target=leer) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertFalse(barrera.broken)
+
+    def test_escritor_exclusivo(self):
+        cerrojo = CerrojoLectoresEscritor()
+        dentro = []
+        maximo = []
+
+        def escribir() -> None:
+            for _ in range(200):
+                with cerrojo.escritura():
+                    dentro.append(1)
+                    maximo.append(len(dentro))
+                    dentro.pop()
+
+        def leer() -> None:
+            for _ in range(200):
+                with cerrojo.lectura():
+                    maximo.append(len(dentro))
+
+        hilos = [threading.Thread(target=funcion) for funcion in (escribir, escribir, leer, leer)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(max(maximo), 1)
+
+
+# Clase de prueba para ArbolConcurrente
+class TestArbolConcurrente(unittest.TestCase):
+    def test_escrituras_concurrentes(self):
+        arbol = ArbolConcurrente(ArbolRojiNegro())
+        errores = []
+
+        def trabajar(inicio: int) -> None:
+            try:
+                for valor in range(inicio, inicio + 500):
+                    arbol.insertar(valor)
+                    if valor % 3 == 0:
+                        arbol.eliminar(valor)
+                    arbol.buscar(valor - 1)
+            except Exception as error:
+                errores.append(error)
+
+        hilos = [threading.Thread(target=trabajar, args=(inicio,)) for inicio in range(0, 2000, 500)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        valores = arbol.leer(lambda interno: [nodo.valor for nodo in interno.iter_inorden()])
+        self.assertEqual(valores, [valor for valor in range(2000) if valor % 3])
+        nodos = arbol.leer(lambda interno: list(interno.iter_preorden()))
+        for nodo in nodos:
+            for hijo in (nodo.izquierda, nodo.derecha):
+                if hijo is not None:
+                    self.assertIs(hijo.padre, nodo)
+
+    def test_reenvia_argumentos(self):
+        arbol = ArbolConcurrente(ArbolBinario())
+        arbol.insertarAll(tuple(range(1023)), masivo=True)
+        self.assertEqual(arbol.leer(lambda interno: interno.raiz.valor), 511)
+
+        def altura(nodo) -> int:
+            return 0 if nodo is None else 1 + max(altura(nodo.izquierda), altura(nodo.derecha))
+
+        self.assertEqual(arbol.leer(lambda interno: altura(interno.raiz)), 10)
+        with ThreadPoolExecutor(max_workers=2) as ejecutor:
+            multiplos = arbol.buscarWhere(lambda nodo: nodo.valor % 100 == 0, ejecutor=ejecutor, tamano_bloque=100)
+        self.assertEqual([nodo.valor for nodo in multiplos], list(range(0, 1023, 100)))
+        self.assertEqual(len(arbol.eliminarWhere(lambda nodo: nodo.valor < 500, reconstruir=True)), 500)
+        # La reconstrucción deja como raíz la mediana de los 523 valores restantes
+        self.assertEqual(arbol.leer(lambda interno: interno.raiz.valor), 761)
+
+    def test_leer_y_escribir(self):
+        arbol = ArbolConcurrente(ArbolBinario(estadisticas=True))
+        arbol.insertarAll((5, 1, 9))
+        self.assertEqual(arbol.leer(lambda interno: interno.seleccionar(1).valor), 5)
+        arbol.escribir(lambda interno: interno.eliminarRango(1, 5))
+        self.assertEqual([nodo.valor for nodo in arbol.buscarWhere(lambda nodo: True)], [9])
+        self.assertEqual(arbol.buscarAll(9)[0].valor, 9)
+        self.assertEqual(len(arbol.eliminarAll(9)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,417 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Callable, Iterator, Optional, TypeVar, Tuple
+import math
+import os
+import tempfile
+import unittest
+
+from binario import escribir, leer
+
+T = TypeVar('T')
+
+
+def _arreglo_contiguo(claves: list):
+    """
+    Copia las claves en un array de enteros o de flotantes si todas lo son; si no, las deja en la lista.
+    """
+    for tipo, clase in (('q', int), ('d', float)):
+        if all(type(clave) is clase for clave in claves):
+            try:
+                return array(tipo, claves)
+            except OverflowError:
+                return claves
+    return claves
+
+
+# Instantánea de solo lectura de un árbol: claves ordenadas en memoria contigua y búsquedas con bisect
+class ArbolCongelado:
+
+    def __init__(self, claves: list, valores: list, cuentas: list,
+                 clave_consulta: Optional[Callable[[T], object]] = None) -> None:
+        """
+        Constructor de la clase ArbolCongelado. Normalmente se obtiene con ArbolBinario.congelar.
+        Como no hay nodos, las consultas devuelven los valores guardados en lugar de nodos.
+
+        Args:
+            claves (list): Las claves de los nodos, en orden.
+            valores (list): Los valores de los nodos, en el mismo orden.
+            cuentas (list): Las apariciones de cada valor (mayores que 1 solo en multiconjuntos).
+            clave_consulta (Optional[Callable[[T], object]]): Convierte un valor en la clave con la que se
+                compara. Con None el valor se compara directamente.
+        """
+        self._archivo = None
+        self._clave_consulta = clave_consulta
+        self._claves = _arreglo_contiguo(claves)
+        self._valores = self._claves if clave_consulta is None and claves == valores else valores
+        # Apariciones acumuladas hasta cada posición, incluida; solo hacen falta si hay valores repetidos
+        self._acumuladas = array('q', accumulate(cuentas)) if any(cuenta != 1 for cuenta in cuentas) else None
+
+    @classmethod
+    def abrir(cls, ruta: str) -> 'ArbolCongelado':
+        """
+        Abre como instantánea un árbol guardado con ArbolBinario.guardar, sin construir nodos ni leer los
+        registros: las búsquedas leen directamente del archivo proyectado en memoria. Solo sirve para árboles
+        ordenados por sus propios valores (sin clave ni proposición). La proyección se libera con cerrar o al
+        salir de un bloque with.
+        """
+        congelado = cls.__new__(cls)
+        congelado._archivo = leer(ruta)
+        congelado._clave_consulta = None
+        congelado._claves = congelado._valores = congelado._archivo.valores
+        cuentas = congelado._archivo.cuentas
+        congelado._acumuladas = None if cuentas is None else array('q', accumulate(cuentas))
+        return congelado
+
+    def cerrar(self) -> None:
+        """
+        Libera el archivo proyectado de una instantánea obtenida con abrir; en las demás no hace nada.
+        """
+        if self._archivo is not None:
+            self._archivo.cerrar()
+            self._archivo = None
+
+    def __enter__(self) -> 'ArbolCongelado':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: El número de valores, contando repeticiones.
+        """
+        return len(self._claves) if self._acumuladas is None else self._acumuladas[-1]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._valores)
+
+    def __contains__(self, valor: T) -> bool:
+        return self._posicion(valor) is not None
+
+    def _clave(self, valor: T) -> object:
+        return valor if self._clave_consulta is None else self._clave_consulta(valor)
+
+    def _posicion(self, valor: T) -> Optional[int]:
+        claves = self._claves
+        clave = self._clave(valor)
+        i = bisect_left(claves, clave)
+        if i < len(claves) and clave == claves[i]:
+            return i
+        return None
+
+    def buscar(self, valor: T) -> Optional[T]:
+        """
+        Busca un valor en O(log n) con una sola llamada a bisect.
+
+        Returns:
+            Optional[T]: El valor guardado, o None si no está.
+        """
+        claves = self._claves
+        clave = valor if self._clave_consulta is None else self._clave_consulta(valor)
+        i = bisect_left(claves, clave)
+        if i < len(claves) and clave == claves[i]:
+            return self._valores[i]
+        return None
+
+    def buscarMuchos(self, valores: Tuple[T]) -> Tuple[Optional[T]]:
+        """
+        Busca un lote de valores en una sola pasada: las consultas se ordenan una vez y se recorren a la par
+        que el arreglo, de modo que cada bisect empieza donde acabó el anterior y la pasada se corta cuando
+        las consultas pasan de la última clave.
+
+        Returns:
+            Tuple[Optional[T]]: El valor guardado para cada consulta, o None, en el orden de la entrada.
+        """
+        claves, guardados, n = self._claves, self._valores, len(self._claves)
+        consultas = list(valores if self._clave_consulta is None else map(self._clave_consulta, valores))
+        resultados = [None] * len(consultas)
+        i = 0
+        for j in sorted(range(len(consultas)), key=consultas.__getitem__):
+            clave = consultas[j]
+            i = bisect_left(claves, clave, i)
+            if i == n:
+                break
+            if clave == claves[i]:
+                resultados[j] = guardados[i]
+        return tuple(resultados)
+
+    def contar(self, valor: T) -> int:
+        i = self._posicion(valor)
+        if i is None:
+            return 0
+        if self._acumuladas is None:
+            return 1
+        return self._acumuladas[i] - (self._acumuladas[i - 1] if i else 0)
+
+    def buscarRango(self, desde: T, hasta: T, incluir_bordes: bool = True) -> Tuple[T]:
+        """
+        Devuelve los valores entre desde y hasta, en orden, con dos búsquedas binarias y un corte.
+        """
+        inferior, superior = self._clave(desde), self._clave(hasta)
+        if incluir_bordes:
+            inicio, fin = bisect_left(self._claves, inferior), bisect_right(self._claves, superior)
+        else:
+            inicio, fin = bisect_right(self._claves, inferior), bisect_left(self._claves, superior)
+        return tuple(self._valores[inicio:fin])
+
+    def rango(self, valor: T) -> int:
+        """
+        Cuenta cuántos valores (con repeticiones) son menores que el valor dado.
+        """
+        i = bisect_left(self._claves, self._clave(valor))
+        if self._acumuladas is None or i == 0:
+            return i
+        return self._acumuladas[i - 1]
+
+    def seleccionar(self, k: int) -> T:
+        """
+        Devuelve el k-ésimo menor valor (k empieza en 0 y cuenta las repeticiones).
+
+        Raises:
+            IndexError: Si k está fuera de la instantánea.
+        """
+        if k < 0 or k >= len(self):
+            raise IndexError(k)
+        if self._acumuladas is None:
+            return self._valores[k]
+        return self._valores[bisect_right(self._acumuladas, k)]
+
+    def percentil(self, p: float) -> T:
+        """
+        Devuelve el valor del percentil p (entre 0 y 100) por el método del rango más cercano.
+
+        Raises:
+            ValueError: Si p está fuera de [0, 100].
+            IndexError: Si la instantánea está vacía.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(p)
+        return self.seleccionar(max(math.ceil(p / 100 * len(self)) - 1, 0))
+
+    def eytzinger(self) -> 'IndiceEytzinger':
+        """
+        Crea un índice de búsqueda con las claves de la instantánea en disposición de Eytzinger.
+        """
+        valores = None if self._valores is self._claves else self._valores
+        return IndiceEytzinger(self._claves, valores, self._clave_consulta)
+
+
+# Índice estático con las claves en disposición de Eytzinger: el árbol binario completo guardado por niveles
+class IndiceEytzinger:
+    """
+    La raíz está en la posición 1 y los hijos de la posición k en 2k y 2k + 1, de modo que el descenso solo
+    usa aritmética de índices y los primeros niveles, que se visitan en todas las búsquedas, quedan juntos
+    al principio del arreglo.
+    """
+
+    def __init__(self, claves, valores: Optional[list] = None,
+                 clave_consulta: Optional[Callable[[T], object]] = None) -> None:
+        """
+        Constructor de la clase IndiceEytzinger.
+
+        Args:
+            claves: Las claves ordenadas y sin repetir (lista o array).
+            valores (Optional[list]): El valor de cada clave; con None, las propias claves.
+            clave_consulta (Optional[Callable[[T], object]]): Convierte un valor en la clave con la que se compara.
+        """
+        posiciones = _orden_eytzinger(len(claves))
+        ordenadas = [claves[i] for i in posiciones]
+        # La posición 0 no se usa; se rellena con la primera clave para conservar el tipo del array
+        self._claves = _arreglo_contiguo(ordenadas[:1] + ordenadas)
+        self._valores = None if valores is None else [None] + [valores[i] for i in posiciones]
+        self._clave_consulta = clave_consulta
+
+    def __len__(self) -> int:
+        return max(len(self._claves) - 1, 0)
+
+    def __iter__(self) -> Iterator[T]:
+        guardados = self._claves if self._valores is None else self._valores
+        return (guardados[k] for k in _recorrido_inorden(len(self)))
+
+    def __contains__(self, valor: T) -> bool:
+        return self._posicion(valor) != 0
+
+    def _posicion(self, valor: T) -> int:
+        """
+        Returns:
+            int: La posición de la clave del valor en el arreglo, o 0 si no está.
+        """
+        claves = self._claves
+        clave = valor if self._clave_consulta is None else self._clave_consulta(valor)
+        n = len(claves) - 1
+        k = 1
+        while k <= n:
+            k = 2 * k + (claves[k] < clave)
+        # Se deshacen los últimos giros a la derecha: el ancestro resultante es la primera clave >= valor
+        k >>= (~k & (k + 1)).bit_length()
+        return k if k and clave == claves[k] else 0
+
+    def buscar(self, valor: T) -> Optional[T]:
+        """
+        Returns:
+            Optional[T]: El valor guardado, o None si no está.
+        """
+        k = self._posicion(valor)
+        if k == 0:
+            return None
+        return self._claves[k] if self._valores is None else self._valores[k]
+
+    def buscarMuchos(self, valores: Tuple[T]) -> Tuple[Optional[T]]:
+        """
+        Busca un lote de valores con un único descenso compartido, como ArbolBinario.buscarMuchos: las
+        consultas se ordenan una vez y cada posición reparte entre sus dos hijos 2k y 2k + 1 las que le
+        quedan, sin visitar los subárboles a los que no llega ninguna.
+
+        Returns:
+            Tuple[Optional[T]]: El valor guardado para cada consulta, o None, en el orden de la entrada.
+        """
+        claves, n = self._claves, len(self)
+        guardados = claves if self._valores is None else self._valores
+        consultas = [valor if self._clave_consulta is None else self._clave_consulta(valor) for valor in valores]
+        orden = sorted(range(len(consultas)), key=consultas.__getitem__)
+        ordenadas = [consultas[i] for i in orden]
+        resultados = [None] * len(consultas)
+
+        pendientes = [(1, 0, len(ordenadas))] if n and ordenadas else []
+        while pendientes:
+            k, inicio, fin = pendientes.pop()
+            clave_actual = claves[k]
+            menores = bisect_left(ordenadas, clave_actual, inicio, fin)
+            mayores = bisect_right(ordenadas, clave_actual, menores, fin)
+            for i in range(menores, mayores):
+                resultados[orden[i]] = guardados[k]
+            if inicio < menores and 2 * k <= n:
+                pendientes.append((2 * k, inicio, menores))
+            if mayores < fin and 2 * k + 1 <= n:
+                pendientes.append((2 * k + 1, mayores, fin))
+        return tuple(resultados)
+
+
+def _recorrido_inorden(n: int) -> Iterator[int]:
+    """
+    Recorre en orden las posiciones 1..n del árbol completo implícito.
+    """
+    pendientes = []
+    k = 1
+    while pendientes or k <= n:
+        while k <= n:
+            pendientes.append(k)
+            k = 2 * k
+        k = pendientes.pop()
+        yield k
+        k = 2 * k + 1
+
+
+def _orden_eytzinger(n: int) -> list:
+    """
+    Returns:
+        list: Para cada posición 1..n de la disposición de Eytzinger, el índice de la clave ordenada que le toca.
+    """
+    posiciones = [0] * n
+    for i, k in enumerate(_recorrido_inorden(n)):
+        posiciones[k - 1] = i
+    return posiciones
+
+
+# Clase de prueba para IndiceEytzinger
+class TestIndiceEytzinger(unittest.TestCase):
+    def test_disposicion(self):
+        indice = ArbolCongelado(list(range(1, 8)), list(range(1, 8)), [1] * 7).eytzinger()
+        self.assertEqual(list(indice._claves[1:]), [4, 2, 6, 1, 3, 5, 7])
+        self.assertEqual(indice._claves.typecode, 'q')
+        self.assertEqual(list(indice), list(range(1, 8)))
+
+    def test_buscar_todos_los_tamanos(self):
+        for n in range(0, 40):
+            claves = list(range(0, 2 * n, 2))
+            indice = IndiceEytzinger(claves)
+            self.assertEqual(len(indice), n)
+            for valor in range(-1, 2 * n + 1):
+                self.assertEqual(indice.buscar(valor), valor if valor in claves else None)
+            consultas = tuple(range(2 * n + 1, -2, -1)) * 2
+            self.assertEqual(indice.buscarMuchos(consultas), tuple(map(indice.buscar, consultas)))
+
+    def test_valores_y_clave(self):
+        indice = IndiceEytzinger([1, 2, 3], ["a", "bb", "ccc"], clave_consulta=len)
+        self.assertEqual(indice.buscarMuchos(("xy", "", "zzz")), ("bb", None, "ccc"))
+        self.assertIn("q", indice)
+
+
+# Clase de prueba para ArbolCongelado
+class TestArbolCongelado(unittest.TestCase):
+    def test_abrir_archivo(self):
+        descriptor, ruta = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            escribir(ruta, ["a", "c", "e"], [1, 2, 1])
+            with ArbolCongelado.abrir(ruta) as congelado:
+                self.assertEqual(congelado.buscar("c"), "c")
+                self.assertIsNone(congelado.buscar("d"))
+                self.assertEqual(congelado.contar("c"), 2)
+                self.assertEqual(congelado.buscarRango("b", "z"), ("c", "e"))
+            escribir(ruta, list(range(0, 100, 5)))
+            congelado = ArbolCongelado.abrir(ruta)
+            self.assertEqual(congelado.rango(12), 3)
+            self.assertEqual(congelado.eytzinger().buscar(45), 45)
+            congelado.cerrar()
+            with self.assertRaises(ValueError):
+                congelado.buscar(45)
+            congelado.cerrar()
+        finally:
+            os.remove(ruta)
+
+    def setUp(self):
+        self.congelado = ArbolCongelado([1, 3, 5, 7], [1, 3, 5, 7], [1, 1, 1, 1])
+
+    def test_enteros_contiguos(self):
+        self.assertIsInstance(self.congelado._claves, array)
+        self.assertEqual(self.congelado._claves.typecode, 'q')
+        self.assertIs(self.congelado._valores, self.congelado._claves)
+
+    def test_buscar(self):
+        self.assertEqual(self.congelado.buscar(5), 5)
+        self.assertIsNone(self.congelado.buscar(4))
+        self.assertIsNone(self.congelado.buscar(8))
+        self.assertIn(7, self.congelado)
+        self.assertEqual(self.congelado.buscarMuchos((7, 0, 1)), (7, None, 1))
+        self.assertEqual(self.congelado.buscarMuchos((9, 3, 4, 3, 8, 1)), (None, 3, None, 3, None, 1))
+
+    def test_rango_y_seleccionar(self):
+        self.assertEqual(self.congelado.buscarRango(3, 7), (3, 5, 7))
+        self.assertEqual(self.congelado.buscarRango(3, 7, incluir_bordes=False), (5,))
+        self.assertEqual(self.congelado.rango(6), 3)
+        self.assertEqual(self.congelado.seleccionar(1), 3)
+        self.assertEqual(self.congelado.percentil(50), 3)
+        with self.assertRaises(IndexError):
+            self.congelado.seleccionar(4)
+
+    def test_repeticiones(self):
+        congelado = ArbolCongelado([2, 4, 6], [2, 4, 6], [1, 3, 2])
+        self.assertEqual(len(congelado), 6)
+        self.assertEqual(congelado.contar(4), 3)
+        self.assertEqual([congelado.seleccionar(k) for k in range(6)], [2, 4, 4, 4, 6, 6])
+        self.assertEqual(congelado.rango(6), 4)
+
+    def test_valores_genericos(self):
+        congelado = ArbolCongelado(["a", "b"], ["a", "b"], [1, 1])
+        self.assertIsInstance(congelado._claves, list)
+        self.assertEqual(congelado.buscar("b"), "b")
+        self.assertEqual(list(congelado), ["a", "b"])
+
+    def test_enteros_grandes(self):
+        congelado = ArbolCongelado([1, 2 ** 70], [1, 2 ** 70], [1, 1])
+        self.assertEqual(congelado.buscar(2 ** 70), 2 ** 70)
+
+    def test_vacio(self):
+        congelado = ArbolCongelado([], [], [])
+        self.assertEqual(len(congelado), 0)
+        self.assertIsNone(congelado.buscar(1))
+        with self.assertRaises(IndexError):
+            congelado.percentil(50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,478 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, TypeVar, Tuple
+import os
+import random
+import struct
+import sys
+import tempfile
+import unittest
+
+from eliminacion import Arbol
+from paralelo import VistaNodo
+
+T = TypeVar('T')
+
+# Página 0: firma, tamaño de página, raíz, número de páginas, primera página libre y número de claves
+METADATOS = struct.Struct('<4sIIIIQ')
+FIRMA = b'ARBD'
+# Cabecera de cada página: tipo, número de claves y enlace a la siguiente página libre
+CABECERA_PAGINA = struct.Struct('<BxHI')
+INTERNA, HOJA, LIBRE = 0, 1, 2
+# Estimación de la memoria de una página decodificada: el objeto Pagina y, por cada número de sus listas,
+# el objeto int de Python (las listas se miden con sys.getsizeof)
+BYTES_PAGINA = 64
+BYTES_POR_ENTERO = 32
+
+
+def _a_bytes(codigo: str, numeros: list) -> bytes:
+    datos = array(codigo, numeros)
+    if sys.byteorder != 'little':
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def _de_bytes(codigo: str, datos: bytes) -> list:
+    numeros = array(codigo, datos)
+    if sys.byteorder != 'little':
+        numeros.byteswap()
+    return numeros.tolist()
+
+
+# Página decodificada: las claves ordenadas y, en las páginas internas, los identificadores de sus hijos
+class Pagina:
+    __slots__ = ('hoja', 'claves', 'hijos', 'sucia')
+
+    def __init__(self, hoja: bool, claves: list, hijos: list):
+        self.hoja = hoja
+        self.claves = claves
+        self.hijos = hijos
+        self.sucia = False
+
+
+# Árbol B+ guardado en un archivo de páginas de tamaño fijo, con caché LRU de páginas y escritura diferida
+class ArbolBDisco(Arbol):
+
+    def __init__(self, ruta: str, tamano_pagina: int = 4096, memoria_cache: int = 1 << 20) -> None:
+        """
+        Constructor de la clase ArbolBDisco. Abre el archivo si ya existe o lo crea vacío.
+
+        Las claves están en las hojas y las páginas internas solo guardan separadores. Las páginas modificadas
+        se escriben al salir de la caché o al llamar a sincronizar o cerrar. Solo guarda enteros de 64 bits;
+        buscar y buscarWhere devuelven VistaNodo con el valor, porque los nodos no existen fuera del disco.
+
+        Args:
+            ruta (str): El archivo del árbol.
+            tamano_pagina (int): Tamaño de cada página en bytes; si el archivo ya existe, se usa el suyo.
+            memoria_cache (int): Memoria máxima en bytes para las páginas en caché, estimada sobre las páginas
+                decodificadas (listas de enteros de Python, varias veces mayores que la página en disco). Se
+                respeta al terminar cada operación: durante ella no se expulsa ninguna página, de modo que
+                una escritura fallida no deja a medias una división ni una fusión.
+        """
+        existe = os.path.exists(ruta) and os.path.getsize(ruta) > 0
+        self._archivo = open(ruta, 'r+b' if existe else 'w+b')
+        self._descriptor = self._archivo.fileno()
+        if existe:
+            firma, tamano_pagina, self._raiz, self._paginas, self._libre, self._total = \
+                METADATOS.unpack(os.pread(self._descriptor, METADATOS.size, 0))
+            if firma != FIRMA:
+                raise ValueError(f"{ruta} no es un archivo de ArbolBDisco")
+        self._tamano_pagina = tamano_pagina
+        # Una página interna con n claves guarda n + 1 hijos de 4 bytes
+        self._max_claves = (tamano_pagina - CABECERA_PAGINA.size - 4) // 12
+        if self._max_claves < 3:
+            raise ValueError(f"tamano_pagina demasiado pequeño: {tamano_pagina}")
+        self._memoria_cache = memoria_cache
+        self._cache: 'OrderedDict[int, Pagina]' = OrderedDict()
+        # Memoria estimada de cada página en caché y su suma
+        self._tamanos: dict = {}
+        self._memoria = 0
+        self.aciertos = 0
+        self.fallos = 0
+        if not existe:
+            self._paginas, self._libre, self._total = 1, 0, 0
+            self._raiz = self._nueva_pagina(Pagina(True, [], []))
+            self.sincronizar()
+
+    def __enter__(self) -> 'ArbolBDisco':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def sincronizar(self) -> None:
+        """
+        Escribe en el archivo las páginas modificadas y los metadatos.
+        """
+        for identificador, pagina in self._cache.items():
+            if pagina.sucia:
+                self._escribir(identificador, pagina)
+        os.pwrite(self._descriptor, METADATOS.pack(FIRMA, self._tamano_pagina, self._raiz, self._paginas,
+                                                   self._libre, self._total), 0)
+
+    def cerrar(self) -> None:
+        if not self._archivo.closed:
+            self.sincronizar()
+            self._archivo.close()
+
+    def _leer(self, identificador: int) -> Pagina:
+        cache = self._cache
+        pagina = cache.get(identificador)
+        if pagina is not None:
+            cache.move_to_end(identificador)
+            self.aciertos += 1
+            return pagina
+
+        self.fallos += 1
+        datos = os.pread(self._descriptor, self._tamano_pagina, identificador * self._tamano_pagina)
+        tipo, n, _ = CABECERA_PAGINA.unpack_from(datos)
+        inicio = CABECERA_PAGINA.size
+        claves = _de_bytes('q', datos[inicio:inicio + 8 * n])
+        hijos = []
+        if tipo == INTERNA:
+            inicio += 8 * self._max_claves
+            hijos = _de_bytes('I', datos[inicio:inicio + 4 * (n + 1)])
+        pagina = Pagina(tipo == HOJA, claves, hijos)
+        self._meter_en_cache(identificador, pagina)
+        return pagina
+
+    def _guardar(self, identificador: int, pagina: Pagina) -> None:
+        """
+        Marca la página como modificada y vuelve a estimar su memoria, que cambia con sus claves.
+        """
+        pagina.sucia = True
+        self._meter_en_cache(identificador, pagina)
+
+    def _meter_en_cache(self, identificador: int, pagina: Pagina) -> None:
+        """
+        Mete la página en la caché, o la pasa al final si ya estaba, sin expulsar ninguna: las expulsiones
+        esperan a _expulsar, al final de cada operación.
+        """
+        self._cache[identificador] = pagina
+        self._cache.move_to_end(identificador)
+        tamano = (BYTES_PAGINA + sys.getsizeof(pagina.claves) + sys.getsizeof(pagina.hijos)
+                  + BYTES_POR_ENTERO * (len(pagina.claves) + len(pagina.hijos)))
+        self._memoria += tamano - self._tamanos.get(identificador, 0)
+        self._tamanos[identificador] = tamano
+
+    def _sacar_de_cache(self, identificador: int) -> None:
+        if self._cache.pop(identificador, None) is not None:
+            self._memoria -= self._tamanos.pop(identificador)
+
+    def _expulsar(self) -> None:
+        """
+        Expulsa las páginas menos usadas hasta respetar memoria_cache, dejando al menos una.
+        """
+        while self._memoria > self._memoria_cache and len(self._cache) > 1:
+            expulsada = next(iter(self._cache))
+            victima = self._cache[expulsada]
+            # Se escribe antes de sacarla: si la escritura falla, la página sigue en la caché
+            if victima.sucia:
+                self._escribir(expulsada, victima)
+            self._sacar_de_cache(expulsada)
+
+    def _escribir(self, identificador: int, pagina: Pagina) -> None:
+        datos = bytearray(self._tamano_pagina)
+        CABECERA_PAGINA.pack_into(datos, 0, HOJA if pagina.hoja else INTERNA, len(pagina.claves), 0)
+        inicio = CABECERA_PAGINA.size
+        claves = _a_bytes('q', pagina.claves)
+        datos[inicio:inicio + len(claves)] = claves
+        if not pagina.hoja:
+            inicio += 8 * self._max_claves
+            hijos = _a_bytes('I', pagina.hijos)
+            datos[inicio:inicio + len(hijos)] = hijos
+        os.pwrite(self._descriptor, bytes(datos), identificador * self._tamano_pagina)
+        pagina.sucia = False
+
+    def _nueva_pagina(self, pagina: Pagina) -> int:
+        if self._libre:
+            identificador = self._libre
+            datos = os.pread(self._descriptor, CABECERA_PAGINA.size, identificador * self._tamano_pagina)
+            self._libre = CABECERA_PAGINA.unpack(datos)[2]
+        else:
+            identificador = self._paginas
+            self._paginas += 1
+        self._guardar(identificador, pagina)
+        return identificador
+
+    def _liberar(self, identificador: int) -> None:
+        self._sacar_de_cache(identificador)
+        datos = bytearray(self._tamano_pagina)
+        CABECERA_PAGINA.pack_into(datos, 0, LIBRE, 0, self._libre)
+        os.pwrite(self._descriptor, bytes(datos), identificador * self._tamano_pagina)
+        self._libre = identificador
+
+    def _comprobar(self, valor: T) -> None:
+        """
+        Raises:
+            TypeError: Si el valor no es un entero.
+            OverflowError: Si el entero no cabe en 64 bits con signo.
+        """
+        if type(valor) is not int:
+            raise TypeError(f"ArbolBDisco solo guarda enteros: {valor!r}")
+        if not -2 ** 63 <= valor < 2 ** 63:
+            raise OverflowError(f"ArbolBDisco solo guarda enteros de 64 bits: {valor}")
+
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        """
+        Inserta un entero. La proposición se ignora: el archivo se ordena siempre por el orden de los enteros.
+        """
+        self._comprobar(valor)
+        division = self._insertar(self._raiz, valor)
+        if division is not None:
+            separador, derecha = division
+            self._raiz = self._nueva_pagina(Pagina(False, [separador], [self._raiz, derecha]))
+        self._expulsar()
+
+    def _insertar(self, identificador: int, clave: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns:
+            Optional[Tuple[int, int]]: Si la página se ha dividido, el separador y la nueva página derecha.
+        """
+        pagina = self._leer(identificador)
+        claves = pagina.claves
+        if pagina.hoja:
+            i = bisect_left(claves, clave)
+            if i < len(claves) and claves[i] == clave:
+                return None
+            claves.insert(i, clave)
+            self._total += 1
+        else:
+            i = bisect_right(claves, clave)
+            division = self._insertar(pagina.hijos[i], clave)
+            if division is None:
+                return None
+            claves.insert(i, division[0])
+            pagina.hijos.insert(i + 1, division[1])
+
+        if len(claves) <= self._max_claves:
+            self._guardar(identificador, pagina)
+            return None
+
+        medio = len(claves) // 2
+        if pagina.hoja:
+            separador = claves[medio]
+            derecha = Pagina(True, claves[medio:], [])
+        else:
+            separador = claves[medio]
+            derecha = Pagina(False, claves[medio + 1:], pagina.hijos[medio + 1:])
+            del pagina.hijos[medio + 1:]
+        del claves[medio:]
+        self._guardar(identificador, pagina)
+        return separador, self._nueva_pagina(derecha)
+
+    def insertarAll(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        for valor in valores:
+            self.insertar(valor, proposicion)
+
+    def buscar(self, valor: T) -> Optional[VistaNodo]:
+        if type(valor) is not int:
+            return None
+        pagina = self._leer(self._raiz)
+        while not pagina.hoja:
+            pagina = self._leer(pagina.hijos[bisect_right(pagina.claves, valor)])
+        self._expulsar()
+        claves = pagina.claves
+        i = bisect_left(claves, valor)
+        if i < len(claves) and claves[i] == valor:
+            return VistaNodo(valor, valor, 1)
+        return None
+
+    def buscarAll(self, valor: T) -> Tuple[Optional[VistaNodo]]:
+        nodo = self.buscar(valor)
+        return () if nodo is None else (nodo,)
+
+    def iter_inorden(self) -> Iterator[VistaNodo]:
+        """
+        Recorre las claves en orden, hoja a hoja. El árbol no debe modificarse mientras se consume el iterador.
+        """
+        pendientes = [self._raiz]
+        while pendientes:
+            pagina = self._leer(pendientes.pop())
+            self._expulsar()
+            if pagina.hoja:
+                for clave in pagina.claves:
+                    yield VistaNodo(clave, clave, 1)
+            else:
+                pendientes.extend(reversed(pagina.hijos))
+
+    def buscarWhere(self, proposicion: Callable[[Optional[VistaNodo]], bool]) -> Tuple[Optional[VistaNodo]]:
+        return tuple(filter(proposicion, self.iter_inorden()))
+
+    def eliminar(self, valor: T) -> None:
+        """
+        Elimina un entero. Las hojas que se quedan vacías se liberan y la raíz baja un nivel cuando le queda
+        un solo hijo; no se redistribuyen claves entre hermanas, de modo que cada eliminación escribe pocas páginas.
+        """
+        if type(valor) is not int:
+            return
+        self._eliminar(self._raiz, valor)
+        raiz = self._leer(self._raiz)
+        while not raiz.hoja and len(raiz.hijos) == 1:
+            anterior, self._raiz = self._raiz, raiz.hijos[0]
+            self._liberar(anterior)
+            raiz = self._leer(self._raiz)
+        self._expulsar()
+
+    def _eliminar(self, identificador: int, clave: int) -> bool:
+        """
+        Returns:
+            bool: Si la página se ha quedado vacía y debe quitarse de su padre.
+        """
+        pagina = self._leer(identificador)
+        claves = pagina.claves
+        if pagina.hoja:
+            i = bisect_left(claves, clave)
+            if i == len(claves) or claves[i] != clave:
+                return False
+            del claves[i]
+            self._total -= 1
+            self._guardar(identificador, pagina)
+            return not claves and identificador != self._raiz
+
+        i = bisect_right(claves, clave)
+        hijo = pagina.hijos[i]
+        if not self._eliminar(hijo, clave):
+            return False
+        self._liberar(hijo)
+        del pagina.hijos[i]
+        if claves:
+            del claves[max(i - 1, 0)]
+        self._guardar(identificador, pagina)
+        return not pagina.hijos and identificador != self._raiz
+
+    def eliminarAll(self, valor: T) -> Tuple[Optional[VistaNodo]]:
+        resultados = self.buscarAll(valor)
+        for nodo in resultados:
+            self.eliminar(nodo.valor)
+        return resultados
+
+    def eliminarWhere(self, proposicion: Callable[[Optional[VistaNodo]], bool]) -> Tuple[Optional[VistaNodo]]:
+        resultados = self.buscarWhere(proposicion)
+        for nodo in resultados:
+            self.eliminar(nodo.valor)
+        return resultados
+
+
+# Clase de prueba para ArbolBDisco
+class TestArbolBDisco(unittest.TestCase):
+    def setUp(self):
+        descriptor, self.ruta = tempfile.mkstemp()
+        os.close(descriptor)
+
+    def tearDown(self):
+        os.remove(self.ruta)
+
+    def valores(self, arbol: ArbolBDisco) -> list:
+        return [nodo.valor for nodo in arbol.iter_inorden()]
+
+    def test_insertar_y_buscar(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=128) as arbol:
+            arbol.insertarAll((5, 1, 9, 1))
+            self.assertEqual(arbol.buscar(9).valor, 9)
+            self.assertIsNone(arbol.buscar(4))
+            self.assertIsNone(arbol.buscar("a"))
+            self.assertEqual(len(arbol), 3)
+
+    def test_divisiones_y_cache_pequena(self):
+        generador = random.Random(3)
+        valores = generador.sample(range(-5000, 5000), 3000)
+        with ArbolBDisco(self.ruta, tamano_pagina=128, memoria_cache=4 * 128) as arbol:
+            arbol.insertarAll(tuple(valores))
+            self.assertEqual(self.valores(arbol), sorted(valores))
+            self.assertGreater(arbol.fallos, 0)
+            for valor in valores[:10]:
+                self.assertEqual(arbol.buscar(valor).valor, valor)
+
+    def test_persistencia(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=256, memoria_cache=8 * 256) as arbol:
+            arbol.insertarAll(tuple(range(2000)))
+            arbol.eliminarWhere(lambda nodo: nodo.valor % 2 == 1)
+        with ArbolBDisco(self.ruta) as arbol:
+            self.assertEqual(len(arbol), 1000)
+            self.assertEqual(self.valores(arbol), list(range(0, 2000, 2)))
+            self.assertIsNone(arbol.buscar(7))
+
+    def test_eliminar_libera_paginas(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=128) as arbol:
+            arbol.insertarAll(tuple(range(1000)))
+            paginas = arbol._paginas
+            for valor in range(1000):
+                arbol.eliminar(valor)
+            self.assertEqual(len(arbol), 0)
+            self.assertEqual(self.valores(arbol), [])
+            self.assertTrue(arbol._leer(arbol._raiz).hoja)
+            arbol.insertarAll(tuple(range(1000)))
+            self.assertEqual(arbol._paginas, paginas)
+            self.assertEqual(self.valores(arbol), list(range(1000)))
+
+    def test_eliminar_aleatorio(self):
+        generador = random.Random(8)
+        valores = set(generador.sample(range(10000), 4000))
+        with ArbolBDisco(self.ruta, tamano_pagina=128, memoria_cache=6 * 128) as arbol:
+            arbol.insertarAll(tuple(valores))
+            for valor in generador.sample(sorted(valores), 3000):
+                arbol.eliminar(valor)
+                valores.discard(valor)
+            self.assertEqual(self.valores(arbol), sorted(valores))
+            self.assertEqual(len(arbol.eliminarAll(min(valores))), 1)
+
+    def test_solo_enteros(self):
+        with ArbolBDisco(self.ruta) as arbol:
+            with self.assertRaises(TypeError):
+                arbol.insertar("a")
+            with self.assertRaises(OverflowError):
+                arbol.insertar(2 ** 70)
+            arbol.insertar(2 ** 63 - 1)
+            self.assertEqual(len(arbol), 1)
+
+    def test_escritura_fallida_no_pierde_la_pagina(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=128, memoria_cache=0) as arbol:
+            arbol.insertarAll(tuple(range(20)))
+            # La raíz y una hoja en caché; la raíz es la menos usada
+            identificador = arbol._raiz
+            pagina = arbol._leer(identificador)
+            arbol._leer(pagina.hijos[0])
+            pagina.sucia = True
+            pagina.claves.append(2 ** 70)
+            with self.assertRaises(OverflowError):
+                arbol._expulsar()
+            self.assertIs(arbol._cache[identificador], pagina)
+            pagina.claves.pop()
+            self.assertEqual(self.valores(arbol), list(range(20)))
+
+    def test_memoria_de_la_cache(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=256, memoria_cache=4096) as arbol:
+            arbol.insertarAll(tuple(range(3000)))
+            self.assertLessEqual(arbol._memoria, 4096)
+            self.assertEqual(arbol._memoria, sum(arbol._tamanos.values()))
+            self.assertEqual(set(arbol._tamanos), set(arbol._cache))
+            # La página decodificada ocupa más que en disco: caben menos de 4096 // 256 páginas
+            self.assertLess(len(arbol._cache), 4096 // 256)
+
+    def test_sin_expulsiones_durante_una_operacion(self):
+        with ArbolBDisco(self.ruta, tamano_pagina=128, memoria_cache=0) as arbol:
+            arbol.insertarAll(tuple(range(0, 200, 2)))
+            escribir = arbol._escribir
+
+            def fallar(identificador: int, pagina: Pagina) -> None:
+                raise OSError("disco lleno")
+
+            # La inserción termina en memoria, división incluida, antes de que falle la expulsión
+            arbol._escribir = fallar
+            with self.assertRaises(OSError):
+                for valor in range(1, 200, 2):
+                    arbol.insertar(valor)
+            arbol._escribir = escribir
+            insertados = list(range(0, 200, 2)) + list(range(1, valor + 1, 2))
+            self.assertEqual(self.valores(arbol), sorted(insertados))
+        with ArbolBDisco(self.ruta) as arbol:
+            self.assertEqual(self.valores(arbol), sorted(insertados))
+
+
+if __name__ == '__main__':
+    unittest.main()
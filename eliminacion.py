@@ -1,8 +1,21 @@
 from abc import ABCMeta, abstractmethod
-from typing import Callable, Optional, Optional, TypeVar, Tuple
+from typing import Callable, Iterator, Optional, Optional, TypeVar, Tuple
 from abc import ABCMeta, abstractproperty, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import math
+import os
+import tempfile
+from itertools import chain, islice, repeat
+from operator import itemgetter
+import random
 import unittest
 
+from binario import escribir, leer
+from congelado import ArbolCongelado
+from paralelo import VistaNodo, evaluar_bloque, ordenar_en_paralelo
+
 T = TypeVar('T')
 
 # Interfaz para obtener el valor de un nodo en el árbol binario
@@ -94,9 +107,14 @@ class Nodo(NodoInterface):
             valor (int): El valor que se almacenará en el nodo.
         """
         self.__valor: int = valor
+        self.clave = valor
+        self.cuenta: int = 1
+        self.tamano: int = 1
         self.izquierda: Optional[NodoInterface] = None
         self.derecha: Optional[NodoInterface] = None
         self.padre: Optional[NodoInterface] = None
+        self.siguiente: Optional[NodoInterface] = None
+        self.anterior: Optional[NodoInterface] = None
 
 
     @property
@@ -156,14 +174,108 @@ class Nodo(NodoInterface):
         """
         return self.__valor
 
+    @property
+    def clave(self) -> T:
+        """
+        Clave por la que se ordena el nodo en el árbol. Si el árbol no usa una función de clave, es el propio valor.
+
+        Returns:
+            T: La clave precalculada del nodo.
+        """
+        return self.__clave
+
+    @clave.setter
+    def clave(self, valor: T) -> None:
+        self.__clave = valor
+
+    @property
+    def cuenta(self) -> int:
+        """
+        Número de apariciones del valor. Solo los árboles en modo multiconjunto lo hacen mayor que 1.
+
+        Returns:
+            int: Las apariciones del valor en el árbol.
+        """
+        return self.__cuenta
+
+    @cuenta.setter
+    def cuenta(self, valor: int) -> None:
+        self.__cuenta = valor
+
+    @property
+    def tamano(self) -> int:
+        """
+        Número de valores (contando repeticiones) del subárbol del nodo. Solo se mantiene en los árboles
+        creados con estadisticas=True.
+
+        Returns:
+            int: El tamaño del subárbol.
+        """
+        return self.__tamano
+
+    @tamano.setter
+    def tamano(self, valor: int) -> None:
+        self.__tamano = valor
+
+    @property
+    def siguiente(self) -> Optional['NodoInterface']:
+        """
+        Nodo siguiente en orden. Solo se mantiene en los árboles creados con enlazado=True.
+
+        Returns:
+            Optional[NodoInterface]: El sucesor del nodo, o None si es el último.
+        """
+        return self.__siguiente
+
+    @siguiente.setter
+    def siguiente(self, valor: Optional['NodoInterface']) -> None:
+        self.__siguiente = valor
+
+    @property
+    def anterior(self) -> Optional['NodoInterface']:
+        """
+        Nodo anterior en orden. Solo se mantiene en los árboles creados con enlazado=True.
+
+        Returns:
+            Optional[NodoInterface]: El predecesor del nodo, o None si es el primero.
+        """
+        return self.__anterior
+
+    @anterior.setter
+    def anterior(self, valor: Optional['NodoInterface']) -> None:
+        self.__anterior = valor
+
+# Nodo compacto: sin __dict__ ni propiedades, pensado para árboles con muchos nodos
+class NodoCompacto:
+    """
+    Alternativa a Nodo que guarda sus campos en __slots__ y no hereda de las interfaces abstractas,
+    de modo que leer o escribir cualquier campo es un acceso directo al atributo. A diferencia de Nodo,
+    asignar un hijo no toca su padre: de eso se encargan _enlazar_izquierda y _enlazar_derecha del árbol.
+    """
+    __slots__ = ('valor', 'clave', 'cuenta', 'tamano', 'izquierda', 'derecha', 'padre', 'siguiente', 'anterior')
+
+    def __init__(self, valor: T):
+        self.valor = valor
+        self.clave = valor
+        self.cuenta = 1
+        self.tamano = 1
+        self.izquierda = None
+        self.derecha = None
+        self.padre = None
+        self.siguiente = None
+        self.anterior = None
+
+
+NodoInterface.register(NodoCompacto)
+
 # Interfaz para operaciones de inserción en el árbol
 class OperacionesInsercion(metaclass=ABCMeta):
     @abstractmethod
-    def insertar(self, valor: T, proposicion: Callable[[T, T], bool]) -> None:
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
         pass
 
     @abstractmethod
-    def insertarAll(self, valores: Tuple[T], proposicion: Callable[[T, T], bool]) -> None:
+    def insertarAll(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
         pass
 
 # Interfaz para operaciones de búsqueda en el árbol
@@ -199,106 +311,730 @@ class OperacionesEliminacion(metaclass=ABCMeta):
 class Arbol(OperacionesInsercion, OperacionesBusqueda, OperacionesEliminacion, metaclass=ABCMeta):
     pass
 
+# Clave de consulta para árboles ordenados con una proposición: cada comparación < llama una sola vez a la proposición
+class _ClaveProposicion:
+    __slots__ = ('valor', 'proposicion')
+
+    def __init__(self, valor: T, proposicion: Callable[[T, T], bool]):
+        self.valor = valor
+        self.proposicion = proposicion
+
+    def __eq__(self, otra: object) -> bool:
+        return self.valor == (otra.valor if type(otra) is _ClaveProposicion else otra)
+
+    def __lt__(self, otra: object) -> bool:
+        return self.proposicion(self.valor, otra.valor if type(otra) is _ClaveProposicion else otra)
+
+    def __gt__(self, otra: object) -> bool:
+        return self.proposicion(otra, self.valor)
+
+
 class ArbolBinario(Arbol):
+    # Fracción de nodos eliminados a partir de la cual eliminarWhere reconstruye el árbol en lugar de borrar uno a uno
+    umbral_reconstruccion: float = 0.1
+    # Valores a partir de los cuales insertarAll(masivo=True, procesos=...) ordena la entrada en varios procesos
+    umbral_paralelo: int = 100000
+    # Nodos a partir de los cuales buscarWhere reparte la proposición entre los trabajadores del ejecutor recibido
+    umbral_where_paralelo: int = 2000
+
+    def __init__(self, raiz=None, clase_nodo: Callable[[T], NodoInterface] = Nodo,
+                 clave: Optional[Callable[[T], object]] = None,
+                 proposicion: Optional[Callable[[T, T], bool]] = None, multiconjunto: bool = False,
+                 estadisticas: bool = False, enlazado: bool = False) -> None:
+        """
+        Constructor de la clase ArbolBinario.
 
-    def __init__(self, raiz=None) -> None:
+        Args:
+            raiz (Optional[NodoInterface]): La raíz inicial del árbol.
+            clase_nodo (Callable[[T], NodoInterface]): La clase con la que se crean los nodos.
+            clave (Optional[Callable[[T], object]]): Función que calcula la clave de orden de cada valor.
+                La clave se calcula una vez por operación y se guarda en los nodos.
+            proposicion (Optional[Callable[[T, T], bool]]): Orden del árbol cuando no se usa clave: indica si
+                el primer valor va a la izquierda del segundo. Sin clave ni proposición se usa <.
+            multiconjunto (bool): Si es True, insertar un valor repetido incrementa la cuenta de su nodo
+                y eliminar la decrementa, en lugar de descartar el duplicado.
+            estadisticas (bool): Si es True, cada nodo mantiene el tamaño de su subárbol para responder
+                seleccionar, rango y percentil en O(altura).
+            enlazado (bool): Si es True, cada nodo enlaza con su sucesor y su predecesor en orden, de modo que
+                iter_inorden, siguiente y anterior avanzan en O(1) por paso sin pila.
+        """
         self.__raiz = raiz
+        self.__clase_nodo = clase_nodo
+        self.__clave = clave
+        self.__proposicion = proposicion
+        self.__multiconjunto = multiconjunto
+        self.__estadisticas = estadisticas
+        self.__enlazado = False
+        if estadisticas:
+            for nodo in self.iter_postorden():
+                self._recalcular_tamano(nodo)
+        if enlazado:
+            self._enlazar_en_orden(list(self.iter_inorden()))
+            self.__enlazado = True
 
     @property
     def raiz(self):
         return self.__raiz
-    
-    def insertar(self, valor: T, proposicion: Callable[[T, T], bool]) -> None:
-        
-        if self.raiz is None:
-            self.raiz = Nodo(valor)
+
+    @raiz.setter
+    def raiz(self, valor: Optional[NodoInterface]) -> None:
+        if valor is not None:
+            valor.padre = None
+        self.__raiz = valor
+
+    @property
+    def clase_nodo(self) -> Callable[[T], NodoInterface]:
+        return self.__clase_nodo
+
+    @property
+    def multiconjunto(self) -> bool:
+        return self.__multiconjunto
+
+    @property
+    def estadisticas(self) -> bool:
+        return self.__estadisticas
+
+    @property
+    def enlazado(self) -> bool:
+        return self.__enlazado
+
+    def _enlazar_en_orden(self, nodos: list) -> None:
+        anterior = None
+        for nodo in nodos:
+            nodo.anterior = anterior
+            if anterior is not None:
+                anterior.siguiente = nodo
+            anterior = nodo
+        if anterior is not None:
+            anterior.siguiente = None
+
+    def _enlazar_hoja(self, nodo: NodoInterface) -> None:
+        """
+        Enlaza en orden un nodo recién colgado como hoja: su padre es su sucesor o su predecesor.
+        """
+        if not self.__enlazado or nodo.padre is None:
             return
-        self._insertar_recursiva(valor, proposicion, self.raiz)
-    
-    def _insertar_recursiva(self, valor: T, proposicion: Callable[[T, T], bool], nodo_actual: 'NodoInterface') -> None:
-        
-        if valor == nodo_actual.valor:
+        padre = nodo.padre
+        if padre.izquierda is nodo:
+            anterior, siguiente = padre.anterior, padre
+        else:
+            anterior, siguiente = padre, padre.siguiente
+        nodo.anterior, nodo.siguiente = anterior, siguiente
+        if anterior is not None:
+            anterior.siguiente = nodo
+        if siguiente is not None:
+            siguiente.anterior = nodo
+
+    def _desenlazar_hilo(self, nodo: NodoInterface) -> None:
+        if not self.__enlazado:
             return
-        
-        if not proposicion(valor, nodo_actual.valor) and nodo_actual.derecha is None:
-            nodo_actual.derecha = Nodo(valor)
+        anterior, siguiente = nodo.anterior, nodo.siguiente
+        if anterior is not None:
+            anterior.siguiente = siguiente
+        if siguiente is not None:
+            siguiente.anterior = anterior
+        nodo.anterior = nodo.siguiente = None
+
+    def _recalcular_tamano(self, nodo: NodoInterface) -> None:
+        if self.__estadisticas:
+            izquierda, derecha = nodo.izquierda, nodo.derecha
+            nodo.tamano = (nodo.cuenta + (0 if izquierda is None else izquierda.tamano)
+                           + (0 if derecha is None else derecha.tamano))
+
+    def _ajustar_tamanos(self, nodo: Optional[NodoInterface], delta: int, hasta: Optional[NodoInterface] = None) -> None:
+        """
+        Suma delta al tamaño del nodo y de sus antecesores, subiendo por padre hasta la raíz o hasta el nodo indicado (excluido).
+        """
+        if not self.__estadisticas:
             return
-        
-        if proposicion(valor, nodo_actual.valor) and nodo_actual.izquierda is None:
-            nodo_actual.izquierda = Nodo(valor)
+        while nodo is not None and nodo is not hasta:
+            nodo.tamano += delta
+            nodo = nodo.padre
+
+    def _crear_nodo(self, valor: T) -> NodoInterface:
+        """
+        Crea los nodos del árbol con la clase indicada en el constructor (Nodo o NodoCompacto).
+        Las variantes del árbol lo sobrescriben para usar su propio tipo de nodo.
+
+        Args:
+            valor (T): El valor que se almacenará en el nodo.
+        """
+        return self.__clase_nodo(valor)
+
+    def _nuevo_nodo(self, valor: T, clave: object) -> NodoInterface:
+        nodo = self._crear_nodo(valor)
+        if self.__clave is not None:
+            nodo.clave = clave
+        return nodo
+
+    def _clave_consulta(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> object:
+        """
+        Calcula la clave con la que se compara el valor contra la clave de cada nodo (con == y <).
+        El orden del árbol tiene prioridad; la proposición recibida solo se usa si el árbol no tiene orden propio.
+
+        Args:
+            valor (T): El valor a comparar.
+            proposicion (Optional[Callable[[T, T], bool]]): La proposición recibida por insertar o insertarAll.
+        """
+        if self.__clave is not None:
+            return self.__clave(valor)
+        proposicion = self.__proposicion or proposicion
+        if proposicion is not None:
+            return _ClaveProposicion(valor, proposicion)
+        return valor
+
+    def _clave_de_nodo(self, nodo: NodoInterface) -> object:
+        """
+        Clave de consulta de un nodo que ya está en el árbol, sin volver a llamar a la función de clave.
+        """
+        if self.__clave is None and self.__proposicion is not None:
+            return _ClaveProposicion(nodo.valor, self.__proposicion)
+        return nodo.clave
+    
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        clave = self._clave_consulta(valor, proposicion)
+        padre, candidato = self._descender(clave)
+        if candidato is not None and clave == candidato.clave:
+            if self.__multiconjunto:
+                candidato.cuenta += 1
+                self._ajustar_tamanos(candidato, 1)
             return
+
+        a_la_izquierda = padre is not candidato
+        nodo = self._nuevo_nodo(valor, clave)
+        if padre is None:
+            self.raiz = nodo
+        elif a_la_izquierda:
+            self._enlazar_izquierda(padre, nodo)
+        else:
+            self._enlazar_derecha(padre, nodo)
+        self._ajustar_tamanos(padre, 1)
+        self._enlazar_hoja(nodo)
         
-        if not proposicion(valor, nodo_actual.valor): 
-            self._insertar_recursiva(valor, proposicion, nodo_actual.derecha)
+    def _descender(self, clave: object) -> Tuple[Optional[NodoInterface], Optional[NodoInterface]]:
+        """
+        Baja hasta el hueco de la clave con una sola comparación < por nivel. La igualdad se comprueba después,
+        una vez, contra el candidato: el último nodo desde el que se bajó a la derecha, que es el de mayor
+        clave no mayor que la buscada.
+
+        Returns:
+            Tuple[Optional[NodoInterface], Optional[NodoInterface]]: El último nodo visitado y el candidato.
+                Si el último nodo visitado es el candidato, el hueco es su hijo derecho; si no, el izquierdo.
+        """
+        padre = candidato = None
+        nodo_actual = self.__raiz
+        while nodo_actual is not None:
+            padre = nodo_actual
+            if clave < nodo_actual.clave:
+                nodo_actual = nodo_actual.izquierda
+            else:
+                candidato = nodo_actual
+                nodo_actual = nodo_actual.derecha
+        return padre, candidato
+
+    def insertarAll(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]] = None, masivo: bool = False,
+                    procesos: Optional[int] = None) -> None:
+        """
+        Inserta varios valores en el árbol.
+
+        Args:
+            valores (Tuple[T]): Los valores a insertar.
+            proposicion (Callable[[T, T], bool]): Indica si el primer valor va a la izquierda del segundo.
+            masivo (bool): Si es True, ordena los valores una sola vez (o detecta que ya lo están), los
+                combina con los nodos existentes y reconstruye un árbol perfectamente balanceado en O(n).
+                Los nodos que ya estaban en el árbol se reutilizan.
+            procesos (Optional[int]): Con masivo, número de procesos con los que se calculan las claves y se
+                ordena la entrada cuando tiene al menos umbral_paralelo valores. Los nodos se crean y enlazan
+                siempre en este proceso. Los árboles ordenados por proposición ordenan en un solo proceso, y
+                la función de clave debe poder serializarse con pickle.
+        """
+        if not masivo:
+            for value in valores:
+                self.insertar(value, proposicion)
             return
-        
-        if proposicion(valor, nodo_actual.valor):
-            self._insertar_recursiva(valor, proposicion, nodo_actual.izquierda)
+
+        if (procesos is not None and len(valores) >= self.umbral_paralelo
+                and self.__proposicion is None and proposicion is None):
+            nuevos = zip(*ordenar_en_paralelo(valores, procesos, self.__clave))
+        else:
+            nuevos = self._ordenar_sin_duplicados(valores, proposicion)
+        existentes = list(self.iter_inorden())
+        nodos = []
+        i = 0
+        for clave, valor, cuenta in nuevos:
+            while i < len(existentes) and existentes[i].clave < clave:
+                nodos.append(existentes[i])
+                i += 1
+            if i < len(existentes) and clave == existentes[i].clave:
+                if self.__multiconjunto:
+                    existentes[i].cuenta += cuenta
+                continue
+            nodo = self._nuevo_nodo(valor, clave)
+            if self.__multiconjunto:
+                nodo.cuenta = cuenta
+            nodos.append(nodo)
+        nodos.extend(existentes[i:])
+
+        self._reconstruir(nodos)
+
+    def _ordenar_sin_duplicados(self, valores: Tuple[T], proposicion: Optional[Callable[[T, T], bool]]) -> list:
+        """
+        Returns:
+            list: Ternas [clave, valor, cuenta] ordenadas por clave y sin claves repetidas; cuenta es el
+                número de veces que aparecía la clave.
+        """
+        ternas = [[self._clave_consulta(valor, proposicion), valor, 1] for valor in valores]
+        if all(a[0] < b[0] for a, b in zip(ternas, ternas[1:])):
+            return ternas
+
+        ternas.sort(key=itemgetter(0))
+        resultado = []
+        for terna in ternas:
+            if resultado and terna[0] == resultado[-1][0]:
+                resultado[-1][2] += 1
+            else:
+                resultado.append(terna)
+        return resultado
+
+    def iter_inorden(self) -> Iterator[NodoInterface]:
+        """
+        Recorre los nodos en orden (izquierda, nodo, derecha) sin construir ninguna colección intermedia.
+        El árbol no debe modificarse mientras se consume el iterador.
+
+        Yields:
+            NodoInterface: Los nodos ordenados según el orden del árbol.
+        """
+        if self.__enlazado:
+            nodo_actual = None if self.__raiz is None else self._encontrar_minimo(self.__raiz)
+            while nodo_actual is not None:
+                yield nodo_actual
+                nodo_actual = nodo_actual.siguiente
             return
-        
-    def insertarAll(self, valores: Tuple[T], proposicion: Callable[[T, T], bool]) -> None:
-        for value in valores:
-            self.insertar(value, proposicion)
+
+        pendientes = []
+        nodo_actual = self.__raiz
+        while pendientes or nodo_actual is not None:
+            while nodo_actual is not None:
+                pendientes.append(nodo_actual)
+                nodo_actual = nodo_actual.izquierda
+            nodo_actual = pendientes.pop()
+            yield nodo_actual
+            nodo_actual = nodo_actual.derecha
+
+    def iter_preorden(self) -> Iterator[NodoInterface]:
+        """
+        Recorre los nodos en preorden (nodo, izquierda, derecha).
+
+        Yields:
+            NodoInterface: Los nodos en preorden.
+        """
+        pendientes = [self.__raiz] if self.__raiz is not None else []
+        while pendientes:
+            nodo_actual = pendientes.pop()
+            yield nodo_actual
+            if nodo_actual.derecha is not None:
+                pendientes.append(nodo_actual.derecha)
+            if nodo_actual.izquierda is not None:
+                pendientes.append(nodo_actual.izquierda)
+
+    def iter_postorden(self) -> Iterator[NodoInterface]:
+        """
+        Recorre los nodos en postorden (izquierda, derecha, nodo).
+
+        Yields:
+            NodoInterface: Los nodos en postorden.
+        """
+        pendientes = []
+        ultimo = None
+        nodo_actual = self.__raiz
+        while pendientes or nodo_actual is not None:
+            if nodo_actual is not None:
+                pendientes.append(nodo_actual)
+                nodo_actual = nodo_actual.izquierda
+                continue
+            cima = pendientes[-1]
+            if cima.derecha is not None and cima.derecha is not ultimo:
+                nodo_actual = cima.derecha
+            else:
+                ultimo = pendientes.pop()
+                yield ultimo
+
+    def iter_por_niveles(self) -> Iterator[NodoInterface]:
+        """
+        Recorre los nodos por niveles, de izquierda a derecha, empezando por la raíz.
+
+        Yields:
+            NodoInterface: Los nodos en anchura.
+        """
+        pendientes = deque([self.__raiz] if self.__raiz is not None else [])
+        while pendientes:
+            nodo_actual = pendientes.popleft()
+            yield nodo_actual
+            if nodo_actual.izquierda is not None:
+                pendientes.append(nodo_actual.izquierda)
+            if nodo_actual.derecha is not None:
+                pendientes.append(nodo_actual.derecha)
+
+    def _reconstruir(self, nodos: list) -> None:
+        """
+        Sustituye el árbol por un árbol perfectamente balanceado con los nodos dados, ya ordenados.
+        """
+        self.raiz = self._construir_balanceado(nodos, 0, len(nodos))
+        if self.__enlazado:
+            self._enlazar_en_orden(nodos)
+
+    def _construir_balanceado(self, nodos: list, inicio: int, fin: int) -> Optional[NodoInterface]:
+        """
+        Enlaza los nodos, ya ordenados, como un árbol perfectamente balanceado.
+
+        Returns:
+            Optional[NodoInterface]: La raíz del subárbol formado por nodos[inicio:fin].
+        """
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = nodos[medio]
+        self._enlazar_izquierda(nodo, self._construir_balanceado(nodos, inicio, medio))
+        self._enlazar_derecha(nodo, self._construir_balanceado(nodos, medio + 1, fin))
+        self._recalcular_tamano(nodo)
+        return nodo
     
+    def siguiente(self, nodo: NodoInterface) -> Optional[NodoInterface]:
+        """
+        Devuelve el nodo siguiente en orden. En modo enlazado cuesta O(1); si no, sube por padre
+        (O(1) amortizado al recorrer todo el árbol).
+
+        Returns:
+            Optional[NodoInterface]: El sucesor del nodo, o None si es el último.
+        """
+        if self.__enlazado:
+            return nodo.siguiente
+        if nodo.derecha is not None:
+            return self._encontrar_minimo(nodo.derecha)
+        while nodo.padre is not None and nodo.padre.derecha is nodo:
+            nodo = nodo.padre
+        return nodo.padre
+
+    def anterior(self, nodo: NodoInterface) -> Optional[NodoInterface]:
+        """
+        Devuelve el nodo anterior en orden; es la operación simétrica de siguiente.
+
+        Returns:
+            Optional[NodoInterface]: El predecesor del nodo, o None si es el primero.
+        """
+        if self.__enlazado:
+            return nodo.anterior
+        if nodo.izquierda is not None:
+            nodo = nodo.izquierda
+            while nodo.derecha is not None:
+                nodo = nodo.derecha
+            return nodo
+        while nodo.padre is not None and nodo.padre.izquierda is nodo:
+            nodo = nodo.padre
+        return nodo.padre
+
+    def congelar(self) -> ArbolCongelado:
+        """
+        Exporta el árbol a una instantánea de solo lectura con las claves ordenadas en memoria contigua.
+        La instantánea no comparte nodos con el árbol, así que el árbol puede seguir modificándose.
+
+        Returns:
+            ArbolCongelado: La instantánea, que responde buscar, buscarMuchos, buscarRango, rango,
+                seleccionar y percentil con búsquedas binarias.
+        """
+        nodos = list(self.iter_inorden())
+        if self.__clave is not None:
+            clave_consulta = self.__clave
+        elif self.__proposicion is not None:
+            proposicion = self.__proposicion
+            clave_consulta = lambda valor: _ClaveProposicion(valor, proposicion)
+        else:
+            clave_consulta = None
+        return ArbolCongelado([nodo.clave for nodo in nodos], [nodo.valor for nodo in nodos],
+                              [nodo.cuenta for nodo in nodos], clave_consulta)
+
+    def guardar(self, ruta: str) -> None:
+        """
+        Guarda los valores del árbol, en orden y con sus cuentas, en el formato binario de binario.escribir.
+
+        Raises:
+            TypeError: Si los valores no son todos enteros, todos flotantes o todos cadenas.
+            OverflowError: Si algún entero no cabe en 64 bits con signo; el archivo anterior queda intacto.
+        """
+        nodos = list(self.iter_inorden())
+        escribir(ruta, [nodo.valor for nodo in nodos], [nodo.cuenta for nodo in nodos])
+
+    @classmethod
+    def cargar(cls, ruta: str, **opciones) -> 'ArbolBinario':
+        """
+        Crea un árbol balanceado con los valores guardados con guardar. Los valores se leen del archivo
+        proyectado en memoria y ya están en orden, así que no se ordenan ni se insertan uno a uno.
+
+        Args:
+            ruta (str): El archivo creado con guardar.
+            **opciones: Argumentos del constructor; el orden (clave o proposicion) debe ser el del árbol guardado.
+        """
+        arbol = cls(**opciones)
+        with leer(ruta) as archivo:
+            nodos = [arbol._nuevo_nodo(valor, arbol._clave_consulta(valor)) for valor in archivo.valores]
+            if archivo.cuentas is not None and arbol.multiconjunto:
+                for nodo, cuenta in zip(nodos, archivo.cuentas):
+                    nodo.cuenta = cuenta
+        arbol._reconstruir(nodos)
+        return arbol
+
+    def cursor(self, nodo: Optional[NodoInterface] = None) -> 'Cursor':
+        """
+        Crea un cursor situado en el nodo dado o, si no se indica, en el primer nodo en orden.
+        """
+        if nodo is None and self.__raiz is not None:
+            nodo = self._encontrar_minimo(self.__raiz)
+        return Cursor(self, nodo)
+
     def buscar(self, valor: T) -> Optional[NodoInterface]:
-        return self._buscar_recursiva(valor, self.__raiz)
+        clave = self._clave_consulta(valor)
+        candidato = self._descender(clave)[1]
+        if candidato is not None and clave == candidato.clave:
+            return candidato
+        return None
 
-    def buscarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
-        resultados = []
-        self._buscarAll_recursiva(valor, self.__raiz, resultados)
-        return tuple(resultados)
+    def buscarMuchos(self, valores: Tuple[T]) -> Tuple[Optional[NodoInterface]]:
+        """
+        Busca un lote de valores con un único descenso compartido: las claves se ordenan una vez y cada nodo
+        reparte entre sus dos subárboles las claves que le quedan, de modo que los subárboles sin claves
+        pendientes no se visitan y cada nodo se compara una sola vez con todo el lote. Con lotes grandes el
+        coste se acerca a O(n + m) en lugar de O(m log n).
 
-    def buscarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool]) -> Tuple[Optional[NodoInterface]]:
-        resultados = []
-        self._buscarWhere_recursiva(proposicion, self.__raiz, resultados)
+        Args:
+            valores (Tuple[T]): Los valores a buscar; pueden repetirse.
+
+        Returns:
+            Tuple[Optional[NodoInterface]]: El nodo de cada valor, o None, en el mismo orden que valores.
+        """
+        claves = [self._clave_consulta(valor) for valor in valores]
+        orden = sorted(range(len(claves)), key=claves.__getitem__)
+        ordenadas = [claves[i] for i in orden]
+        resultados = [None] * len(claves)
+
+        pendientes = [(self.__raiz, 0, len(ordenadas))] if self.__raiz is not None and ordenadas else []
+        while pendientes:
+            nodo_actual, inicio, fin = pendientes.pop()
+            clave_actual = nodo_actual.clave
+            menores = bisect_left(ordenadas, clave_actual, inicio, fin)
+            mayores = bisect_right(ordenadas, clave_actual, menores, fin)
+            for i in range(menores, mayores):
+                resultados[orden[i]] = nodo_actual
+            if inicio < menores and nodo_actual.izquierda is not None:
+                pendientes.append((nodo_actual.izquierda, inicio, menores))
+            if mayores < fin and nodo_actual.derecha is not None:
+                pendientes.append((nodo_actual.derecha, mayores, fin))
         return tuple(resultados)
 
-    def _buscar_recursiva(self, valor: T, nodo_actual: Optional[NodoInterface]) -> Optional[NodoInterface]:
-        if nodo_actual is None or nodo_actual.valor == valor:
-            return nodo_actual
+    def buscarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
+        """
+        Busca el nodo del valor siguiendo solo el camino de búsqueda. Como los valores repetidos comparten
+        nodo (con su cuenta en modo multiconjunto), el resultado tiene como mucho un nodo.
+        """
+        nodo = self.buscar(valor)
+        return () if nodo is None else (nodo,)
+
+    def contar(self, valor: T) -> int:
+        """
+        Cuenta las apariciones de un valor en O(log n).
+
+        Returns:
+            int: La cuenta del nodo del valor, o 0 si no está en el árbol.
+        """
+        nodo = self.buscar(valor)
+        return 0 if nodo is None else nodo.cuenta
+
+    def buscarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool], ejecutor: Optional[Executor] = None,
+                    tamano_bloque: int = 1000) -> Tuple[Optional[NodoInterface]]:
+        """
+        Busca los nodos que cumplen la proposición, en preorden.
 
-        if valor < nodo_actual.valor:
-            return self._buscar_recursiva(valor, nodo_actual.izquierda)
+        Args:
+            proposicion (Callable[[Optional[NodoInterface]], bool]): La condición que deben cumplir los nodos.
+            ejecutor (Optional[Executor]): Si se indica, la proposición recibe siempre una VistaNodo con valor,
+                clave y cuenta, sin hijos ni padre, y con un ProcessPoolExecutor debe poder serializarse con
+                pickle. Si además el árbol tiene al menos umbral_where_paralelo nodos, los datos de los nodos
+                se reparten en bloques entre sus trabajadores (hilos o procesos); si no, se evalúa aquí.
+            tamano_bloque (int): Número de nodos de cada bloque enviado al ejecutor.
+
+        Returns:
+            Tuple[Optional[NodoInterface]]: Los nodos que cumplen la proposición, en el mismo orden con y sin ejecutor.
+        """
+        if ejecutor is None:
+            return tuple(self.buscarWhereIter(proposicion))
+        nodos = list(self.iter_preorden())
+        if len(nodos) < self.umbral_where_paralelo:
+            # Sin reparto la proposición recibe también VistaNodo, para que no dependa del tamaño del árbol
+            marcas = evaluar_bloque(proposicion, [(nodo.valor, nodo.clave, nodo.cuenta) for nodo in nodos])
+            return tuple(nodo for nodo, marca in zip(nodos, marcas) if marca)
+
+        bloques = [[(nodo.valor, nodo.clave, nodo.cuenta) for nodo in nodos[i:i + tamano_bloque]]
+                   for i in range(0, len(nodos), tamano_bloque)]
+        marcas = chain.from_iterable(ejecutor.map(evaluar_bloque, repeat(proposicion), bloques))
+        return tuple(nodo for nodo, marca in zip(nodos, marcas) if marca)
+
+    def buscarWhereIter(self, proposicion: Callable[[Optional[NodoInterface]], bool]) -> Iterator[NodoInterface]:
+        """
+        Versión perezosa de buscarWhere: devuelve los nodos que cumplen la proposición, en preorden,
+        a medida que los encuentra. Permite cortar la búsqueda con next() o itertools.islice.
+
+        Yields:
+            NodoInterface: Los nodos que cumplen la proposición.
+        """
+        return filter(proposicion, self.iter_preorden())
         
-        if valor > nodo_actual.valor:
-            return self._buscar_recursiva(valor, nodo_actual.derecha)
+    def buscarRango(self, desde: T, hasta: T, incluir_bordes: bool = True) -> Tuple[Optional[NodoInterface]]:
+        """
+        Busca los nodos cuyo valor está entre desde y hasta, en orden. Solo visita los subárboles que
+        pueden contener valores del rango, por lo que cuesta O(log n + k).
 
-    def _buscarAll_recursiva(self, valor: T, nodo_actual: Optional[NodoInterface], resultados: list[Optional[NodoInterface]]) -> None:
-        if nodo_actual is None:
-            return
+        Args:
+            desde (T): Límite inferior del rango.
+            hasta (T): Límite superior del rango.
+            incluir_bordes (bool): Si es True, los valores iguales a los límites forman parte del rango.
 
-        if nodo_actual.valor == valor:
+        Returns:
+            Tuple[Optional[NodoInterface]]: Los nodos del rango ordenados.
+        """
+        inferior = self._clave_consulta(desde)
+        superior = self._clave_consulta(hasta)
+        resultados = []
+        pendientes = []
+        nodo_actual = self.__raiz
+        while pendientes or nodo_actual is not None:
+            if nodo_actual is not None:
+                clave = nodo_actual.clave
+                if (not clave < inferior) if incluir_bordes else inferior < clave:
+                    pendientes.append(nodo_actual)
+                    nodo_actual = nodo_actual.izquierda
+                else:
+                    # El nodo y su subárbol izquierdo quedan por debajo del rango
+                    nodo_actual = nodo_actual.derecha
+                continue
+
+            nodo_actual = pendientes.pop()
+            clave = nodo_actual.clave
+            if superior < clave if incluir_bordes else not clave < superior:
+                break
             resultados.append(nodo_actual)
+            nodo_actual = nodo_actual.derecha
+        return tuple(resultados)
 
-        self._buscarAll_recursiva(valor, nodo_actual.izquierda, resultados)
-        self._buscarAll_recursiva(valor, nodo_actual.derecha, resultados)
+    def seleccionar(self, k: int) -> NodoInterface:
+        """
+        Devuelve el nodo del k-ésimo menor valor (k empieza en 0 y cuenta las repeticiones) en O(altura).
 
-    def _buscarWhere_recursiva(self, proposicion: Callable[[Optional[NodoInterface]], bool], nodo_actual: Optional[NodoInterface], resultados: list[Optional[NodoInterface]]) -> None:
-        if nodo_actual is None:
-            return
+        Raises:
+            IndexError: Si k está fuera del árbol.
+        """
+        self._comprobar_estadisticas()
+        if k < 0:
+            raise IndexError(k)
+        nodo_actual = self.__raiz
+        while nodo_actual is not None:
+            tamano_izquierda = 0 if nodo_actual.izquierda is None else nodo_actual.izquierda.tamano
+            if k < tamano_izquierda:
+                nodo_actual = nodo_actual.izquierda
+            elif k < tamano_izquierda + nodo_actual.cuenta:
+                return nodo_actual
+            else:
+                k -= tamano_izquierda + nodo_actual.cuenta
+                nodo_actual = nodo_actual.derecha
+        raise IndexError(k)
+
+    def rango(self, valor: T) -> int:
+        """
+        Cuenta cuántos valores del árbol son menores que el valor dado, en O(altura).
+        """
+        self._comprobar_estadisticas()
+        clave = self._clave_consulta(valor)
+        menores = 0
+        candidato = None
+        nodo_actual = self.__raiz
+        while nodo_actual is not None:
+            if clave < nodo_actual.clave:
+                nodo_actual = nodo_actual.izquierda
+            else:
+                tamano_izquierda = 0 if nodo_actual.izquierda is None else nodo_actual.izquierda.tamano
+                menores += tamano_izquierda + nodo_actual.cuenta
+                candidato = nodo_actual
+                nodo_actual = nodo_actual.derecha
+        # El candidato se ha contado entero; si su clave es la buscada, no es menor
+        if candidato is not None and clave == candidato.clave:
+            menores -= candidato.cuenta
+        return menores
+
+    def percentil(self, p: float) -> NodoInterface:
+        """
+        Devuelve el nodo del percentil p (entre 0 y 100) por el método del rango más cercano.
 
-        if proposicion(nodo_actual):
-            resultados.append(nodo_actual)
+        Raises:
+            ValueError: Si p está fuera de [0, 100].
+            IndexError: Si el árbol está vacío.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(p)
+        self._comprobar_estadisticas()
+        total = 0 if self.__raiz is None else self.__raiz.tamano
+        return self.seleccionar(max(math.ceil(p / 100 * total) - 1, 0))
+
+    def _comprobar_estadisticas(self) -> None:
+        if not self.__estadisticas:
+            raise RuntimeError("El árbol no mantiene tamaños de subárbol; créelo con estadisticas=True")
+
+    def eliminarRango(self, desde: T, hasta: T, incluir_bordes: bool = True) -> Tuple[Optional[NodoInterface]]:
+        resultados = self.buscarRango(desde, hasta, incluir_bordes)
+        for nodo in resultados:
+            self._quitar(nodo)
+        return resultados
 
-        self._buscarWhere_recursiva(proposicion, nodo_actual.izquierda, resultados)
-        self._buscarWhere_recursiva(proposicion, nodo_actual.derecha, resultados)
-        
     def eliminar(self, valor: T) -> None:
-        self.__raiz = self._eliminar_recursiva(valor, self.__raiz)
-
-    def _eliminar_recursiva(self, valor: T, nodo_actual: Optional[NodoInterface]) -> Optional[NodoInterface]:
-        if nodo_actual is None:
-            return None
+        nodo = self.buscar(valor)
+        if nodo is None:
+            return
+        if self.__multiconjunto and nodo.cuenta > 1:
+            nodo.cuenta -= 1
+            self._ajustar_tamanos(nodo, -1)
+            return
+        self._quitar(nodo)
 
-        if valor < nodo_actual.valor:
-            nodo_actual.izquierda = self._eliminar_recursiva(valor, nodo_actual.izquierda)
-        elif valor > nodo_actual.valor:
-            nodo_actual.derecha = self._eliminar_recursiva(valor, nodo_actual.derecha)
+    def _quitar(self, nodo: NodoInterface) -> None:
+        """
+        Quita del árbol el nodo completo, sea cual sea su cuenta, usando su puntero padre en lugar de volver
+        a buscarlo. Las variantes balanceadas lo sobrescriben.
+        """
+        self._desenlazar_hilo(nodo)
+        padre = nodo.padre
+        self._ajustar_tamanos(padre, -nodo.cuenta)
+        self._reemplazar_hijo(padre, nodo, self._eliminar_nodo(nodo))
+
+    def _reemplazar_hijo(self, padre: Optional[NodoInterface], hijo: NodoInterface, reemplazo: Optional[NodoInterface]) -> None:
+        if padre is None:
+            self.raiz = reemplazo
+        elif padre.izquierda is hijo:
+            self._enlazar_izquierda(padre, reemplazo)
         else:
-            # Nodo a eliminar encontrado
-            nodo_actual = self._eliminar_nodo(nodo_actual)
+            self._enlazar_derecha(padre, reemplazo)
 
-        return nodo_actual
+    @staticmethod
+    def _enlazar_izquierda(padre: NodoInterface, hijo: Optional[NodoInterface]) -> None:
+        """
+        Cuelga el hijo a la izquierda del padre y apunta su padre hacia él. Todos los cambios de hijos del
+        árbol pasan por aquí o por _enlazar_derecha, así que NodoCompacto no necesita interceptar escrituras.
+        """
+        padre.izquierda = hijo
+        if hijo is not None:
+            hijo.padre = padre
+
+    @staticmethod
+    def _enlazar_derecha(padre: NodoInterface, hijo: Optional[NodoInterface]) -> None:
+        padre.derecha = hijo
+        if hijo is not None:
+            hijo.padre = padre
 
     def _eliminar_nodo(self, nodo_actual: NodoInterface) -> Optional[NodoInterface]:
         if nodo_actual.izquierda is None:
@@ -306,15 +1042,17 @@ class ArbolBinario(Arbol):
         elif nodo_actual.derecha is None:
             return nodo_actual.izquierda
 
-        # El nodo tiene dos hijos, encontrar el sucesor inmediato
+        # El nodo tiene dos hijos: el propio nodo sucesor ocupa su lugar, sin crear nodos nuevos,
+        # de modo que las referencias obtenidas con buscar siguen siendo válidas
         sucesor = self._encontrar_minimo(nodo_actual.derecha)
-        # Crear un nuevo nodo con el valor del sucesor
-        nuevo_nodo = Nodo(sucesor.valor)
-        nuevo_nodo.izquierda = nodo_actual.izquierda
-        nuevo_nodo.derecha = self._eliminar_recursiva(sucesor.valor, nodo_actual.derecha)
-
-        return nuevo_nodo
+        self._ajustar_tamanos(sucesor.padre, -sucesor.cuenta, hasta=nodo_actual)
+        if sucesor is not nodo_actual.derecha:
+            self._enlazar_izquierda(sucesor.padre, sucesor.derecha)
+            self._enlazar_derecha(sucesor, nodo_actual.derecha)
+        self._enlazar_izquierda(sucesor, nodo_actual.izquierda)
+        self._recalcular_tamano(sucesor)
 
+        return sucesor
 
     def _encontrar_minimo(self, nodo_actual: NodoInterface) -> NodoInterface:
         while nodo_actual.izquierda is not None:
@@ -322,45 +1060,402 @@ class ArbolBinario(Arbol):
         return nodo_actual
 
     def eliminarAll(self, valor: T) -> Tuple[Optional[NodoInterface]]:
-        resultados = []
-        self.__raiz = self._eliminarAll_recursiva(valor, self.__raiz, resultados)
-        return tuple(resultados)
+        resultados = self.buscarAll(valor)
+        for nodo in resultados:
+            self._quitar(nodo)
+        return resultados
 
-    def _eliminarAll_recursiva(self, valor: T, nodo_actual: Optional[NodoInterface], resultados: list[Optional[NodoInterface]]) -> Optional[NodoInterface]:
-        if nodo_actual is None:
-            return None
+    def eliminarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool],
+                      reconstruir: Optional[bool] = None) -> Tuple[Optional[NodoInterface]]:
+        """
+        Elimina los nodos que cumplen la proposición con un único recorrido en orden.
 
-        if valor == nodo_actual.valor:
-            resultados.append(nodo_actual)
-            nodo_actual = self._eliminarAll_recursiva(valor, nodo_actual.izquierda, resultados)
-            nodo_actual = self._eliminarAll_recursiva(valor, nodo_actual.derecha, resultados)
+        Args:
+            proposicion (Callable[[Optional[NodoInterface]], bool]): La condición de los nodos a eliminar.
+            reconstruir (Optional[bool]): Si es True, el árbol se reconstruye balanceado con los nodos que
+                quedan, en O(n); si es False, cada nodo se elimina por separado. Con None se reconstruye cuando
+                la fracción eliminada supera umbral_reconstruccion.
+
+        Returns:
+            Tuple[Optional[NodoInterface]]: Los nodos eliminados, en orden.
+        """
+        eliminados = []
+        supervivientes = []
+        for nodo in self.iter_inorden():
+            (eliminados if proposicion(nodo) else supervivientes).append(nodo)
+
+        if not eliminados:
+            return ()
+        if reconstruir is None:
+            reconstruir = len(eliminados) > self.umbral_reconstruccion * (len(eliminados) + len(supervivientes))
+        if reconstruir:
+            self._reconstruir(supervivientes)
+            for nodo in eliminados:
+                nodo.anterior = nodo.siguiente = None
         else:
-            nodo_actual.izquierda = self._eliminarAll_recursiva(valor, nodo_actual.izquierda, resultados)
-            nodo_actual.derecha = self._eliminarAll_recursiva(valor, nodo_actual.derecha, resultados)
+            for nodo in eliminados:
+                self._quitar(nodo)
+        return tuple(eliminados)
 
-        return nodo_actual
 
-    def eliminarWhere(self, proposicion: Callable[[Optional[NodoInterface]], bool]) -> Tuple[Optional[NodoInterface]]:
-        resultados = []
-        self.__raiz = self._eliminarWhere_recursiva(proposicion, self.__raiz, resultados)
-        return tuple(resultados)
+# Posición sobre un nodo del árbol que se desplaza en orden y busca claves cercanas partiendo de donde está
+class Cursor:
+
+    def __init__(self, arbol: ArbolBinario, nodo: Optional[NodoInterface] = None):
+        """
+        Constructor de la clase Cursor. Normalmente se obtiene con ArbolBinario.cursor.
+        El nodo del cursor no debe eliminarse del árbol mientras se use el cursor.
 
-    def _eliminarWhere_recursiva(self, proposicion: Callable[[Optional[NodoInterface]], bool], nodo_actual: Optional[NodoInterface], resultados: list[Optional[NodoInterface]]) -> Optional[NodoInterface]:
+        Args:
+            arbol (ArbolBinario): El árbol sobre el que se mueve el cursor.
+            nodo (Optional[NodoInterface]): El nodo en el que empieza el cursor.
+        """
+        self.arbol = arbol
+        self.nodo = nodo
+
+    @property
+    def valor(self) -> T:
+        return self.nodo.valor
+
+    def avanzar(self) -> Optional[NodoInterface]:
+        """
+        Mueve el cursor al nodo siguiente en orden.
+
+        Returns:
+            Optional[NodoInterface]: El nuevo nodo, o None si el cursor estaba en el último; en ese caso no se mueve.
+        """
+        siguiente = None if self.nodo is None else self.arbol.siguiente(self.nodo)
+        if siguiente is not None:
+            self.nodo = siguiente
+        return siguiente
+
+    def retroceder(self) -> Optional[NodoInterface]:
+        """
+        Mueve el cursor al nodo anterior en orden.
+
+        Returns:
+            Optional[NodoInterface]: El nuevo nodo, o None si el cursor estaba en el primero; en ese caso no se mueve.
+        """
+        anterior = None if self.nodo is None else self.arbol.anterior(self.nodo)
+        if anterior is not None:
+            self.nodo = anterior
+        return anterior
+
+    def buscar(self, valor: T) -> Optional[NodoInterface]:
+        """
+        Búsqueda con dedo: sube por padre desde el nodo actual solo hasta el primer antecesor cuyo subárbol
+        puede contener el valor y baja desde allí. Con claves cercanas al cursor el coste depende de la
+        distancia entre ambas, no del tamaño del árbol.
+
+        Returns:
+            Optional[NodoInterface]: El nodo del valor, o None si no está. Si lo encuentra, el cursor pasa a él;
+                si no, queda en el último nodo visitado, que es vecino en orden del valor buscado.
+        """
+        nodo_actual = self.nodo
         if nodo_actual is None:
-            return None
+            nodo_actual = self.arbol.raiz
+            if nodo_actual is None:
+                return None
 
-        if proposicion(nodo_actual):
-            resultados.append(nodo_actual)
-            return None  
+        clave = self.arbol._clave_consulta(valor)
+        if clave == nodo_actual.clave:
+            return nodo_actual
+
+        mayor = nodo_actual.clave < clave
+        # Cota: el nodo más cercano a la clave por el lado del que se viene. Al subir desde el lado que mira
+        # hacia el valor se compara una vez con el padre: o acota el rango por el otro lado, o pasa a ser la cota
+        cota = nodo_actual
+        while nodo_actual.padre is not None:
+            padre = nodo_actual.padre
+            if (padre.izquierda is nodo_actual) == mayor:
+                if clave < padre.clave if mayor else padre.clave < clave:
+                    break
+                cota = padre
+            nodo_actual = padre
+
+        # El valor es la cota o está en su subárbol del lado del valor
+        candidato = cota if mayor else None
+        ultimo = cota
+        nodo_actual = cota.derecha if mayor else cota.izquierda
+        while nodo_actual is not None:
+            ultimo = nodo_actual
+            if clave < nodo_actual.clave:
+                nodo_actual = nodo_actual.izquierda
+            else:
+                candidato = nodo_actual
+                nodo_actual = nodo_actual.derecha
+        if candidato is not None and clave == candidato.clave:
+            encontrado = candidato
+        elif not mayor and clave == cota.clave:
+            encontrado = cota
+        else:
+            encontrado = None
+        self.nodo = ultimo if encontrado is None else encontrado
+        return encontrado
+
+
+def _es_multiplo_de_3(nodo) -> bool:
+    return nodo.valor % 3 == 0
+
+
+# Clave que anota qué nodos se comparan, usada para comprobar la poda de subárboles
+class _ClaveContada:
+    def __init__(self, valor, visitados):
+        self.valor = valor
+        self.visitados = visitados
+
+    def __eq__(self, otra):
+        otra.visitados.append(otra.valor)
+        return self.valor == otra.valor
+
+    def __lt__(self, otra):
+        otra.visitados.append(otra.valor)
+        return self.valor < otra.valor
+
+
+# Clase de prueba para la carga masiva en varios procesos
+class TestCargaParalela(unittest.TestCase):
+    def test_igual_que_en_un_proceso(self):
+        valores = tuple(random.Random(2).choices(range(3000), k=5000))
+        serie = ArbolBinario(multiconjunto=True, estadisticas=True)
+        serie.insertarAll(valores, masivo=True)
+        paralelo = ArbolBinario(multiconjunto=True, estadisticas=True)
+        paralelo.umbral_paralelo = 0
+        paralelo.insertar(1500)
+        paralelo.insertarAll(valores, masivo=True, procesos=3)
+        paralelo.eliminar(1500)
+        self.assertEqual([(nodo.valor, nodo.cuenta) for nodo in paralelo.iter_inorden()],
+                         [(nodo.valor, nodo.cuenta) for nodo in serie.iter_inorden()])
+        self.assertEqual(paralelo.raiz.tamano, 5000)
+
+    def test_con_clave(self):
+        arbol = ArbolBinario(clave=abs)
+        arbol.umbral_paralelo = 0
+        arbol.insertarAll(tuple(range(-50, 0)), masivo=True, procesos=2)
+        self.assertEqual(next(arbol.iter_inorden()).valor, -1)
+        self.assertEqual(arbol.buscar(-20).valor, -20)
+
+
+# Clase de prueba para buscarWhere con ejecutor
+class TestBuscarWhereParalelo(unittest.TestCase):
+    def setUp(self):
+        self.arbol = ArbolBinario()
+        self.arbol.insertarAll(tuple(random.Random(4).sample(range(10000), 3000)))
+        self.esperados = self.arbol.buscarWhere(_es_multiplo_de_3)
 
-        nodo_actual.izquierda = self._eliminarWhere_recursiva(proposicion, nodo_actual.izquierda, resultados)
-        nodo_actual.derecha = self._eliminarWhere_recursiva(proposicion, nodo_actual.derecha, resultados)
+    def test_hilos(self):
+        with ThreadPoolExecutor(max_workers=3) as ejecutor:
+            resultados = self.arbol.buscarWhere(_es_multiplo_de_3, ejecutor, tamano_bloque=100)
+        self.assertEqual(resultados, self.esperados)
 
-        return nodo_actual
+    def test_procesos(self):
+        with ProcessPoolExecutor(max_workers=2) as ejecutor:
+            resultados = self.arbol.buscarWhere(_es_multiplo_de_3, ejecutor, tamano_bloque=500)
+        self.assertEqual(resultados, self.esperados)
 
+    def test_por_debajo_del_umbral(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll((3, 1, 6))
+        with ThreadPoolExecutor(max_workers=1) as ejecutor:
+            # Con ejecutor la proposición recibe VistaNodo aunque no se reparta, y devuelve los nodos del árbol
+            tipos = set()
+            resultados = arbol.buscarWhere(lambda nodo: tipos.add(type(nodo)) or nodo.valor > 1, ejecutor)
+        self.assertEqual(tipos, {VistaNodo})
+        self.assertEqual([nodo.valor for nodo in resultados], [3, 6])
+        self.assertIs(resultados[0], arbol.raiz)
+
+    def test_por_encima_del_umbral(self):
+        tipos = set()
+        with ThreadPoolExecutor(max_workers=2) as ejecutor:
+            resultados = self.arbol.buscarWhere(lambda nodo: tipos.add(type(nodo)) or nodo.valor % 3 == 0,
+                                                ejecutor, tamano_bloque=500)
+        self.assertEqual(tipos, {VistaNodo})
+        self.assertEqual(resultados, self.esperados)
+
+
+# Clase de prueba para guardar y cargar
+class TestGuardarCargar(unittest.TestCase):
+    def setUp(self):
+        descriptor, self.ruta = tempfile.mkstemp()
+        os.close(descriptor)
+
+    def tearDown(self):
+        os.remove(self.ruta)
+
+    def test_ida_y_vuelta(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((5, 1, 9, 5, 3, 5))
+        arbol.guardar(self.ruta)
+        cargado = ArbolBinario.cargar(self.ruta, multiconjunto=True, estadisticas=True)
+        self.assertEqual([(nodo.valor, nodo.cuenta) for nodo in cargado.iter_inorden()], [(1, 1), (3, 1), (5, 3), (9, 1)])
+        self.assertEqual(cargado.raiz.valor, 5)
+        self.assertEqual(cargado.seleccionar(4).valor, 5)
+
+    def test_cadenas_con_orden_propio(self):
+        arbol = ArbolBinario(proposicion=lambda x, y: x > y)
+        arbol.insertarAll(("b", "a", "c"))
+        arbol.guardar(self.ruta)
+        cargado = ArbolBinario.cargar(self.ruta, proposicion=lambda x, y: x > y)
+        self.assertEqual([nodo.valor for nodo in cargado.iter_inorden()], ["c", "b", "a"])
+        self.assertEqual(cargado.buscar("a").valor, "a")
+
+    def test_valores_no_admitidos(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(((1, 2), (0, 1)))
+        with self.assertRaises(TypeError):
+            arbol.guardar(self.ruta)
+
+
+# Clase de prueba para congelar
+class TestCongelar(unittest.TestCase):
+    def test_instantanea_independiente(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((5, 1, 9, 5, 3))
+        congelado = arbol.congelar()
+        arbol.eliminar(9)
+        self.assertEqual(congelado.buscar(9), 9)
+        self.assertEqual(list(congelado), [1, 3, 5, 9])
+        self.assertEqual(congelado.contar(5), 2)
+        self.assertEqual(congelado.seleccionar(3), 5)
+
+    def test_orden_por_clave(self):
+        arbol = ArbolBinario(clave=len)
+        arbol.insertarAll(("ccc", "a", "bb"))
+        congelado = arbol.congelar()
+        self.assertEqual(list(congelado), ["a", "bb", "ccc"])
+        self.assertEqual(congelado.buscar("xy"), "bb")
+        self.assertEqual(congelado.rango("zzz"), 2)
+
+    def test_orden_por_proposicion(self):
+        arbol = ArbolBinario(proposicion=lambda x, y: x > y)
+        arbol.insertarAll(tuple(range(10)))
+        congelado = arbol.congelar()
+        self.assertEqual(congelado.buscar(4), 4)
+        self.assertIsNone(congelado.buscar(10))
+        self.assertEqual(congelado.buscarRango(7, 5), (7, 6, 5))
+        self.assertEqual(congelado.seleccionar(0), 9)
+
+
+# Clase de prueba para buscarMuchos
+class TestBuscarMuchos(unittest.TestCase):
+    def test_alineado_con_la_entrada(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(random.Random(5).sample(range(1000), 300)))
+        consultas = tuple(random.Random(6).choices(range(-10, 1010), k=500))
+        self.assertEqual(arbol.buscarMuchos(consultas), tuple(arbol.buscar(valor) for valor in consultas))
+
+    def test_repetidos_y_vacios(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll((5, 3, 8))
+        self.assertEqual([nodo and nodo.valor for nodo in arbol.buscarMuchos((8, 4, 8, 3))], [8, None, 8, 3])
+        self.assertEqual(arbol.buscarMuchos(()), ())
+        self.assertEqual(ArbolBinario().buscarMuchos((1, 2)), (None, None))
+
+    def test_orden_por_clave_y_proposicion(self):
+        por_clave = ArbolBinario(clave=lambda valor: -valor)
+        por_proposicion = ArbolBinario(proposicion=lambda x, y: x > y)
+        for arbol in (por_clave, por_proposicion):
+            arbol.insertarAll(tuple(range(0, 100, 3)), masivo=True)
+            self.assertEqual([nodo and nodo.valor for nodo in arbol.buscarMuchos((99, 4, 0, 51))], [99, None, 0, 51])
+
+    def test_poda_subarboles_sin_consultas(self):
+        visitados = []
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(_ClaveContada(valor, visitados) for valor in range(1023)), masivo=True)
+        visitados.clear()
+        arbol.buscarMuchos(tuple(_ClaveContada(valor, []) for valor in (3, 5)))
+        self.assertLess(len(set(visitados)), 15)
+
+
+# Clase de prueba para Cursor
+class TestCursor(unittest.TestCase):
+    def setUp(self):
+        self.arbol = ArbolBinario()
+        self.arbol.insertarAll(tuple(range(0, 200, 2)), masivo=True)
+
+    def test_recorrer(self):
+        cursor = self.arbol.cursor()
+        self.assertEqual(cursor.valor, 0)
+        self.assertEqual(cursor.avanzar().valor, 2)
+        self.assertEqual(cursor.retroceder().valor, 0)
+        self.assertIsNone(cursor.retroceder())
+        self.assertEqual(cursor.valor, 0)
+        valores = [cursor.valor]
+        while cursor.avanzar() is not None:
+            valores.append(cursor.valor)
+        self.assertEqual(valores, list(range(0, 200, 2)))
+
+    def test_buscar_con_dedo(self):
+        cursor = self.arbol.cursor(self.arbol.buscar(50))
+        for valor in (52, 48, 100, 0, 198, 150, 150):
+            self.assertIs(cursor.buscar(valor), self.arbol.buscar(valor))
+            self.assertEqual(cursor.valor, valor)
+
+    def test_buscar_inexistente_queda_en_vecino(self):
+        cursor = self.arbol.cursor(self.arbol.buscar(10))
+        self.assertIsNone(cursor.buscar(77))
+        self.assertIn(cursor.valor, (76, 78))
+        self.assertIsNone(cursor.buscar(-5))
+        self.assertEqual(cursor.valor, 0)
+
+    def test_buscar_cercano_no_pasa_por_raiz(self):
+        visitados = []
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(_ClaveContada(valor, visitados) for valor in range(1023)), masivo=True)
+        cursor = arbol.cursor(arbol.buscar(_ClaveContada(300, [])))
+        visitados.clear()
+        arbol.buscar(_ClaveContada(303, []))
+        desde_la_raiz = len(visitados)
+        visitados.clear()
+        self.assertEqual(cursor.buscar(_ClaveContada(303, [])).valor.valor, 303)
+        self.assertNotIn(511, visitados)
+        self.assertLess(len(visitados), desde_la_raiz)
+
+    def test_arbol_vacio(self):
+        cursor = ArbolBinario().cursor()
+        self.assertIsNone(cursor.nodo)
+        self.assertIsNone(cursor.avanzar())
+        self.assertIsNone(cursor.buscar(3))
+
+    def test_orden_por_proposicion(self):
+        arbol = ArbolBinario(proposicion=lambda x, y: x > y)
+        arbol.insertarAll(tuple(range(50)), masivo=True)
+        cursor = arbol.cursor()
+        self.assertEqual(cursor.valor, 49)
+        self.assertEqual(cursor.buscar(40).valor, 40)
+        self.assertEqual(cursor.buscar(45).valor, 45)
+        self.assertEqual(cursor.avanzar().valor, 44)
+
+
+# Clase de prueba para NodoCompacto
+class TestNodoCompacto(unittest.TestCase):
+    def test_sin_diccionario(self):
+        nodo = NodoCompacto(10)
+        self.assertFalse(hasattr(nodo, '__dict__'))
+        with self.assertRaises(AttributeError):
+            nodo.altura = 1
+
+    def test_es_nodo_interface(self):
+        self.assertIsInstance(NodoCompacto(10), NodoInterface)
+
+    def test_enlazar_hijos_actualiza_padre(self):
+        nodo = NodoCompacto(10)
+        ArbolBinario._enlazar_izquierda(nodo, NodoCompacto(5))
+        ArbolBinario._enlazar_derecha(nodo, NodoCompacto(15))
+        self.assertIs(nodo.izquierda.padre, nodo)
+        self.assertIs(nodo.derecha.padre, nodo)
+        self.assertIsNone(nodo.padre)
+
+    def test_arbol_con_nodos_compactos(self):
+        arbol = ArbolBinario(clase_nodo=NodoCompacto)
+        arbol.insertarAll((10, 5, 15, 3, 7, 12), lambda x, y: x < y)
+        self.assertIsInstance(arbol.raiz, NodoCompacto)
+        self.assertEqual(arbol.buscar(7).padre.valor, 5)
+        arbol.eliminar(10)
+        self.assertIsInstance(arbol.raiz, NodoCompacto)
+        self.assertEqual(arbol.raiz.valor, 12)
+        self.assertEqual(len(arbol.buscarWhere(lambda nodo: nodo.valor < 10)), 3)
 
-        
-    
 
 # Clase de prueba para ArbolBinario
 class TestArbol(unittest.TestCase):
@@ -377,6 +1472,12 @@ class TestArbol(unittest.TestCase):
         arbol = ArbolBinario(Nodo(10))
         self.assertEqual(arbol._ArbolBinario__raiz.valor, 10)
         
+    def test_insertar_arbol_vacio(self):
+        arbol = ArbolBinario()
+        arbol.insertar(10, lambda x, y: x < y)
+        self.assertEqual(arbol.raiz.valor, 10)
+        self.assertIsNone(arbol.raiz.padre)
+
     def test_insertar_izquierda(self):
         arbol = ArbolBinario(Nodo(10))
         arbol.insertar(5, lambda x, y: x < y)
@@ -460,6 +1561,381 @@ class TestArbol(unittest.TestCase):
         resultados = self.arbol.buscarWhere(es_menor_que_10)
         self.assertEqual(len(resultados), 0)
 
+    def test_eliminarWhere_conserva_descendientes(self):
+        self.arbol.eliminarWhere(lambda nodo: nodo.valor == 5)
+        valores = sorted(nodo.valor for nodo in self.arbol.buscarWhere(lambda nodo: True))
+        self.assertEqual(valores, [3, 7, 10, 15])
+
+    def test_buscarWhere_preorden(self):
+        resultados = self.arbol.buscarWhere(lambda nodo: True)
+        self.assertEqual([nodo.valor for nodo in resultados], [10, 5, 3, 7, 15])
+
+    def test_eliminar_con_dos_hijos(self):
+        self.arbol.insertarAll((12, 20, 13), lambda x, y: x < y)
+        self.arbol.eliminar(10)
+        self.assertEqual(self.arbol.raiz.valor, 12)
+        self.assertEqual(self.arbol.raiz.derecha.izquierda.valor, 13)
+        self.assertIsNone(self.arbol.buscar(10))
+
+    def test_insertarAll_masivo_balanceado(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(range(7)), lambda x, y: x < y, masivo=True)
+        self.assertEqual(arbol.raiz.valor, 3)
+        self.assertEqual(arbol.raiz.izquierda.valor, 1)
+        self.assertEqual(arbol.raiz.derecha.derecha.valor, 6)
+        self.assertIsNone(arbol.raiz.padre)
+        self.assertIs(arbol.raiz.izquierda.padre, arbol.raiz)
+
+    def test_insertarAll_masivo_desordenado_con_duplicados(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll((5, 1, 4, 1, 3, 5, 2), lambda x, y: x < y, masivo=True)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], [1, 2, 3, 4, 5])
+        self.assertEqual(arbol.raiz.valor, 3)
+
+    def test_insertarAll_masivo_orden_propio(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll((1, 2, 3), lambda x, y: x > y, masivo=True)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], [3, 2, 1])
+
+    def test_insertarAll_masivo_combina_con_existentes(self):
+        nodo = self.arbol.buscar(7)
+        self.arbol.insertarAll((1, 7, 20, 12), lambda x, y: x < y, masivo=True)
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_inorden()], [1, 3, 5, 7, 10, 12, 15, 20])
+        self.assertIs(self.arbol.buscar(7), nodo)
+        self.assertEqual(self.arbol.raiz.valor, 10)
+
+    def test_orden_por_clave(self):
+        llamadas = []
+
+        def clave(valor):
+            llamadas.append(valor)
+            return (valor[1], valor[0])
+
+        arbol = ArbolBinario(clave=clave)
+        arbol.insertarAll((("a", 2), ("b", 1), ("c", 3)))
+        self.assertEqual(arbol.raiz.clave, (2, "a"))
+        self.assertEqual(arbol.raiz.izquierda.valor, ("b", 1))
+        llamadas.clear()
+        self.assertEqual(arbol.buscar(("c", 3)).valor, ("c", 3))
+        self.assertEqual(len(llamadas), 1)
+        arbol.eliminar(("a", 2))
+        self.assertIsNone(arbol.buscar(("a", 2)))
+        self.assertEqual(len(arbol.buscarWhere(lambda nodo: True)), 2)
+
+    def test_orden_por_proposicion_permite_buscar(self):
+        arbol = ArbolBinario(proposicion=lambda x, y: x > y)
+        arbol.insertarAll((10, 5, 15, 3, 20))
+        self.assertEqual(arbol.raiz.izquierda.valor, 15)
+        self.assertEqual(arbol.buscar(3).valor, 3)
+        self.assertEqual(arbol.buscar(20).valor, 20)
+        arbol.eliminar(15)
+        self.assertIsNone(arbol.buscar(15))
+        self.assertEqual(arbol.buscar(20).valor, 20)
+
+    def test_proposicion_una_llamada_por_nivel(self):
+        llamadas = []
+        comparaciones = []
+
+        def menor(x, y):
+            llamadas.append((x, y))
+            return x.valor < y.valor
+
+        arbol = ArbolBinario(proposicion=menor)
+        arbol.insertarAll(tuple(_ClaveContada(valor, comparaciones) for valor in range(10)))
+        llamadas.clear()
+        comparaciones.clear()
+        # Cadena de 10 nodos: 10 llamadas a la proposición y una sola igualdad al final
+        arbol.insertar(_ClaveContada(10, comparaciones))
+        self.assertEqual(len(llamadas), 10)
+        self.assertEqual(len(comparaciones), 1)
+
+    def test_una_comparacion_de_claves_por_nivel(self):
+        comparaciones = []
+        arbol = ArbolBinario(clave=lambda valor: _ClaveContada(valor, comparaciones), estadisticas=True)
+        arbol.insertarAll(tuple(range(10)))
+        for operacion, esperadas in ((lambda: arbol.insertar(10), 11), (lambda: arbol.insertar(5), 8),
+                                     (lambda: arbol.buscar(5), 8), (lambda: arbol.rango(5), 8)):
+            comparaciones.clear()
+            operacion()
+            self.assertEqual(len(comparaciones), esperadas)
+        self.assertEqual(arbol.rango(5), 5)
+        self.assertEqual(arbol.buscar(5).valor, 5)
+
+    def test_insertarAll_masivo_por_clave(self):
+        arbol = ArbolBinario(clave=len)
+        arbol.insertarAll(("ccc", "a", "bb", "dd"), masivo=True)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], ["a", "bb", "ccc"])
+
+    def test_buscarRango(self):
+        resultados = self.arbol.buscarRango(5, 10)
+        self.assertEqual([nodo.valor for nodo in resultados], [5, 7, 10])
+
+    def test_buscarRango_sin_bordes(self):
+        resultados = self.arbol.buscarRango(5, 10, incluir_bordes=False)
+        self.assertEqual([nodo.valor for nodo in resultados], [7])
+
+    def test_buscarRango_vacio(self):
+        self.assertEqual(self.arbol.buscarRango(16, 100), ())
+        self.assertEqual(self.arbol.buscarRango(8, 9), ())
+
+    def test_buscarRango_poda_subarboles(self):
+        visitados = []
+        arbol = ArbolBinario(clave=lambda valor: _ClaveContada(valor, visitados))
+        arbol.insertarAll(tuple(range(1024)), masivo=True)
+        visitados.clear()
+        resultados = arbol.buscarRango(500, 509)
+        self.assertEqual([nodo.valor for nodo in resultados], list(range(500, 510)))
+        self.assertLess(len(set(visitados)), 60)
+
+    def test_buscarRango_por_clave(self):
+        arbol = ArbolBinario(clave=lambda valor: -valor)
+        arbol.insertarAll(tuple(range(20)))
+        self.assertEqual([nodo.valor for nodo in arbol.buscarRango(12, 9)], [12, 11, 10, 9])
+
+    def test_eliminarRango(self):
+        eliminados = self.arbol.eliminarRango(4, 12)
+        self.assertEqual([nodo.valor for nodo in eliminados], [5, 7, 10])
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_inorden()], [3, 15])
+
+    def test_iter_inorden(self):
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_inorden()], [3, 5, 7, 10, 15])
+
+    def test_iter_preorden(self):
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_preorden()], [10, 5, 3, 7, 15])
+
+    def test_iter_postorden(self):
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_postorden()], [3, 7, 5, 15, 10])
+
+    def test_iter_por_niveles(self):
+        self.assertEqual([nodo.valor for nodo in self.arbol.iter_por_niveles()], [10, 5, 15, 3, 7])
+
+    def test_iteradores_arbol_vacio(self):
+        arbol = ArbolBinario()
+        self.assertEqual(list(arbol.iter_inorden()), [])
+        self.assertEqual(list(arbol.iter_preorden()), [])
+        self.assertEqual(list(arbol.iter_postorden()), [])
+        self.assertEqual(list(arbol.iter_por_niveles()), [])
+
+    def test_buscarWhereIter_corta_pronto(self):
+        evaluados = []
+
+        def es_par(nodo):
+            evaluados.append(nodo.valor)
+            return nodo.valor % 2 == 0
+
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(range(1000)), masivo=True)
+        primeros = list(islice(arbol.buscarWhereIter(es_par), 3))
+        self.assertEqual(len(primeros), 3)
+        self.assertLess(len(evaluados), 20)
+
+    def test_contar_sin_multiconjunto(self):
+        self.arbol.insertar(5)
+        self.assertEqual(self.arbol.contar(5), 1)
+        self.assertEqual(self.arbol.contar(6), 0)
+
+    def test_multiconjunto_cuenta_duplicados(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((3, 1, 3, 2, 3, 1))
+        self.assertEqual(arbol.contar(3), 3)
+        self.assertEqual(arbol.contar(1), 2)
+        self.assertEqual(len(list(arbol.iter_inorden())), 3)
+
+    def test_multiconjunto_eliminar_decrementa(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((2, 2, 1))
+        arbol.eliminar(2)
+        self.assertEqual(arbol.contar(2), 1)
+        arbol.eliminar(2)
+        self.assertEqual(arbol.contar(2), 0)
+        self.assertIsNone(arbol.buscar(2))
+
+    def test_multiconjunto_eliminarAll_quita_todas(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((5, 3, 8, 5, 5))
+        eliminados = arbol.eliminarAll(5)
+        self.assertEqual(len(eliminados), 1)
+        self.assertEqual(eliminados[0].cuenta, 3)
+        self.assertEqual(arbol.contar(5), 0)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], [3, 8])
+
+    def test_multiconjunto_masivo(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((4, 4, 1))
+        arbol.insertarAll((4, 2, 2, 1), masivo=True)
+        self.assertEqual([(nodo.valor, nodo.cuenta) for nodo in arbol.iter_inorden()], [(1, 2), (2, 2), (4, 3)])
+
+    def test_multiconjunto_conserva_cuenta_del_sucesor(self):
+        arbol = ArbolBinario(multiconjunto=True)
+        arbol.insertarAll((10, 5, 15, 12, 12))
+        arbol.eliminarAll(10)
+        self.assertEqual(arbol.contar(12), 2)
+
+    def test_buscarAll_solo_recorre_el_camino(self):
+        visitados = []
+        arbol = ArbolBinario(clave=lambda valor: _ClaveContada(valor, visitados))
+        arbol.insertarAll(tuple(range(1024)), masivo=True)
+        visitados.clear()
+        self.assertEqual(len(arbol.buscarAll(700)), 1)
+        self.assertLessEqual(len(visitados), 2 * 11)
+
+    def verificar_tamanos(self, nodo) -> int:
+        if nodo is None:
+            return 0
+        tamano = nodo.cuenta + self.verificar_tamanos(nodo.izquierda) + self.verificar_tamanos(nodo.derecha)
+        self.assertEqual(nodo.tamano, tamano)
+        return tamano
+
+    def test_estadisticas_desde_raiz_existente(self):
+        arbol = ArbolBinario(self.arbol.raiz, estadisticas=True)
+        self.verificar_tamanos(arbol.raiz)
+        self.assertEqual(arbol.seleccionar(0).valor, 3)
+        self.assertEqual(arbol.seleccionar(4).valor, 15)
+        self.assertEqual(arbol.rango(10), 3)
+        self.assertEqual(arbol.rango(11), 4)
+
+    def test_estadisticas_se_mantienen(self):
+        generador = random.Random(3)
+        valores = generador.sample(range(1000), 300)
+        arbol = ArbolBinario(estadisticas=True, multiconjunto=True)
+        arbol.insertarAll(tuple(valores))
+        arbol.insertarAll(tuple(valores[:50]))
+        for valor in valores[100:200]:
+            arbol.eliminar(valor)
+        arbol.eliminar(valores[0])
+        arbol.eliminarRango(400, 500)
+        arbol.insertarAll(tuple(range(0, 1000, 7)), masivo=True)
+        self.verificar_tamanos(arbol.raiz)
+        ordenados = [nodo.valor for nodo in arbol.iter_inorden() for _ in range(nodo.cuenta)]
+        for k in (0, 17, len(ordenados) - 1):
+            self.assertEqual(arbol.seleccionar(k).valor, ordenados[k])
+        self.assertEqual(arbol.rango(600), sum(1 for valor in ordenados if valor < 600))
+
+    def test_seleccionar_fuera_de_rango(self):
+        arbol = ArbolBinario(estadisticas=True)
+        arbol.insertarAll((1, 2, 3))
+        with self.assertRaises(IndexError):
+            arbol.seleccionar(3)
+        with self.assertRaises(IndexError):
+            arbol.seleccionar(-1)
+
+    def test_percentil(self):
+        arbol = ArbolBinario(estadisticas=True)
+        arbol.insertarAll(tuple(range(1, 101)), masivo=True)
+        self.assertEqual(arbol.percentil(50).valor, 50)
+        self.assertEqual(arbol.percentil(99).valor, 99)
+        self.assertEqual(arbol.percentil(0).valor, 1)
+        self.assertEqual(arbol.percentil(100).valor, 100)
+        with self.assertRaises(ValueError):
+            arbol.percentil(101)
+
+    def test_estadisticas_desactivadas(self):
+        with self.assertRaises(RuntimeError):
+            self.arbol.seleccionar(0)
+
+    def test_eliminar_con_dos_hijos_conserva_nodos(self):
+        self.arbol.insertarAll((12, 20, 13))
+        nodos = {nodo.valor: nodo for nodo in self.arbol.iter_inorden()}
+        self.arbol.eliminar(10)
+        self.assertIs(self.arbol.raiz, nodos[12])
+        self.assertIsNone(self.arbol.raiz.padre)
+        for nodo in self.arbol.iter_inorden():
+            self.assertIs(nodo, nodos[nodo.valor])
+            if nodo.izquierda is not None:
+                self.assertIs(nodo.izquierda.padre, nodo)
+            if nodo.derecha is not None:
+                self.assertIs(nodo.derecha.padre, nodo)
+
+    def test_eliminar_sucesor_hijo_directo(self):
+        self.arbol.eliminar(5)
+        self.assertEqual(self.arbol.raiz.izquierda.valor, 7)
+        self.assertEqual(self.arbol.raiz.izquierda.izquierda.valor, 3)
+        self.assertIs(self.arbol.raiz.izquierda.padre, self.arbol.raiz)
+
+    def test_eliminarWhere_nodos_encadenados(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(range(100)), masivo=True)
+        eliminados = arbol.eliminarWhere(lambda nodo: nodo.valor % 2 == 1)
+        self.assertEqual(len(eliminados), 50)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], list(range(0, 100, 2)))
+
+    def test_eliminarWhere_reconstruye(self):
+        arbol = ArbolBinario(estadisticas=True, multiconjunto=True)
+        arbol.insertarAll(tuple(range(100)) + (50, 51))
+        eliminados = arbol.eliminarWhere(lambda nodo: nodo.valor % 3 == 0, reconstruir=True)
+        self.assertEqual([nodo.valor for nodo in eliminados], list(range(0, 100, 3)))
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], [v for v in range(100) if v % 3])
+        self.assertEqual(arbol.contar(50), 2)
+        self.assertEqual(arbol.raiz.tamano, 67)
+        self.assertEqual(arbol.seleccionar(33).valor, 50)
+        self.verificar_tamanos(arbol.raiz)
+
+    def test_eliminarWhere_automatico(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(range(1000)))
+        arbol.eliminarWhere(lambda nodo: nodo.valor < 300)
+        # El árbol degenerado se reconstruye balanceado al eliminar el 30% de los nodos
+        self.assertEqual(arbol.raiz.valor, 650)
+        arbol.eliminarWhere(lambda nodo: nodo.valor == 999)
+        self.assertEqual(arbol.raiz.valor, 650)
+        self.assertIsNone(arbol.buscar(999))
+
+    def verificar_enlaces(self, arbol: ArbolBinario) -> None:
+        arbol_sin_enlaces = ArbolBinario(arbol.raiz)
+        esperados = list(arbol_sin_enlaces.iter_inorden())
+        self.assertEqual(list(arbol.iter_inorden()), esperados)
+        for anterior, siguiente in zip(esperados, esperados[1:]):
+            self.assertIs(anterior.siguiente, siguiente)
+            self.assertIs(siguiente.anterior, anterior)
+        if esperados:
+            self.assertIsNone(esperados[0].anterior)
+            self.assertIsNone(esperados[-1].siguiente)
+
+    def test_enlazado(self):
+        generador = random.Random(7)
+        for clase_nodo in (Nodo, NodoCompacto):
+            arbol = ArbolBinario(clase_nodo=clase_nodo, enlazado=True)
+            arbol.insertarAll(tuple(generador.sample(range(500), 200)))
+            self.verificar_enlaces(arbol)
+            for valor in generador.sample(range(500), 250):
+                arbol.eliminar(valor)
+            self.verificar_enlaces(arbol)
+            arbol.insertarAll(tuple(range(0, 500, 7)), masivo=True)
+            self.verificar_enlaces(arbol)
+            arbol.eliminarWhere(lambda nodo: nodo.valor % 2 == 0, reconstruir=True)
+            self.verificar_enlaces(arbol)
+
+    def test_enlazado_desde_raiz(self):
+        arbol = ArbolBinario(self.arbol.raiz, enlazado=True)
+        self.assertTrue(arbol.enlazado)
+        self.assertEqual(arbol.siguiente(arbol.buscar(7)).valor, 10)
+        self.assertEqual(arbol.anterior(arbol.buscar(5)).valor, 3)
+        self.assertIsNone(arbol.siguiente(arbol.buscar(15)))
+
+    def test_siguiente_y_anterior_sin_enlaces(self):
+        self.assertEqual(self.arbol.siguiente(self.arbol.buscar(7)).valor, 10)
+        self.assertEqual(self.arbol.siguiente(self.arbol.buscar(5)).valor, 7)
+        self.assertEqual(self.arbol.anterior(self.arbol.buscar(10)).valor, 7)
+        self.assertEqual(self.arbol.anterior(self.arbol.buscar(5)).valor, 3)
+        self.assertIsNone(self.arbol.anterior(self.arbol.buscar(3)))
+        self.assertIsNone(self.arbol.siguiente(self.arbol.buscar(15)))
+
+    def test_eliminarWhere_sin_coincidencias(self):
+        raiz = self.arbol.raiz
+        self.assertEqual(self.arbol.eliminarWhere(lambda nodo: False, reconstruir=True), ())
+        self.assertIs(self.arbol.raiz, raiz)
+
+    def test_arbol_degenerado_profundo(self):
+        arbol = ArbolBinario()
+        arbol.insertarAll(tuple(range(2000)), lambda x, y: x < y)
+        self.assertEqual(arbol.buscar(1999).valor, 1999)
+        self.assertEqual(len(arbol.buscarAll(1000)), 1)
+        self.assertEqual(len(arbol.buscarWhere(lambda nodo: nodo.valor % 2 == 0)), 1000)
+        arbol.eliminar(1999)
+        self.assertIsNone(arbol.buscar(1999))
+        arbol.eliminarWhere(lambda nodo: nodo.valor >= 10)
+        self.assertEqual(len(arbol.buscarWhere(lambda nodo: True)), 10)
+
 
 if __name__ == '__main__':
     unittest.main()
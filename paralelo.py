@@ -0,0 +1,171 @@
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
+from typing import Callable, Optional, TypeVar, Tuple
+import random
+import unittest
+
+T = TypeVar('T')
+
+# Valores de la muestra por proceso con la que se eligen las claves de corte
+MUESTRA_POR_PROCESO = 64
+
+
+def _compactar(claves: list):
+    """
+    Formato de transferencia entre procesos: las claves enteras viajan como un array, que se serializa como
+    un bloque de bytes en lugar de objeto a objeto.
+    """
+    if all(type(clave) is int for clave in claves):
+        try:
+            return array('q', claves)
+        except OverflowError:
+            pass
+    return claves
+
+
+def _ordenar_tramo(valores: Tuple[T], clave: Optional[Callable[[T], object]], cortes: list) -> list:
+    """
+    Primera fase, en cada proceso: ordena su tramo de la entrada y lo reparte entre los intervalos de claves.
+
+    Returns:
+        list: Para cada intervalo, el par (claves, valores) de este tramo que cae en él; valores es None si
+            los valores son sus propias claves.
+    """
+    if clave is None:
+        claves = sorted(valores)
+        valores = None
+    else:
+        pares = sorted(((clave(valor), valor) for valor in valores), key=itemgetter(0))
+        claves = [par[0] for par in pares]
+        valores = [par[1] for par in pares]
+
+    partes = []
+    inicio = 0
+    for corte in cortes + [None]:
+        fin = len(claves) if corte is None else bisect_right(claves, corte, inicio)
+        partes.append((_compactar(claves[inicio:fin]), None if valores is None else valores[inicio:fin]))
+        inicio = fin
+    return partes
+
+
+def _fusionar_intervalo(partes: list) -> Tuple[list, Optional[list], list]:
+    """
+    Segunda fase, en cada proceso: junta los trozos de un intervalo de claves que vienen de todos los tramos.
+
+    Returns:
+        Tuple[list, Optional[list], list]: Las claves ordenadas sin repetir, sus valores (None si son las
+            propias claves) y cuántas veces aparecía cada clave.
+    """
+    if all(valores is None for _, valores in partes):
+        # Sort detecta los trozos ya ordenados y los mezcla sin volver a ordenarlos
+        ordenadas = sorted(clave for claves, _ in partes for clave in claves)
+        pares = None
+    else:
+        pares = sorted((par for claves, valores in partes for par in zip(claves, valores)), key=itemgetter(0))
+        ordenadas = [par[0] for par in pares]
+
+    claves, valores, cuentas = [], [], []
+    for i, clave in enumerate(ordenadas):
+        if claves and clave == claves[-1]:
+            cuentas[-1] += 1
+            continue
+        claves.append(clave)
+        cuentas.append(1)
+        if pares is not None:
+            valores.append(pares[i][1])
+    return _compactar(claves), None if pares is None else valores, array('q', cuentas)
+
+
+def ordenar_en_paralelo(valores: Tuple[T], procesos: int,
+                        clave: Optional[Callable[[T], object]] = None) -> Tuple[list, list, list]:
+    """
+    Ordena y agrupa los valores repetidos con varios procesos (ordenación por muestreo): se eligen claves de
+    corte a partir de una muestra, cada proceso ordena un tramo de la entrada y lo reparte por intervalos, y
+    después cada proceso fusiona un intervalo. Como los intervalos no se solapan, basta con concatenarlos.
+
+    Args:
+        valores (Tuple[T]): Los valores a ordenar.
+        procesos (int): Número de procesos de trabajo.
+        clave (Optional[Callable[[T], object]]): Función de clave; debe poder serializarse con pickle.
+
+    Returns:
+        Tuple[list, list, list]: Las claves ordenadas sin repetir, el valor de cada una y su número de apariciones.
+    """
+    if not valores:
+        return [], [], []
+    muestra = random.Random(0).sample(valores, min(len(valores), procesos * MUESTRA_POR_PROCESO))
+    muestra = sorted(muestra if clave is None else map(clave, muestra))
+    cortes = [muestra[i * len(muestra) // procesos] for i in range(1, procesos)]
+    tamano_tramo = -(-len(valores) // procesos)
+    tramos = [valores[i:i + tamano_tramo] for i in range(0, len(valores), tamano_tramo)]
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        repartos = list(ejecutor.map(_ordenar_tramo, tramos, repeat(clave), repeat(cortes)))
+        intervalos = [[reparto[j] for reparto in repartos] for j in range(len(cortes) + 1)]
+        fusionados = list(ejecutor.map(_fusionar_intervalo, intervalos))
+
+    claves, ordenados, cuentas = [], [], []
+    for claves_intervalo, valores_intervalo, cuentas_intervalo in fusionados:
+        claves.extend(claves_intervalo)
+        ordenados.extend(claves_intervalo if valores_intervalo is None else valores_intervalo)
+        cuentas.extend(cuentas_intervalo)
+    return claves, ordenados, cuentas
+
+
+# Copia suelta de los datos de un nodo que se envía a los procesos de buscarWhere en lugar del nodo enlazado
+class VistaNodo:
+    __slots__ = ('valor', 'clave', 'cuenta')
+
+    def __init__(self, valor: T, clave: object, cuenta: int):
+        self.valor = valor
+        self.clave = clave
+        self.cuenta = cuenta
+
+
+def evaluar_bloque(proposicion: Callable[[VistaNodo], bool], bloque: list) -> list:
+    """
+    Evalúa la proposición sobre un bloque de ternas (valor, clave, cuenta).
+
+    Returns:
+        list: Para cada terna, si cumple la proposición.
+    """
+    return [bool(proposicion(VistaNodo(valor, clave, cuenta))) for valor, clave, cuenta in bloque]
+
+
+# Clase de prueba para ordenar_en_paralelo
+class TestOrdenarEnParalelo(unittest.TestCase):
+    def test_ordena_y_cuenta(self):
+        valores = tuple(random.Random(1).choices(range(500), k=3000))
+        claves, ordenados, cuentas = ordenar_en_paralelo(valores, 3)
+        self.assertEqual(claves, sorted(set(valores)))
+        self.assertEqual(ordenados, claves)
+        self.assertEqual(cuentas, [valores.count(clave) for clave in claves])
+
+    def test_con_clave(self):
+        valores = tuple(str(valor) for valor in range(200))
+        claves, ordenados, cuentas = ordenar_en_paralelo(valores, 2, clave=len)
+        self.assertEqual(claves, [1, 2, 3])
+        self.assertEqual([len(valor) for valor in ordenados], [1, 2, 3])
+        self.assertEqual(cuentas, [10, 90, 100])
+
+    def test_tramos_compactos(self):
+        partes = _ordenar_tramo((5, 1, 9, 3), None, [4])
+        self.assertEqual([list(claves) for claves, _ in partes], [[1, 3], [5, 9]])
+        self.assertIsInstance(partes[0][0], array)
+
+    def test_pocos_valores(self):
+        self.assertEqual(ordenar_en_paralelo((2, 1), 4), ([1, 2], [1, 2], [1, 1]))
+
+
+# Clase de prueba para evaluar_bloque
+class TestEvaluarBloque(unittest.TestCase):
+    def test_vistas(self):
+        marcas = evaluar_bloque(lambda nodo: nodo.cuenta > 1 and nodo.clave == nodo.valor, [(1, 1, 2), (2, 2, 1), (3, 4, 2)])
+        self.assertEqual(marcas, [True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
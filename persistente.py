@@ -0,0 +1,354 @@
+from typing import Callable, Iterator, Optional, TypeVar, Tuple
+import random
+import unittest
+
+T = TypeVar('T')
+
+
+# Nodo inmutable: como una versión puede compartirlo con otras, no guarda padre ni se modifica
+class NodoPersistente:
+    __slots__ = ('valor', 'clave', 'izquierda', 'derecha', 'altura', 'tamano')
+
+    def __init__(self, valor: T, clave: object, izquierda: Optional['NodoPersistente'] = None,
+                 derecha: Optional['NodoPersistente'] = None):
+        object.__setattr__(self, 'valor', valor)
+        object.__setattr__(self, 'clave', clave)
+        object.__setattr__(self, 'izquierda', izquierda)
+        object.__setattr__(self, 'derecha', derecha)
+        object.__setattr__(self, 'altura', 1 + max(_altura(izquierda), _altura(derecha)))
+        object.__setattr__(self, 'tamano', 1 + _tamano(izquierda) + _tamano(derecha))
+
+    def __setattr__(self, nombre: str, valor: object) -> None:
+        raise AttributeError(f"NodoPersistente es inmutable: no se puede asignar {nombre}")
+
+
+def _altura(nodo: Optional[NodoPersistente]) -> int:
+    return 0 if nodo is None else nodo.altura
+
+
+def _tamano(nodo: Optional[NodoPersistente]) -> int:
+    return 0 if nodo is None else nodo.tamano
+
+
+def _con_hijos(nodo: NodoPersistente, izquierda: Optional[NodoPersistente],
+               derecha: Optional[NodoPersistente]) -> NodoPersistente:
+    """
+    Copia del nodo con otros hijos, ya rebalanceada como en un árbol AVL. Las rotaciones también crean
+    copias, así que los nodos de las versiones anteriores no cambian.
+    """
+    balance = _altura(izquierda) - _altura(derecha)
+    if balance > 1:
+        if _altura(izquierda.izquierda) < _altura(izquierda.derecha):
+            izquierda = _rotar_izquierda(izquierda.valor, izquierda.clave, izquierda.izquierda, izquierda.derecha)
+        return _rotar_derecha(nodo.valor, nodo.clave, izquierda, derecha)
+    if balance < -1:
+        if _altura(derecha.derecha) < _altura(derecha.izquierda):
+            derecha = _rotar_derecha(derecha.valor, derecha.clave, derecha.izquierda, derecha.derecha)
+        return _rotar_izquierda(nodo.valor, nodo.clave, izquierda, derecha)
+    return NodoPersistente(nodo.valor, nodo.clave, izquierda, derecha)
+
+
+def _sin_minimo(nodo: NodoPersistente) -> Tuple[NodoPersistente, Optional[NodoPersistente]]:
+    """
+    Returns:
+        Tuple[NodoPersistente, Optional[NodoPersistente]]: El nodo mínimo del subárbol y una copia
+            rebalanceada del subárbol sin él.
+    """
+    if nodo.izquierda is None:
+        return nodo, nodo.derecha
+    minimo, izquierda = _sin_minimo(nodo.izquierda)
+    return minimo, _con_hijos(nodo, izquierda, nodo.derecha)
+
+
+def _rotar_izquierda(valor: T, clave: object, izquierda: Optional[NodoPersistente],
+                     derecha: NodoPersistente) -> NodoPersistente:
+    nodo = NodoPersistente(valor, clave, izquierda, derecha.izquierda)
+    return NodoPersistente(derecha.valor, derecha.clave, nodo, derecha.derecha)
+
+
+def _rotar_derecha(valor: T, clave: object, izquierda: NodoPersistente,
+                   derecha: Optional[NodoPersistente]) -> NodoPersistente:
+    nodo = NodoPersistente(valor, clave, izquierda.derecha, derecha)
+    return NodoPersistente(izquierda.valor, izquierda.clave, izquierda.izquierda, nodo)
+
+
+# Árbol AVL persistente: cada actualización copia solo el camino modificado y devuelve una versión nueva.
+# Tiene las mismas operaciones que Arbol, pero no lo implementa: las que modifican devuelven la versión nueva
+class ArbolPersistente:
+
+    def __init__(self, clave: Optional[Callable[[T], object]] = None, raiz: Optional[NodoPersistente] = None) -> None:
+        """
+        Constructor de la clase ArbolPersistente. Crea el árbol vacío; las demás versiones se obtienen
+        con insertar y eliminar, que no modifican la versión sobre la que se llaman.
+
+        Args:
+            clave (Optional[Callable[[T], object]]): Función que calcula la clave de orden de cada valor.
+            raiz (Optional[NodoPersistente]): La raíz de la versión; solo la usan las operaciones del árbol.
+        """
+        self.__clave = clave
+        self.__raiz = raiz
+
+    @property
+    def raiz(self) -> Optional[NodoPersistente]:
+        return self.__raiz
+
+    def __len__(self) -> int:
+        return _tamano(self.__raiz)
+
+    def __contains__(self, valor: T) -> bool:
+        return self.buscar(valor) is not None
+
+    def _clave_consulta(self, valor: T) -> object:
+        return valor if self.__clave is None else self.__clave(valor)
+
+    def _version(self, raiz: Optional[NodoPersistente]) -> 'ArbolPersistente':
+        return self if raiz is self.__raiz else ArbolPersistente(self.__clave, raiz)
+
+    def clonar(self) -> 'ArbolPersistente':
+        """
+        Las versiones son inmutables, así que una copia es la propia versión: cuesta O(1).
+        """
+        return self
+
+    def insertar(self, valor: T) -> 'ArbolPersistente':
+        """
+        Inserta un valor copiando solo los O(log n) nodos del camino; el resto se comparte con esta versión.
+
+        Returns:
+            ArbolPersistente: La versión con el valor; esta misma si ya estaba.
+        """
+        return self._version(self._insertar(valor, self._clave_consulta(valor), self.__raiz))
+
+    def _insertar(self, valor: T, clave: object, nodo: Optional[NodoPersistente],
+                  candidato: Optional[NodoPersistente] = None) -> Optional[NodoPersistente]:
+        """
+        Baja con una sola comparación < por nivel, como ArbolBinario._descender: el candidato es el último nodo
+        desde el que se bajó a la derecha, y la clave ya está si y solo si es la suya. En ese caso el hueco
+        sigue vacío y ningún nodo del camino se copia.
+        """
+        if nodo is None:
+            if candidato is not None and clave == candidato.clave:
+                return None
+            return NodoPersistente(valor, clave)
+        if clave < nodo.clave:
+            izquierda = self._insertar(valor, clave, nodo.izquierda, candidato)
+            return nodo if izquierda is nodo.izquierda else _con_hijos(nodo, izquierda, nodo.derecha)
+        derecha = self._insertar(valor, clave, nodo.derecha, nodo)
+        return nodo if derecha is nodo.derecha else _con_hijos(nodo, nodo.izquierda, derecha)
+
+    def insertarAll(self, valores: Tuple[T]) -> 'ArbolPersistente':
+        """
+        Returns:
+            ArbolPersistente: La versión con todos los valores. Las versiones intermedias no se conservan.
+        """
+        raiz = self.__raiz
+        for valor in valores:
+            raiz = self._insertar(valor, self._clave_consulta(valor), raiz)
+        return self._version(raiz)
+
+    def eliminar(self, valor: T) -> 'ArbolPersistente':
+        """
+        Returns:
+            ArbolPersistente: La versión sin el valor; esta misma si no estaba.
+        """
+        return self._version(self._eliminar(self._clave_consulta(valor), self.__raiz)[0])
+
+    def _eliminar(self, clave: object, nodo: Optional[NodoPersistente], candidato: Optional[NodoPersistente] = None
+                  ) -> Tuple[Optional[NodoPersistente], Optional[NodoPersistente]]:
+        """
+        Baja con una sola comparación < por nivel hasta el hueco, donde se compara una vez la clave del
+        candidato. Al volver, el nodo encontrado se quita al pasar por él y se copia el camino por encima.
+
+        Returns:
+            Tuple[Optional[NodoPersistente], Optional[NodoPersistente]]: El subárbol resultante y el nodo
+                quitado, o el mismo subárbol y None si la clave no estaba.
+        """
+        if nodo is None:
+            return None, candidato if candidato is not None and clave == candidato.clave else None
+        if clave < nodo.clave:
+            izquierda, quitado = self._eliminar(clave, nodo.izquierda, candidato)
+            return (nodo if quitado is None else _con_hijos(nodo, izquierda, nodo.derecha)), quitado
+        derecha, quitado = self._eliminar(clave, nodo.derecha, nodo)
+        if quitado is None:
+            return nodo, None
+        if quitado is not nodo:
+            return _con_hijos(nodo, nodo.izquierda, derecha), quitado
+        # Todo el subárbol derecho es mayor que la clave, así que ha vuelto sin cambios
+        if nodo.izquierda is None:
+            return nodo.derecha, nodo
+        if nodo.derecha is None:
+            return nodo.izquierda, nodo
+        # El sucesor ocupa el lugar del nodo: se copia con los hijos de este
+        sucesor, resto = _sin_minimo(nodo.derecha)
+        return _con_hijos(sucesor, nodo.izquierda, resto), nodo
+
+    def buscar(self, valor: T) -> Optional[NodoPersistente]:
+        clave = self._clave_consulta(valor)
+        candidato = None
+        nodo_actual = self.__raiz
+        while nodo_actual is not None:
+            if clave < nodo_actual.clave:
+                nodo_actual = nodo_actual.izquierda
+            else:
+                candidato = nodo_actual
+                nodo_actual = nodo_actual.derecha
+        if candidato is not None and clave == candidato.clave:
+            return candidato
+        return None
+
+    def buscarAll(self, valor: T) -> Tuple[NodoPersistente]:
+        nodo = self.buscar(valor)
+        return () if nodo is None else (nodo,)
+
+    def buscarWhere(self, proposicion: Callable[[NodoPersistente], bool]) -> Tuple[NodoPersistente]:
+        """
+        Devuelve los nodos que cumplen la proposición en orden, no en preorden como ArbolBinario.buscarWhere:
+        la forma de una versión depende de las rotaciones, así que el preorden no tiene significado aquí.
+        """
+        return tuple(filter(proposicion, self.iter_inorden()))
+
+    def eliminarAll(self, valor: T) -> Tuple['ArbolPersistente', Tuple[NodoPersistente]]:
+        """
+        Returns:
+            Tuple[ArbolPersistente, Tuple[NodoPersistente]]: La versión sin el valor y los nodos eliminados.
+        """
+        eliminados = self.buscarAll(valor)
+        return self._sin(eliminados), eliminados
+
+    def eliminarWhere(self, proposicion: Callable[[NodoPersistente], bool]) -> Tuple['ArbolPersistente', Tuple[NodoPersistente]]:
+        """
+        Returns:
+            Tuple[ArbolPersistente, Tuple[NodoPersistente]]: La versión sin los nodos que cumplen la
+                proposición y esos nodos, en orden. Esta versión no cambia.
+        """
+        eliminados = self.buscarWhere(proposicion)
+        return self._sin(eliminados), eliminados
+
+    def _sin(self, nodos: Tuple[NodoPersistente]) -> 'ArbolPersistente':
+        raiz = self.__raiz
+        for nodo in nodos:
+            raiz = self._eliminar(nodo.clave, raiz)[0]
+        return self._version(raiz)
+
+    def iter_inorden(self) -> Iterator[NodoPersistente]:
+        """
+        Recorre los nodos de esta versión en orden. Las actualizaciones posteriores no le afectan,
+        porque crean versiones nuevas.
+        """
+        pendientes = []
+        nodo_actual = self.__raiz
+        while pendientes or nodo_actual is not None:
+            while nodo_actual is not None:
+                pendientes.append(nodo_actual)
+                nodo_actual = nodo_actual.izquierda
+            nodo_actual = pendientes.pop()
+            yield nodo_actual
+            nodo_actual = nodo_actual.derecha
+
+
+# Clase de prueba para ArbolPersistente
+class TestArbolPersistente(unittest.TestCase):
+
+    def verificar_invariantes(self, nodo: Optional[NodoPersistente]) -> int:
+        if nodo is None:
+            return 0
+        if nodo.izquierda is not None:
+            self.assertLess(nodo.izquierda.clave, nodo.clave)
+        if nodo.derecha is not None:
+            self.assertGreater(nodo.derecha.clave, nodo.clave)
+        altura_izquierda = self.verificar_invariantes(nodo.izquierda)
+        altura_derecha = self.verificar_invariantes(nodo.derecha)
+        self.assertLessEqual(abs(altura_izquierda - altura_derecha), 1)
+        self.assertEqual(nodo.altura, 1 + max(altura_izquierda, altura_derecha))
+        self.assertEqual(nodo.tamano, 1 + _tamano(nodo.izquierda) + _tamano(nodo.derecha))
+        return nodo.altura
+
+    def valores(self, arbol: ArbolPersistente) -> list:
+        return [nodo.valor for nodo in arbol.iter_inorden()]
+
+    def test_versiones_independientes(self):
+        v0 = ArbolPersistente()
+        v1 = v0.insertarAll((5, 3, 8))
+        v2 = v1.insertar(4)
+        v3 = v2.eliminar(5)
+        self.assertEqual(self.valores(v0), [])
+        self.assertEqual(self.valores(v1), [3, 5, 8])
+        self.assertEqual(self.valores(v2), [3, 4, 5, 8])
+        self.assertEqual(self.valores(v3), [3, 4, 8])
+        self.assertIn(5, v2)
+        self.assertNotIn(5, v3)
+
+    def test_comparte_nodos_fuera_del_camino(self):
+        v1 = ArbolPersistente().insertarAll(tuple(range(100)))
+        v2 = v1.insertar(1000)
+        self.assertIsNot(v1.raiz, v2.raiz)
+        self.assertIs(v1.buscar(10), v2.buscar(10))
+        copiados = sum(1 for nodo in v2.iter_inorden() if v1.buscar(nodo.valor) is not nodo)
+        self.assertLessEqual(copiados, 2 * v1.raiz.altura)
+
+    def test_sin_cambios_devuelve_la_misma_version(self):
+        v1 = ArbolPersistente().insertarAll((1, 2, 3))
+        self.assertIs(v1.insertar(2), v1)
+        self.assertIs(v1.eliminar(7), v1)
+        self.assertIs(v1.clonar(), v1)
+
+    def test_balanceado(self):
+        generador = random.Random(9)
+        arbol = ArbolPersistente().insertarAll(tuple(range(1000)))
+        self.verificar_invariantes(arbol.raiz)
+        self.assertLessEqual(arbol.raiz.altura, 14)
+        for valor in generador.sample(range(1000), 600):
+            arbol = arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(len(arbol), 400)
+
+    def test_eliminarAll_y_eliminarWhere(self):
+        v1 = ArbolPersistente().insertarAll(tuple(range(10)))
+        v2, eliminados = v1.eliminarWhere(lambda nodo: nodo.valor % 3 == 0)
+        self.assertEqual([nodo.valor for nodo in eliminados], [0, 3, 6, 9])
+        self.assertEqual(self.valores(v2), [1, 2, 4, 5, 7, 8])
+        self.assertEqual(len(v1), 10)
+        self.verificar_invariantes(v2.raiz)
+        v3, eliminados = v2.eliminarAll(4)
+        self.assertEqual(len(eliminados), 1)
+        self.assertEqual(v2.buscarAll(4), eliminados)
+        self.assertEqual(v3.buscarAll(4), ())
+        self.assertIs(v3.eliminarAll(4)[0], v3)
+
+    def test_una_comparacion_por_nivel(self):
+        comparaciones = []
+
+        class Clave:
+            def __init__(self, valor: int):
+                self.valor = valor
+
+            def __eq__(self, otra: 'Clave') -> bool:
+                comparaciones.append('==')
+                return self.valor == otra.valor
+
+            def __lt__(self, otra: 'Clave') -> bool:
+                comparaciones.append('<')
+                return self.valor < otra.valor
+
+        arbol = ArbolPersistente(clave=Clave).insertarAll(tuple(range(127)))
+        altura = arbol.raiz.altura
+        for operacion in (lambda: arbol.buscar(50), lambda: arbol.insertar(50), lambda: arbol.eliminar(50)):
+            comparaciones.clear()
+            operacion()
+            self.assertEqual(comparaciones.count('=='), 1)
+            self.assertLessEqual(comparaciones.count('<'), altura)
+        self.assertEqual(self.valores(arbol.eliminar(50)), [valor for valor in range(127) if valor != 50])
+
+    def test_nodos_inmutables(self):
+        arbol = ArbolPersistente().insertar(1)
+        with self.assertRaises(AttributeError):
+            arbol.raiz.izquierda = None
+
+    def test_orden_por_clave(self):
+        arbol = ArbolPersistente(clave=lambda valor: -valor).insertarAll((1, 2, 3))
+        self.assertEqual(self.valores(arbol), [3, 2, 1])
+        self.assertEqual(arbol.eliminar(2).buscarWhere(lambda nodo: True)[0].valor, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,411 @@
+from typing import Callable, Optional, TypeVar
+import os
+import random
+import tempfile
+import unittest
+
+from eliminacion import ArbolBinario, Nodo, NodoCompacto
+
+T = TypeVar('T')
+
+# Nodo con el bit de color que necesita el árbol rojinegro
+class NodoRojiNegro(Nodo):
+
+    def __init__(self, valor: T):
+        """
+        Constructor de la clase NodoRojiNegro. Los nodos nuevos son rojos.
+
+        Args:
+            valor (T): El valor que se almacenará en el nodo.
+        """
+        super().__init__(valor)
+        self.rojo: bool = True
+
+
+# NodoRojiNegro con los campos en __slots__, para los árboles creados con clase_nodo=NodoCompacto
+class NodoRojiNegroCompacto(NodoCompacto):
+    __slots__ = ('rojo',)
+
+    def __init__(self, valor: T):
+        super().__init__(valor)
+        self.rojo = True
+
+
+def _es_rojo(nodo: Optional[NodoRojiNegro]) -> bool:
+    return nodo is not None and nodo.rojo
+
+
+# Árbol rojinegro: como mucho tres rotaciones por actualización, pensado para cargas con muchas escrituras
+class ArbolRojiNegro(ArbolBinario):
+
+    def _crear_nodo(self, valor: T) -> NodoRojiNegro:
+        """
+        Usa NodoRojiNegroCompacto si el árbol se creó con clase_nodo=NodoCompacto, NodoRojiNegro con Nodo, y
+        la clase recibida en otro caso, que tiene que guardar el color.
+        """
+        clase_nodo = self.clase_nodo
+        if clase_nodo is Nodo:
+            return NodoRojiNegro(valor)
+        if clase_nodo is NodoCompacto:
+            return NodoRojiNegroCompacto(valor)
+        return clase_nodo(valor)
+
+    def insertar(self, valor: T, proposicion: Optional[Callable[[T, T], bool]] = None) -> None:
+        clave = self._clave_consulta(valor, proposicion)
+        padre, candidato = self._descender(clave)
+        if candidato is not None and clave == candidato.clave:
+            if self.multiconjunto:
+                candidato.cuenta += 1
+                self._ajustar_tamanos(candidato, 1)
+            return
+
+        a_la_izquierda = padre is not candidato
+        nodo = self._nuevo_nodo(valor, clave)
+        if padre is None:
+            self.raiz = nodo
+        elif a_la_izquierda:
+            self._enlazar_izquierda(padre, nodo)
+        else:
+            self._enlazar_derecha(padre, nodo)
+        self._ajustar_tamanos(padre, 1)
+        self._enlazar_hoja(nodo)
+        self._reparar_insercion(nodo)
+
+    def _reconstruir(self, nodos: list) -> None:
+        super()._reconstruir(nodos)
+        self._colorear_por_niveles()
+
+    def _colorear_por_niveles(self) -> None:
+        # En un árbol perfectamente balanceado basta con pintar de rojo el último nivel
+        nivel = [self.raiz] if self.raiz is not None else []
+        while nivel:
+            siguiente = [hijo for nodo in nivel for hijo in (nodo.izquierda, nodo.derecha) if hijo is not None]
+            for nodo in nivel:
+                nodo.rojo = not siguiente
+            nivel = siguiente
+        if self.raiz is not None:
+            self.raiz.rojo = False
+
+    def _reparar_insercion(self, nodo: NodoRojiNegro) -> None:
+        while _es_rojo(nodo.padre):
+            padre = nodo.padre
+            abuelo = padre.padre
+            if padre is abuelo.izquierda:
+                tio = abuelo.derecha
+                if _es_rojo(tio):
+                    padre.rojo = tio.rojo = False
+                    abuelo.rojo = True
+                    nodo = abuelo
+                    continue
+                if nodo is padre.derecha:
+                    self._rotar_izquierda(padre)
+                    nodo, padre = padre, nodo
+                padre.rojo = False
+                abuelo.rojo = True
+                self._rotar_derecha(abuelo)
+            else:
+                tio = abuelo.izquierda
+                if _es_rojo(tio):
+                    padre.rojo = tio.rojo = False
+                    abuelo.rojo = True
+                    nodo = abuelo
+                    continue
+                if nodo is padre.izquierda:
+                    self._rotar_derecha(padre)
+                    nodo, padre = padre, nodo
+                padre.rojo = False
+                abuelo.rojo = True
+                self._rotar_izquierda(abuelo)
+        self.raiz.rojo = False
+
+    def _quitar(self, nodo: NodoRojiNegro) -> None:
+        """
+        Quita el nodo del árbol sin copiar valores, de modo que los demás nodos siguen siendo válidos.
+
+        Args:
+            nodo (NodoRojiNegro): El nodo a eliminar.
+        """
+        self._desenlazar_hilo(nodo)
+        if nodo.izquierda is None or nodo.derecha is None:
+            self._ajustar_tamanos(nodo.padre, -nodo.cuenta)
+
+        if nodo.izquierda is None:
+            hijo, padre_hijo, era_rojo = nodo.derecha, nodo.padre, nodo.rojo
+            self._trasplantar(nodo, hijo)
+        elif nodo.derecha is None:
+            hijo, padre_hijo, era_rojo = nodo.izquierda, nodo.padre, nodo.rojo
+            self._trasplantar(nodo, hijo)
+        else:
+            sucesor = self._encontrar_minimo(nodo.derecha)
+            self._ajustar_tamanos(sucesor.padre, -sucesor.cuenta, hasta=nodo)
+            self._ajustar_tamanos(nodo.padre, -nodo.cuenta)
+            hijo, era_rojo = sucesor.derecha, sucesor.rojo
+            if sucesor.padre is nodo:
+                padre_hijo = sucesor
+            else:
+                padre_hijo = sucesor.padre
+                self._trasplantar(sucesor, hijo)
+                self._enlazar_derecha(sucesor, nodo.derecha)
+            self._trasplantar(nodo, sucesor)
+            self._enlazar_izquierda(sucesor, nodo.izquierda)
+            sucesor.rojo = nodo.rojo
+            self._recalcular_tamano(sucesor)
+
+        if not era_rojo:
+            self._reparar_eliminacion(hijo, padre_hijo)
+
+    def _reparar_eliminacion(self, nodo: Optional[NodoRojiNegro], padre: Optional[NodoRojiNegro]) -> None:
+        # nodo puede ser None, por eso se lleva aparte su padre
+        while nodo is not self.raiz and not _es_rojo(nodo):
+            if nodo is padre.izquierda:
+                hermano = padre.derecha
+                if hermano.rojo:
+                    hermano.rojo = False
+                    padre.rojo = True
+                    self._rotar_izquierda(padre)
+                    hermano = padre.derecha
+                if not _es_rojo(hermano.izquierda) and not _es_rojo(hermano.derecha):
+                    hermano.rojo = True
+                    nodo, padre = padre, padre.padre
+                    continue
+                if not _es_rojo(hermano.derecha):
+                    hermano.izquierda.rojo = False
+                    hermano.rojo = True
+                    self._rotar_derecha(hermano)
+                    hermano = padre.derecha
+                hermano.rojo = padre.rojo
+                padre.rojo = False
+                hermano.derecha.rojo = False
+                self._rotar_izquierda(padre)
+            else:
+                hermano = padre.izquierda
+                if hermano.rojo:
+                    hermano.rojo = False
+                    padre.rojo = True
+                    self._rotar_derecha(padre)
+                    hermano = padre.izquierda
+                if not _es_rojo(hermano.izquierda) and not _es_rojo(hermano.derecha):
+                    hermano.rojo = True
+                    nodo, padre = padre, padre.padre
+                    continue
+                if not _es_rojo(hermano.izquierda):
+                    hermano.derecha.rojo = False
+                    hermano.rojo = True
+                    self._rotar_izquierda(hermano)
+                    hermano = padre.izquierda
+                hermano.rojo = padre.rojo
+                padre.rojo = False
+                hermano.izquierda.rojo = False
+                self._rotar_derecha(padre)
+            nodo = self.raiz
+        if nodo is not None:
+            nodo.rojo = False
+
+    def _trasplantar(self, nodo: NodoRojiNegro, reemplazo: Optional[NodoRojiNegro]) -> None:
+        padre = nodo.padre
+        if padre is None:
+            self.raiz = reemplazo
+        elif nodo is padre.izquierda:
+            self._enlazar_izquierda(padre, reemplazo)
+        else:
+            self._enlazar_derecha(padre, reemplazo)
+
+    def _rotar_izquierda(self, nodo: NodoRojiNegro) -> None:
+        pivote = nodo.derecha
+        self._enlazar_derecha(nodo, pivote.izquierda)
+        self._trasplantar(nodo, pivote)
+        self._enlazar_izquierda(pivote, nodo)
+        self._recalcular_tamano(nodo)
+        self._recalcular_tamano(pivote)
+
+    def _rotar_derecha(self, nodo: NodoRojiNegro) -> None:
+        pivote = nodo.izquierda
+        self._enlazar_izquierda(nodo, pivote.derecha)
+        self._trasplantar(nodo, pivote)
+        self._enlazar_derecha(pivote, nodo)
+        self._recalcular_tamano(nodo)
+        self._recalcular_tamano(pivote)
+
+
+# Clase de prueba para ArbolRojiNegro
+class TestArbolRojiNegro(unittest.TestCase):
+
+    def verificar_invariantes(self, nodo: Optional[NodoRojiNegro], padre: Optional[NodoRojiNegro] = None, estadisticas: bool = False) -> int:
+        if nodo is None:
+            return 1
+        self.assertIs(nodo.padre, padre)
+        if estadisticas:
+            tamano_izquierda = 0 if nodo.izquierda is None else nodo.izquierda.tamano
+            tamano_derecha = 0 if nodo.derecha is None else nodo.derecha.tamano
+            self.assertEqual(nodo.tamano, nodo.cuenta + tamano_izquierda + tamano_derecha)
+        if nodo.rojo:
+            self.assertFalse(_es_rojo(nodo.izquierda))
+            self.assertFalse(_es_rojo(nodo.derecha))
+        if nodo.izquierda is not None:
+            self.assertLess(nodo.izquierda.valor, nodo.valor)
+        if nodo.derecha is not None:
+            self.assertGreater(nodo.derecha.valor, nodo.valor)
+        altura_negra = self.verificar_invariantes(nodo.izquierda, nodo, estadisticas)
+        self.assertEqual(altura_negra, self.verificar_invariantes(nodo.derecha, nodo, estadisticas))
+        return altura_negra + (0 if nodo.rojo else 1)
+
+    def valores(self, arbol: ArbolRojiNegro) -> list:
+        return sorted(nodo.valor for nodo in arbol.buscarWhere(lambda nodo: True))
+
+    def test_raiz_negra(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertar(10, lambda x, y: x < y)
+        self.assertFalse(arbol.raiz.rojo)
+
+    def test_insertar_ordenado_balancea(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(range(500)), lambda x, y: x < y)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(self.valores(arbol), list(range(500)))
+
+    def test_insertarAll_masivo(self):
+        for n in (1, 2, 6, 7, 100):
+            arbol = ArbolRojiNegro()
+            arbol.insertarAll((3, 1), lambda x, y: x < y)
+            arbol.insertarAll(tuple(range(n)), lambda x, y: x < y, masivo=True)
+            self.verificar_invariantes(arbol.raiz)
+            arbol.insertar(n, lambda x, y: x < y)
+            arbol.eliminar(0)
+            self.verificar_invariantes(arbol.raiz)
+
+    def test_orden_por_proposicion(self):
+        arbol = ArbolRojiNegro(proposicion=lambda x, y: x > y)
+        arbol.insertarAll(tuple(range(100)))
+        self.assertGreater(arbol.raiz.izquierda.valor, arbol.raiz.valor)
+        arbol.eliminar(40)
+        self.assertIsNone(arbol.buscar(40))
+        self.assertEqual(arbol.buscar(41).valor, 41)
+
+    def test_guardar_y_cargar(self):
+        descriptor, ruta = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            original = ArbolRojiNegro()
+            original.insertarAll(tuple(range(100)))
+            original.guardar(ruta)
+            arbol = ArbolRojiNegro.cargar(ruta)
+        finally:
+            os.remove(ruta)
+        self.verificar_invariantes(arbol.raiz)
+        arbol.insertar(100)
+        arbol.eliminar(50)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_nodos_compactos(self):
+        generador = random.Random(7)
+        valores = generador.sample(range(1000), 300)
+        arbol = ArbolRojiNegro(clase_nodo=NodoCompacto, estadisticas=True)
+        arbol.insertarAll(tuple(valores))
+        for valor in valores[::2]:
+            arbol.eliminar(valor)
+        self.assertIsInstance(arbol.raiz, NodoRojiNegroCompacto)
+        self.assertFalse(hasattr(arbol.raiz, '__dict__'))
+        self.verificar_invariantes(arbol.raiz, estadisticas=True)
+        self.assertEqual([nodo.valor for nodo in arbol.iter_inorden()], sorted(valores[1::2]))
+
+    def test_multiconjunto(self):
+        arbol = ArbolRojiNegro(multiconjunto=True)
+        arbol.insertarAll((5, 5, 1, 9))
+        self.assertEqual(arbol.contar(5), 2)
+        arbol.eliminar(5)
+        arbol.eliminar(5)
+        self.assertIsNone(arbol.buscar(5))
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_estadisticas_con_rotaciones(self):
+        generador = random.Random(11)
+        valores = list(range(300))
+        generador.shuffle(valores)
+        arbol = ArbolRojiNegro(estadisticas=True, multiconjunto=True)
+        arbol.insertarAll(tuple(valores))
+        arbol.insertarAll(tuple(valores[:30]))
+        for valor in valores[:150]:
+            arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz, estadisticas=True)
+        ordenados = [nodo.valor for nodo in arbol.iter_inorden() for _ in range(nodo.cuenta)]
+        self.assertEqual(arbol.seleccionar(100).valor, ordenados[100])
+        self.assertEqual(arbol.percentil(50).valor, ordenados[len(ordenados) // 2 - 1])
+
+    def test_insertar_duplicado(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll((3, 3, 3), lambda x, y: x < y)
+        self.assertEqual(self.valores(arbol), [3])
+
+    def test_eliminar(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(range(300)), lambda x, y: x < y)
+        for valor in range(0, 300, 2):
+            arbol.eliminar(valor)
+            self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(self.valores(arbol), list(range(1, 300, 2)))
+
+    def test_eliminar_orden_aleatorio(self):
+        generador = random.Random(7)
+        valores = list(range(400))
+        generador.shuffle(valores)
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(valores), lambda x, y: x < y)
+        generador.shuffle(valores)
+        for valor in valores[:300]:
+            arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(self.valores(arbol), sorted(valores[300:]))
+
+    def test_eliminar_todo(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll((5, 3, 8, 1), lambda x, y: x < y)
+        for valor in (5, 3, 8, 1):
+            arbol.eliminar(valor)
+        self.assertIsNone(arbol.raiz)
+
+    def test_eliminar_no_existente(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll((5, 3, 8), lambda x, y: x < y)
+        arbol.eliminar(20)
+        self.assertEqual(self.valores(arbol), [3, 5, 8])
+
+    def test_eliminar_conserva_nodos(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(range(20)), lambda x, y: x < y)
+        nodo = arbol.buscar(13)
+        arbol.eliminar(arbol.raiz.valor)
+        self.assertIs(arbol.buscar(13), nodo)
+
+    def test_eliminarWhere_reconstruye(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(range(200)))
+        arbol.eliminarWhere(lambda nodo: nodo.valor >= 50, reconstruir=True)
+        self.verificar_invariantes(arbol.raiz)
+        arbol.insertar(300)
+        arbol.eliminar(10)
+        self.verificar_invariantes(arbol.raiz)
+
+    def test_enlazado(self):
+        generador = random.Random(11)
+        arbol = ArbolRojiNegro(enlazado=True)
+        arbol.insertarAll(tuple(generador.sample(range(400), 200)))
+        for valor in generador.sample(range(400), 200):
+            arbol.eliminar(valor)
+        self.verificar_invariantes(arbol.raiz)
+        nodos = list(arbol.iter_inorden())
+        self.assertEqual([nodo.valor for nodo in nodos], sorted(nodo.valor for nodo in arbol.iter_preorden()))
+        for anterior, siguiente in zip(nodos, nodos[1:]):
+            self.assertIs(arbol.siguiente(anterior), siguiente)
+            self.assertIs(arbol.anterior(siguiente), anterior)
+
+    def test_eliminarWhere(self):
+        arbol = ArbolRojiNegro()
+        arbol.insertarAll(tuple(range(100)), lambda x, y: x < y)
+        resultados = arbol.eliminarWhere(lambda nodo: nodo.valor % 3 == 0)
+        self.assertEqual(len(resultados), 34)
+        self.verificar_invariantes(arbol.raiz)
+        self.assertEqual(self.valores(arbol), [v for v in range(100) if v % 3])
+
+
+if __name__ == '__main__':
+    unittest.main()